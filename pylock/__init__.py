@@ -2,11 +2,18 @@
 
 GPL-3.0-only. See LICENSE.
 """
-from importlib.metadata import version, PackageNotFoundError
-
 __all__ = ["__version__"]
 
-try:
-    __version__ = version("pylock")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "0.0.0"
+
+def __getattr__(name: str) -> str:
+    # importlib.metadata заметно замедляет старт CLI — версию читаем по требованию
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value = version("pylock")
+        except PackageNotFoundError:  # pragma: no cover
+            value = "0.0.0"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
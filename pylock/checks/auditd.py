@@ -1,19 +1,21 @@
 from __future__ import annotations
-import shutil, subprocess, os
+import shutil, os
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..utils.cmd import run_cmd
+from ..facts.system import track_units, units
+
+track_units("auditd")
 
 class AuditdRunning(Check):
     id = "AUDIT:running"
     title = "auditd запущен"
     category = "AUDIT"
+    requires = ["fact:units"]
 
     def run(self, ctx):
-        if not shutil.which("systemctl"):
-            return self.skip("systemctl недоступен")
-        p = subprocess.run(["systemctl","is-active","auditd"], stdout=subprocess.PIPE, text=True)
-        if p.stdout.strip()=="active":
+        if units(ctx).active("auditd"):
             return self.ok()
         return self.fail([Finding(id=self.id+":stopped", description="auditd не активен", severity=Severity.HIGH)])
 
@@ -24,7 +26,7 @@ class AuditRulesPresent(Check):
 
     def run(self, ctx):
         if shutil.which("auditctl"):
-            p = subprocess.run(["auditctl","-l"], stdout=subprocess.PIPE, text=True)
+            p = run_cmd(["auditctl","-l"], check=False)
             lines = [l for l in p.stdout.splitlines() if l.strip()]
             if len(lines)>=5:
                 return self.ok(notes=f"{len(lines)} правил")
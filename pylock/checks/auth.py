@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import subprocess
 import shutil
 from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.accounts import accounts
 from ..utils.cmd import run_cmd
 
 
@@ -177,21 +177,11 @@ class AUTH_1006_PasswdConsistency(Check):
                 severity=Severity.WARNING,
             )
             return self.fail([f])
-        try:
-            users = {
-                line.split(":")[0]
-                for line in passwd.read_text(encoding="utf-8").splitlines()
-                if line and ":" in line
-            }
-            susers = {
-                line.split(":")[0]
-                for line in shadow.read_text(encoding="utf-8").splitlines()
-                if line and ":" in line
-            }
-        except (PermissionError, FileNotFoundError):
+        db = accounts(ctx)
+        if db is None or not db.shadow_readable:
             return self.skip(notes="Не удалось прочитать passwd или shadow")
-        if not users.issubset(susers):
-            missing = users - susers
+        missing = sorted(acc.name for acc in db.users if acc.shadow is None)
+        if missing:
             f = Finding(
                 id=self.id + ":incons",
                 description=f"Пользователи отсутствуют в shadow: {', '.join(missing)}",
@@ -208,7 +198,7 @@ class AUTH_1007_PasswordAging(Check):
 
     def run(self, ctx):
         try:
-            output = subprocess.check_output(["chage", "-l", "root"], text=True, stderr=subprocess.DEVNULL)
+            output = run_cmd(["chage", "-l", "root"]).stdout
         except Exception:
             return self.skip(notes="Команда chage недоступна")
         if "password must be changed" in output.lower():
@@ -243,14 +233,11 @@ class AUTH_1009_GuestAccounts(Check):
     id = "AUTH-1009"
     title = "Проверка наличия гостевых учётных записей"
     category = "AUTH"
+    requires = ["fact:accounts"]
 
     def run(self, ctx):
-        passwd = Path("/etc/passwd")
-        if not passwd.exists():
-            return self.skip(notes="Файл /etc/passwd отсутствует")
         bad: list[Finding] = []
-        for line in passwd.read_text(encoding="utf-8").splitlines():
-            user = line.split(":")[0]
+        for user in accounts(ctx).by_name:
             if user.lower() in {"guest", "demo", "test"}:
                 bad.append(Finding(
                     id=self.id + f":{user}",
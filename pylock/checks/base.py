@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
 
-from ..core.types import CheckResult, Finding
+from ..core.types import CheckResult, Finding, Severity
 from ..engine.context import Context
 from ..core import registry
+from ..facts.sysctl import normalize_key, sysctl, track
 
 
 class Check(ABC):
@@ -15,6 +17,7 @@ class Check(ABC):
     title: str            # Человекочитаемое название проверки
     category: str         # Категория (например: FILE, AUTH, NETWORK)
     tags: List[str] = []  # Дополнительные теги
+    requires: List[str] = []  # Предусловия: id других проверок или "fact:<имя факта>"
 
     def __init_subclass__(cls, **kwargs):
         """Автоматическая регистрация подклассов в реестре"""
@@ -57,3 +60,82 @@ class Check(ABC):
             status="skipped",
             notes=notes,
         )
+
+
+@dataclass(slots=True, frozen=True)
+class SysctlRule:
+    """
+    Строка таблицы ожидаемых значений sysctl; по ней генерируется класс проверки.
+
+    :param name: Имя генерируемого класса.
+    :param expected: Допустимые значения ключа.
+    :param ok_note: Заметка при допустимом значении ({value} — текущее значение).
+    :param fail: Описание находки при недопустимом значении; None — проверка
+                 только сообщает значение (заметка other_note).
+    :param suffix: Суффикс id находки.
+    """
+    id: str
+    name: str
+    key: str
+    expected: FrozenSet[str]
+    ok_note: str
+    fail: Optional[str] = None
+    severity: Severity = Severity.WARNING
+    suffix: str = "on"
+    other_note: Optional[str] = None
+    title: Optional[str] = None
+
+
+class SysctlCheck(Check):
+    """Проверка одного ключа sysctl по строке таблицы (id задают подклассы)."""
+
+    rule: SysctlRule
+    requires = ["fact:sysctl"]
+
+    def run(self, ctx):
+        rule = self.rule
+        state = sysctl(ctx)
+        value = state.get(rule.key)
+        if value is None:
+            return self.skip(notes=f"Параметр {rule.key} недоступен")
+        if rule.fail is None:
+            note = rule.ok_note if value in rule.expected else (rule.other_note or rule.ok_note)
+            return self.ok(notes=note.format(value=value))
+        findings = []
+        if value not in rule.expected:
+            findings.append(Finding(
+                id=f"{self.id}:{rule.suffix}",
+                description=rule.fail.format(value=value),
+                severity=rule.severity,
+            ))
+        saved = state.persistent.get(rule.key)
+        if saved is not None and saved not in rule.expected:
+            # Текущее значение будет заменено при следующей загрузке
+            findings.append(Finding(
+                id=f"{self.id}:persistent",
+                description=f"{rule.key} = {saved} задано в {state.origin[rule.key]}",
+                severity=rule.severity,
+            ))
+        if findings:
+            return self.fail(findings)
+        return self.ok(notes=rule.ok_note.format(value=value))
+
+
+def define_sysctl_checks(rules: Sequence[SysctlRule], namespace: Dict[str, Any],
+                         category: str) -> None:
+    """
+    Сгенерировать и зарегистрировать классы проверок по таблице правил.
+    Классы помещаются в namespace (globals() модуля), чтобы манифест
+    проверок связывал их с этим модулем.
+    """
+    for rule in rules:
+        rule = replace(rule, key=normalize_key(rule.key))
+        track(rule.key)
+        namespace[rule.name] = type(rule.name, (SysctlCheck,), {
+            "id": rule.id,
+            "title": rule.title or f"Проверка {rule.key}",
+            "category": category,
+            "rule": rule,
+            "__module__": namespace["__name__"],
+            "__qualname__": rule.name,
+        })
@@ -4,6 +4,7 @@ from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.mounts import mounts
 
 
 class BOOT_2000_GrubConfig(Check):
@@ -124,24 +125,17 @@ class BOOT_2005_BootMountPermissions(Check):
     id = "BOOT-2005"
     title = "Проверка опций монтирования раздела /boot"
     category = "BOOT"
+    requires = ["fact:mounts"]
 
     def run(self, ctx):
-        try:
-            mnt = Path("/proc/mounts").read_text(encoding="utf-8")
-        except (PermissionError, FileNotFoundError):
-            return self.skip(notes="/proc/mounts недоступен")
-        for line in mnt.splitlines():
-            if " /boot " in line:
-                try:
-                    opts = line.split()[3].split(",")
-                except IndexError:
-                    return self.skip(notes="Не удалось разобрать строку монтирования /boot")
-                if "nosuid" in opts and "nodev" in opts:
-                    return self.ok(notes="/boot смонтирован с nosuid,nodev")
-                f = Finding(
-                    id=self.id + ":opts",
-                    description="/boot смонтирован без nosuid/nodev",
-                    severity=Severity.SUGGESTION,
-                )
-                return self.fail([f])
-        return self.skip(notes="Раздел /boot не смонтирован отдельно")
+        m = mounts(ctx).get("/boot")
+        if m is None:
+            return self.skip(notes="Раздел /boot не смонтирован отдельно")
+        if "nosuid" in m.options and "nodev" in m.options:
+            return self.ok(notes="/boot смонтирован с nosuid,nodev")
+        f = Finding(
+            id=self.id + ":opts",
+            description="/boot смонтирован без nosuid/nodev",
+            severity=Severity.SUGGESTION,
+        )
+        return self.fail([f])
@@ -1,33 +1,29 @@
 from __future__ import annotations
-import os, shutil, subprocess, re
+import os, shutil, re
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.sshd import sshd_model
+
+
+def _weak(algorithms, pattern):
+    return any(re.search(pattern, a) for a in algorithms)
+
 
 class SSHStrongCiphers(Check):
     id = "CRYPTO:ssh-ciphers"
     title = "SSH использует стойкие шифры/МАС/ки"
     category = "CRYPTO"
+    requires = ["fact:sshd_model"]
 
     def run(self, ctx):
-        cfgs = ["/etc/ssh/sshd_config", "/etc/ssh/sshd_config.d"]
-        content = ""
-        for p in cfgs:
-            if os.path.isfile(p):
-                content += open(p, "r", encoding="utf-8", errors="ignore").read()+"\n"
-            elif os.path.isdir(p):
-                for fn in os.listdir(p):
-                    fp = os.path.join(p, fn)
-                    if os.path.isfile(fp):
-                        content += open(fp, "r", encoding="utf-8", errors="ignore").read()+"\n"
-        if not content:
-            return self.skip("Конфиг SSH не найден")
+        cfg = sshd_model(ctx)
         bad = []
-        if re.search(r"^\s*Ciphers\s+.*(arcfour|3des|aes128-cbc|aes192-cbc|aes256-cbc)", content, re.M|re.I):
+        if _weak(cfg.algorithms("Ciphers"), r"arcfour|3des|aes128-cbc|aes192-cbc|aes256-cbc"):
             bad.append("слабые Ciphers")
-        if re.search(r"^\s*KexAlgorithms\s+.*(diffie-hellman-group1|group14-sha1)", content, re.M|re.I):
+        if _weak(cfg.algorithms("KexAlgorithms"), r"diffie-hellman-group1|group14-sha1"):
             bad.append("слабые Kex")
-        if re.search(r"^\s*MACs\s+.*(hmac-md5)", content, re.M|re.I):
+        if _weak(cfg.algorithms("MACs"), r"hmac-md5"):
             bad.append("слабые MACs")
         if bad:
             return self.fail([Finding(id=self.id+":weak", description="; ".join(bad), severity=Severity.WARNING)])
@@ -1,10 +1,28 @@
 from __future__ import annotations
 
-import os
+import stat
 from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.filesystem import FsScan, fs_scan
+from ..facts.integrity import CHANGE_NAMES, suid_inventory
+from ..facts.mounts import mounts
+
+
+# Не больше стольких находок-путей на проверку: остальные учитываются в заметке
+MAX_PATH_FINDINGS = 100
+
+
+def _walk_note(scan: FsScan, total: int = 0) -> str | None:
+    """Заметка о неполном обходе ФС и об опущенных находках (None — добавить нечего)."""
+    notes = []
+    if total > MAX_PATH_FINDINGS:
+        notes.append(f"показаны первые {MAX_PATH_FINDINGS} из {total}")
+    if not scan.stats.complete:
+        notes.append(f"обход ФС прерван, просмотрено элементов: {scan.stats.entries}")
+    note = "; ".join(notes)
+    return note[:1].upper() + note[1:] or None
 
 
 class FILE_3000_EtcHostsPermissions(Check):
@@ -59,25 +77,21 @@ class FILE_3002_WorldWritableDirs(Check):
     category = "FILE"
 
     def run(self, ctx):
-        bad: list[Finding] = []
-        for root, dirs, files in os.walk("/", topdown=True):
-            for d in dirs:
-                path = Path(root) / d
-                try:
-                    st = path.lstat()
-                except (PermissionError, FileNotFoundError):
-                    continue
-                if st.st_mode & 0o002 and not (st.st_mode & 0o1000):
-                    bad.append(
-                        Finding(
-                            id=self.id + f":{path}",
-                            description=f"Каталог доступен для записи всеми и не имеет sticky-бита: {path}",
-                            severity=Severity.WARNING,
-                        )
-                    )
-        if bad:
-            return self.fail(bad)
-        return self.ok(notes="Опасных каталогов с правом записи для всех не найдено")
+        # Общий обход ФС: один проход на все проверки, использующие fs_scan
+        scan = fs_scan(ctx)
+        paths = scan.results["world_writable_dirs"]
+        if paths:
+            return self.fail([
+                Finding(
+                    id=self.id + f":{path}",
+                    description=f"Каталог доступен для записи всеми и не имеет sticky-бита: {path}",
+                    severity=Severity.WARNING,
+                )
+                for path in paths[:MAX_PATH_FINDINGS]
+            ], notes=_walk_note(scan, len(paths)))
+        return self.ok(
+            notes=_walk_note(scan) or "Опасных каталогов с правом записи для всех не найдено"
+        )
 
 
 class FILE_3003_SuidBinaries(Check):
@@ -86,19 +100,46 @@ class FILE_3003_SuidBinaries(Check):
     category = "FILE"
 
     def run(self, ctx):
-        found = []
-        for root, dirs, files in os.walk("/", topdown=True):
-            for f in files:
-                path = Path(root) / f
-                try:
-                    st = path.lstat()
-                except (PermissionError, FileNotFoundError):
-                    continue
-                if st.st_mode & 0o4000:
-                    found.append(str(path))
-        if found:
-            return self.ok(notes=f"Найдено {len(found)} SUID-бинарных файлов")
-        return self.ok(notes="SUID-бинарные файлы не обнаружены")
+        scan = fs_scan(ctx)
+        files = scan.results["setid_files"]
+        suid = sum(1 for _, mode, _ in files if mode & 0o4000)
+        notes = [f"Найдено {suid} SUID- и {len(files) - suid} SGID-файлов" if files
+                 else "SUID/SGID-файлы не обнаружены"]
+        # Сравнение с эталоном: новые и изменённые привилегированные файлы — находки
+        inv = suid_inventory(ctx)
+        findings = []
+        if inv.created:
+            notes.append("создан эталон SUID/SGID" if inv.saved else "эталон SUID/SGID не записан")
+        elif inv.complete:
+            owners = {path: (mode, uid) for path, mode, uid in files}
+            for path in inv.added:
+                mode, uid = owners.get(path, (0, 0))
+                findings.append(Finding(
+                    id=self.id + f":new:{path}",
+                    description=(
+                        f"Новый SUID/SGID-файл: {path} (режим {stat.S_IMODE(mode):o}, UID {uid})"
+                    ),
+                    severity=Severity.WARNING,
+                ))
+            for path, what in inv.modified:
+                changed = ", ".join(CHANGE_NAMES[w] for w in what)
+                findings.append(Finding(
+                    id=self.id + f":modified:{path}",
+                    description=f"Изменён SUID/SGID-файл ({changed}): {path}",
+                    severity=Severity.WARNING,
+                ))
+            if inv.removed:
+                notes.append(f"исчезли с момента эталона: {len(inv.removed)}")
+            if not inv.saved:
+                notes.append("состояние SUID/SGID не записано")
+            if findings:
+                notes.append("принять изменения: pylock fim-update")
+        walk = _walk_note(scan, len(findings))
+        if walk:
+            notes.append(walk[:1].lower() + walk[1:])
+        if findings:
+            return self.fail(findings[:MAX_PATH_FINDINGS], notes="; ".join(notes))
+        return self.ok(notes="; ".join(notes))
 
 
 class FILE_3004_CoreDumps(Check):
@@ -128,28 +169,26 @@ class FILE_3005_FstabOptions(Check):
     id = "FILE-3005"
     title = "Проверка опций nodev/nosuid/noexec в /etc/fstab"
     category = "FILE"
+    requires = ["fact:mounts"]
 
     def run(self, ctx):
-        fstab = Path("/etc/fstab")
-        if not fstab.exists():
+        table = mounts(ctx)
+        if not table.fstab_readable:
             return self.skip(notes="/etc/fstab отсутствует")
         bad: list[Finding] = []
-        for line in fstab.read_text(encoding="utf-8").splitlines():
-            if not line.strip() or line.strip().startswith("#"):
+        for mnt in ("/home", "/tmp", "/var"):  # критические точки монтирования
+            entry = table.fstab_by_mountpoint.get(mnt)
+            if entry is None:
                 continue
-            fields = line.split()
-            if len(fields) >= 4:
-                mnt, opts = fields[1], fields[3]
-                if mnt in ("/home", "/tmp", "/var"):  # критические точки монтирования
-                    for needed in ("nodev", "nosuid", "noexec"):
-                        if needed not in opts:
-                            bad.append(
-                                Finding(
-                                    id=self.id + f":{mnt}:{needed}",
-                                    description=f"{mnt} не содержит опцию {needed} в fstab",
-                                    severity=Severity.SUGGESTION,
-                                )
-                            )
+            for needed in ("nodev", "nosuid", "noexec"):
+                if needed not in entry.options:
+                    bad.append(
+                        Finding(
+                            id=self.id + f":{mnt}:{needed}",
+                            description=f"{mnt} не содержит опцию {needed} в fstab",
+                            severity=Severity.SUGGESTION,
+                        )
+                    )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Опции монтирования в fstab выглядят корректно")
@@ -252,28 +291,22 @@ class FILE_3011_TmpMountOptions(Check):
     id = "FILE-3011"
     title = "Проверка опций монтирования для /tmp и /var/tmp"
     category = "FILE"
+    requires = ["fact:mounts"]
 
     def run(self, ctx):
-        try:
-            mounts = Path("/proc/mounts").read_text(encoding="utf-8").splitlines()
-        except FileNotFoundError:
-            return self.skip(notes="Не удалось прочитать /proc/mounts")
-
+        table = mounts(ctx)
         bad: list[Finding] = []
-        for line in mounts:
-            parts = line.split()
-            if len(parts) < 4:
+        for mnt in ("/tmp", "/var/tmp"):
+            m = table.get(mnt)
+            if m is None:
                 continue
-            mnt = parts[1]
-            opts = parts[3].split(",")
-            if mnt in {"/tmp", "/var/tmp"}:
-                for need in ("nodev", "nosuid", "noexec"):
-                    if need not in opts:
-                        bad.append(Finding(
-                            id=self.id + f":{mnt}:{need}",
-                            description=f"{mnt} смонтирован без опции {need}",
-                            severity=Severity.WARNING,
-                        ))
+            for need in ("nodev", "nosuid", "noexec"):
+                if need not in m.options:
+                    bad.append(Finding(
+                        id=self.id + f":{mnt}:{need}",
+                        description=f"{mnt} смонтирован без опции {need}",
+                        severity=Severity.WARNING,
+                    ))
         if bad:
             return self.fail(bad)
         return self.ok(notes="Разделы /tmp и /var/tmp смонтированы с безопасными опциями")
@@ -282,16 +315,11 @@ class FILE_3012_VarLogMount(Check):
     id = "FILE-3012"
     title = "Проверка отдельного монтирования /var/log"
     category = "FILE"
+    requires = ["fact:mounts"]
 
     def run(self, ctx):
-        try:
-            mounts = Path("/proc/mounts").read_text(encoding="utf-8").splitlines()
-        except FileNotFoundError:
-            return self.skip(notes="Не удалось прочитать /proc/mounts")
-        for line in mounts:
-            parts = line.split()
-            if len(parts) > 1 and parts[1] == "/var/log":
-                return self.ok(notes="/var/log смонтирован отдельно")
+        if mounts(ctx).get("/var/log") is not None:
+            return self.ok(notes="/var/log смонтирован отдельно")
         return self.fail([
             Finding(
                 id=self.id + ":notseparate",
@@ -305,26 +333,60 @@ class FILE_3013_DevShmOptions(Check):
     id = "FILE-3013"
     title = "Проверка опций монтирования для /dev/shm"
     category = "FILE"
+    requires = ["fact:mounts"]
 
     def run(self, ctx):
-        try:
-            mounts = Path("/proc/mounts").read_text(encoding="utf-8").splitlines()
-        except FileNotFoundError:
-            return self.skip(notes="Не удалось прочитать /proc/mounts")
-        for line in mounts:
-            parts = line.split()
-            if len(parts) < 4:
-                continue
-            if parts[1] == "/dev/shm":
-                opts = parts[3].split(",")
-                missing = [o for o in ("nodev", "nosuid", "noexec") if o not in opts]
-                if missing:
-                    return self.fail([
-                        Finding(
-                            id=self.id + ":opts",
-                            description=f"/dev/shm смонтирован без {','.join(missing)}",
-                            severity=Severity.WARNING,
-                        )
-                    ])
-                return self.ok(notes="/dev/shm смонтирован с безопасными опциями")
-        return self.skip(notes="/dev/shm не найден в /proc/mounts")
+        m = mounts(ctx).get("/dev/shm")
+        if m is None:
+            return self.skip(notes="/dev/shm не найден в таблице монтирования")
+        missing = [o for o in ("nodev", "nosuid", "noexec") if o not in m.options]
+        if missing:
+            return self.fail([
+                Finding(
+                    id=self.id + ":opts",
+                    description=f"/dev/shm смонтирован без {','.join(missing)}",
+                    severity=Severity.WARNING,
+                )
+            ])
+        return self.ok(notes="/dev/shm смонтирован с безопасными опциями")
+
+
+class FILE_3014_UnownedFiles(Check):
+    id = "FILE-3014"
+    title = "Поиск файлов без владельца или группы"
+    category = "FILE"
+    requires = ["fact:accounts"]
+
+    def run(self, ctx):
+        scan = fs_scan(ctx)
+        paths = scan.results.get("unowned", [])
+        if paths:
+            return self.fail([
+                Finding(
+                    id=self.id + f":{path}",
+                    description=f"UID или GID файла отсутствует в passwd/group: {path}",
+                    severity=Severity.WARNING,
+                )
+                for path in paths[:MAX_PATH_FINDINGS]
+            ], notes=_walk_note(scan, len(paths)))
+        return self.ok(notes=_walk_note(scan) or "Файлов без владельца не найдено")
+
+
+class FILE_3015_WorldWritableFiles(Check):
+    id = "FILE-3015"
+    title = "Поиск файлов, доступных для записи всем"
+    category = "FILE"
+
+    def run(self, ctx):
+        scan = fs_scan(ctx)
+        paths = scan.results["world_writable_files"]
+        if paths:
+            return self.fail([
+                Finding(
+                    id=self.id + f":{path}",
+                    description=f"Файл доступен для записи всем: {path}",
+                    severity=Severity.WARNING,
+                )
+                for path in paths[:MAX_PATH_FINDINGS]
+            ], notes=_walk_note(scan, len(paths)))
+        return self.ok(notes=_walk_note(scan) or "Файлов с правом записи для всех не найдено")
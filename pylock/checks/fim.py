@@ -3,6 +3,11 @@ import shutil, os
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.integrity import CHANGE_NAMES, fim
+
+# Не больше стольких находок на проверку: остальные учитываются в заметке
+MAX_FIM_FINDINGS = 100
+
 
 class AideInstalled(Check):
     id = "FIM:aide-installed"
@@ -24,3 +29,43 @@ class AideInitialized(Check):
             if os.path.exists(p):
                 return self.ok()
         return self.fail([Finding(id=self.id+":db-missing", description="База AIDE не найдена", severity=Severity.WARNING)])
+
+
+class FimChanges(Check):
+    id = "FIM:changes"
+    title = "Целостность контролируемых файлов (встроенный FIM)"
+    category = "FIM"
+    requires = ["fact:fim"]
+
+    def run(self, ctx):
+        rep = fim(ctx)
+        if not rep.complete:
+            return self.skip(notes=f"Проверка прервана, просмотрено файлов: {rep.files}")
+        if rep.created:
+            if not rep.saved:
+                return self.skip(notes="Не удалось записать эталон FIM в каталог состояния pylock")
+            return self.ok(notes=f"Создан эталон: {rep.files} файлов")
+        findings = []
+        for path in rep.added:
+            findings.append(Finding(id=f"{self.id}:added:{path}", description=f"Новый файл: {path}",
+                                    severity=Severity.WARNING))
+        for path in rep.removed:
+            findings.append(Finding(id=f"{self.id}:removed:{path}",
+                                    description=f"Файл удалён: {path}", severity=Severity.WARNING))
+        for path, what in rep.modified:
+            changed = ", ".join(CHANGE_NAMES[w] for w in what)
+            findings.append(Finding(id=f"{self.id}:modified:{path}",
+                                    description=f"Файл изменён ({changed}): {path}",
+                                    severity=Severity.WARNING))
+        # Сравнение уже сделано: сбой записи состояния не скрывает изменений
+        unsaved = "состояние FIM не записано в каталог состояния pylock"
+        if findings:
+            notes = ["принять изменения: pylock fim-update"]
+            if len(findings) > MAX_FIM_FINDINGS:
+                notes.insert(0, f"показаны первые {MAX_FIM_FINDINGS} из {len(findings)}")
+            if not rep.saved:
+                notes.append(unsaved)
+            note = "; ".join(notes)
+            return self.fail(findings[:MAX_FIM_FINDINGS], notes=note[:1].upper() + note[1:])
+        note = f"Изменений нет: {rep.files} файлов, перехешировано {rep.hashed}"
+        return self.ok(notes=note + (f"; {unsaved}" if not rep.saved else ""))
@@ -1,14 +1,16 @@
 from __future__ import annotations
-import shutil, subprocess
+import shutil
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..utils.cmd import run_cmd
+from ..facts.system import track_units, units
 
-def _svc_active(name: str) -> bool:
-    if not shutil.which("systemctl"):
-        return False
-    p = subprocess.run(["systemctl", "is-active", name], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
-    return p.stdout.strip() == "active"
+track_units("firewalld", "ufw")
+
+def _svc_active(ctx, name: str) -> bool:
+    states = units(ctx)
+    return states is not None and states.active(name)
 
 class FirewallRunning(Check):
     id = "FW:running"
@@ -17,7 +19,7 @@ class FirewallRunning(Check):
     tags = ["firewalld","ufw"]
 
     def run(self, ctx):
-        if _svc_active("firewalld") or _svc_active("ufw"):
+        if _svc_active(ctx, "firewalld") or _svc_active(ctx, "ufw"):
             return self.ok()
         return self.fail([Finding(id=self.id+":stopped", description="firewalld/ufw не активен", severity=Severity.HIGH)])
 
@@ -29,7 +31,7 @@ class FirewallDefaultDeny(Check):
     def run(self, ctx):
         # firewalld: зона по умолчанию
         if shutil.which("firewall-cmd"):
-            p = subprocess.run(["firewall-cmd","--get-default-zone"], stdout=subprocess.PIPE, text=True)
+            p = run_cmd(["firewall-cmd","--get-default-zone"], check=False)
             zone = p.stdout.strip()
             # упростим: проверяем, что не 'trusted'
             if zone and zone != "trusted":
@@ -37,7 +39,7 @@ class FirewallDefaultDeny(Check):
             return self.fail([Finding(id=self.id+":allow", description=f"default-zone={zone}", severity=Severity.WARNING)])
         # ufw
         if shutil.which("ufw"):
-            p = subprocess.run(["ufw","status"], stdout=subprocess.PIPE, text=True)
+            p = run_cmd(["ufw","status"], check=False)
             out = p.stdout.lower()
             if "status: active" in out and "default: deny" in out:
                 return self.ok()
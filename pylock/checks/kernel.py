@@ -1,9 +1,8 @@
 from __future__ import annotations
 
 import platform
-from pathlib import Path
 
-from .base import Check
+from .base import Check, SysctlRule, define_sysctl_checks
 from ..core.types import Finding, Severity
 
 
@@ -47,111 +46,21 @@ class KRNL_4001_CheckArch(Check):
         return self.skip(notes="Архитектура неизвестна")
 
 
-class KRNL_4002_RandomizeVaSpace(Check):
-    id = "KRNL-4002"
-    title = "Проверка kernel.randomize_va_space (ASLR)"
-    category = "KRNL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/kernel/randomize_va_space")
-        if not path.exists():
-            return self.skip(notes="randomize_va_space недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать randomize_va_space")
-        if val in {"1", "2"}:
-            return self.ok(notes=f"ASLR включён (randomize_va_space={val})")
-        f = Finding(
-            id=self.id + ":disabled",
-            description="ASLR выключен",
-            severity=Severity.WARNING,
-        )
-        return self.fail([f])
-
-
-class KRNL_4003_SysRq(Check):
-    id = "KRNL-4003"
-    title = "Проверка kernel.sysrq"
-    category = "KRNL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/kernel/sysrq")
-        if not path.exists():
-            return self.skip(notes="sysrq недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать sysrq")
-        if val == "0":
-            return self.ok(notes="sysrq отключён")
-        f = Finding(
-            id=self.id + ":enabled",
-            description=f"sysrq включён (значение: {val})",
-            severity=Severity.SUGGESTION,
-        )
-        return self.fail([f])
-
-
-class KRNL_4004_DmesgRestrict(Check):
-    id = "KRNL-4004"
-    title = "Проверка kernel.dmesg_restrict"
-    category = "KRNL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/kernel/dmesg_restrict")
-        if not path.exists():
-            return self.skip(notes="dmesg_restrict недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать dmesg_restrict")
-        if val == "1":
-            return self.ok(notes="dmesg ограничен (restricted)")
-        f = Finding(
-            id=self.id + ":off",
-            description="dmesg не ограничен",
-            severity=Severity.SUGGESTION,
-        )
-        return self.fail([f])
-
-
-class KRNL_4005_KptrRestrict(Check):
-    id = "KRNL-4005"
-    title = "Проверка kernel.kptr_restrict"
-    category = "KRNL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/kernel/kptr_restrict")
-        if not path.exists():
-            return self.skip(notes="kptr_restrict недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать kptr_restrict")
-        if val == "1":
-            return self.ok(notes="kptr_restrict включён")
-        f = Finding(
-            id=self.id + ":off",
-            description="kptr_restrict выключен",
-            severity=Severity.SUGGESTION,
-        )
-        return self.fail([f])
-
-
-class KRNL_4006_ModuleLoading(Check):
-    id = "KRNL-4006"
-    title = "Проверка kernel.modules_disabled"
-    category = "KRNL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/kernel/modules_disabled")
-        if not path.exists():
-            return self.skip(notes="modules_disabled недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать modules_disabled")
-        if val == "1":
-            return self.ok(notes="Загрузка модулей отключена")
-        return self.ok(notes="Загрузка модулей разрешена")
+KERNEL_RULES = (
+    SysctlRule("KRNL-4002", "KRNL_4002_RandomizeVaSpace", "kernel.randomize_va_space",
+               frozenset({"1", "2"}), "ASLR включён (randomize_va_space={value})",
+               "ASLR выключен", suffix="disabled",
+               title="Проверка kernel.randomize_va_space (ASLR)"),
+    SysctlRule("KRNL-4003", "KRNL_4003_SysRq", "kernel.sysrq", frozenset({"0"}),
+               "sysrq отключён", "sysrq включён (значение: {value})", Severity.SUGGESTION,
+               "enabled"),
+    SysctlRule("KRNL-4004", "KRNL_4004_DmesgRestrict", "kernel.dmesg_restrict", frozenset({"1"}),
+               "dmesg ограничен (restricted)", "dmesg не ограничен", Severity.SUGGESTION, "off"),
+    SysctlRule("KRNL-4005", "KRNL_4005_KptrRestrict", "kernel.kptr_restrict", frozenset({"1"}),
+               "kptr_restrict включён", "kptr_restrict выключен", Severity.SUGGESTION, "off"),
+    SysctlRule("KRNL-4006", "KRNL_4006_ModuleLoading", "kernel.modules_disabled",
+               frozenset({"1"}), "Загрузка модулей отключена",
+               other_note="Загрузка модулей разрешена"),
+)
+
+define_sysctl_checks(KERNEL_RULES, globals(), "KRNL")
@@ -1,8 +1,12 @@
 from __future__ import annotations
-import os, shutil, subprocess
+import os, shutil
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.system import track_units, units
+
+TIMESYNC_UNITS = ("chronyd","systemd-timesyncd","ntpd")
+track_units(*TIMESYNC_UNITS)
 
 class LogrotatePresent(Check):
     id = "LOGGING:logrotate"
@@ -20,8 +24,8 @@ class TimeSyncRunning(Check):
     category = "LOGGING"
 
     def run(self, ctx):
-        for svc in ("chronyd","systemd-timesyncd","ntpd"):
-            p = subprocess.run(["bash","-lc", f"systemctl is-active {svc}"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
-            if p.stdout.strip()=="active":
+        states = units(ctx)
+        for svc in TIMESYNC_UNITS:
+            if states is not None and states.active(svc):
                 return self.ok(notes=svc)
         return self.fail([Finding(id=self.id+":inactive", description="Сервис синхронизации времени не активен", severity=Severity.WARNING)])
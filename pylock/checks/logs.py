@@ -1,32 +1,29 @@
 from __future__ import annotations
 
-import subprocess
 import os
 from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.processes import processes
 
 class LOGS_1000_AuditdActive(Check):
     id = "LOGS-1000"
     title = "Проверка активности auditd"
     category = "LOGS"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
         if Path("/sbin/auditd").exists() or Path("/usr/sbin/auditd").exists():
-            try:
-                proc = subprocess.run(["pidof", "auditd"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-                if proc.returncode == 0:
-                    return self.ok(notes="auditd работает")
-                return self.fail([
-                    Finding(
-                        id=self.id + ":inactive",
-                        description="auditd установлен, но не запущен",
-                        severity=Severity.WARNING,
-                    )
-                ])
-            except Exception:
-                return self.skip(notes="Не удалось проверить состояние auditd")
+            if processes(ctx).running("auditd"):
+                return self.ok(notes="auditd работает")
+            return self.fail([
+                Finding(
+                    id=self.id + ":inactive",
+                    description="auditd установлен, но не запущен",
+                    severity=Severity.WARNING,
+                )
+            ])
         return self.skip(notes="auditd не установлен")
 
 class LOGS_1001_WtmpBtmp(Check):
@@ -5,27 +5,19 @@ from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
-from ..utils.cmd import run_cmd
+from ..facts.network import network
+from ..facts.sockets import sockets
 
 
 class NETW_5000_OpenTCPPorts(Check):
     id = "NETW-5000"
     title = "Проверка открытых TCP-портов"
     category = "NETW"
+    requires = ["fact:sockets"]
 
     def run(self, ctx):
-        proc = run_cmd(["ss", "-tln"], check=False)
-        if proc.returncode == 0 and proc.stdout:
-            return self.ok(notes=f"Найдено строк в выводе ss: {len(proc.stdout.splitlines())}")
-        np = run_cmd(["netstat", "-tln"], check=False)
-        if np.returncode == 0 and np.stdout:
-            return self.ok(notes=f"Найдено строк в выводе netstat: {len(np.stdout.splitlines())}")
-        f = Finding(
-            id=self.id + ":no_tool",
-            description="Не найдено ни ss, ни netstat для проверки портов",
-            severity=Severity.WARNING,
-        )
-        return self.fail([f])
+        ports = sorted({s.port for s in sockets(ctx).listening("tcp")})
+        return self.ok(notes=f"Слушающих TCP-портов: {len(ports)}")
 
 
 class NETW_5001_FirewallActive(Check):
@@ -50,13 +42,14 @@ class NETW_5002_RoutingTable(Check):
     id = "NETW-5002"
     title = "Проверка таблицы маршрутизации"
     category = "NETW"
+    requires = ["fact:network"]
 
     def run(self, ctx):
-        proc = run_cmd(["ip", "route"], check=False)
-        if proc.returncode == 0 and proc.stdout:
-            lines = proc.stdout.splitlines()
-            return self.ok(notes=f"Количество маршрутов: {len(lines)}")
-        return self.skip(notes="Команда ip route недоступна")
+        routes = network(ctx).routes
+        if routes is None:
+            return self.skip(notes="Таблица маршрутизации /proc/net/route недоступна")
+        default = [r for r in routes if r.default]
+        return self.ok(notes=f"Количество маршрутов: {len(routes)} (по умолчанию: {len(default)})")
 
 
 class NETW_5003_Ipv6Enabled(Check):
@@ -81,21 +74,23 @@ class NETW_5004_ListenAllInterfaces(Check):
     id = "NETW-5004"
     title = "Проверка сервисов, слушающих на всех интерфейсах"
     category = "NETW"
+    requires = ["fact:sockets"]
 
     def run(self, ctx):
-        proc = run_cmd(["ss", "-tln"], check=False)
-        if proc.returncode != 0 or not proc.stdout:
-            return self.skip(notes="Команда ss недоступна")
         bad: list[Finding] = []
-        for line in proc.stdout.splitlines():
-            if "*:" in line or "0.0.0.0:" in line:
-                bad.append(
-                    Finding(
-                        id=self.id + ":any",
-                        description=f"Сервис слушает на всех интерфейсах: {line}",
-                        severity=Severity.SUGGESTION,
-                    )
+        seen: set[str] = set()
+        for sock in sockets(ctx).listening("tcp"):
+            endpoint = sock.endpoint()
+            if not sock.wildcard or endpoint in seen:
+                continue
+            seen.add(endpoint)
+            bad.append(
+                Finding(
+                    id=self.id + ":any",
+                    description=f"Сервис слушает на всех интерфейсах: {endpoint}",
+                    severity=Severity.SUGGESTION,
                 )
+            )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Нет сервисов, привязанных ко всем интерфейсам")
@@ -105,13 +100,16 @@ class NETW_5005_BridgeInterfaces(Check):
     id = "NETW-5005"
     title = "Проверка наличия мостовых интерфейсов"
     category = "NETW"
+    requires = ["fact:network"]
 
     def run(self, ctx):
-        proc = run_cmd(["ip", "link"], check=False)
-        if proc.returncode != 0 or not proc.stdout:
-            return self.skip(notes="Команда ip link недоступна")
-        if any("bridge" in line for line in proc.stdout.splitlines()):
-            return self.ok(notes="Обнаружены мостовые интерфейсы")
+        inv = network(ctx)
+        bridges = inv.bridges()
+        if bridges:
+            names = ", ".join(
+                f"{b.name} ({len(inv.members.get(b.name, []))} портов)" for b in bridges
+            )
+            return self.ok(notes=f"Обнаружены мостовые интерфейсы: {names}")
         return self.ok(notes="Мостовые интерфейсы не найдены")
 
 
@@ -119,21 +117,18 @@ class NETW_5006_PromiscuousMode(Check):
     id = "NETW-5006"
     title = "Проверка интерфейсов в режиме promiscuous"
     category = "NETW"
+    requires = ["fact:network"]
 
     def run(self, ctx):
-        proc = run_cmd(["ip", "-d", "link"], check=False)
-        if proc.returncode != 0 or not proc.stdout:
-            return self.skip(notes="Команда ip -d link недоступна")
         bad: list[Finding] = []
-        for line in proc.stdout.splitlines():
-            if "PROMISC" in line:
-                bad.append(
-                    Finding(
-                        id=self.id + ":promisc",
-                        description=f"Интерфейс в режиме promiscuous: {line}",
-                        severity=Severity.WARNING,
-                    )
+        for iface in network(ctx).promiscuous():
+            bad.append(
+                Finding(
+                    id=self.id + ":promisc",
+                    description=f"Интерфейс в режиме promiscuous: {iface.name}",
+                    severity=Severity.WARNING,
                 )
+            )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Интерфейсов в режиме promiscuous не найдено")
@@ -1,7 +1,6 @@
 from __future__ import annotations
-import subprocess
-
 from .base import Check
+from ..utils.cmd import run_cmd
 
 class NtpSynchronized(Check):
     id = "NTP:sync"
@@ -9,7 +8,7 @@ class NtpSynchronized(Check):
     category = "LOGGING"
 
     def run(self, ctx):
-        p = subprocess.run(["timedatectl"], stdout=subprocess.PIPE, text=True)
+        p = run_cmd(["timedatectl"], check=False)
         if "System clock synchronized: yes" in p.stdout:
             return self.ok()
         return self.skip("Не удалось подтвердить синхронизацию")
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import subprocess
 import shutil
 from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
 from ..utils.cmd import run_cmd
+from ..facts.packages import installed_packages
+
+# Пакеты, наличие которых считается небезопасным; профиль может дополнить список
+BANNED_PACKAGES = ("telnet", "rsh-client", "rsh-server", "tftp", "talk", "ftp")
 
 
 class PKGS_6000_PackageManager(Check):
@@ -31,6 +34,7 @@ class PKGS_6001_AptUpdates(Check):
     id = "PKGS-6001"
     title = "Проверка доступных обновлений apt"
     category = "PKGS"
+    requires = ["PKGS-6000"]
 
     def run(self, ctx):
         if not shutil.which("apt"):
@@ -53,6 +57,7 @@ class PKGS_6002_YumCheckUpdates(Check):
     id = "PKGS-6002"
     title = "Проверка доступных обновлений yum/dnf"
     category = "PKGS"
+    requires = ["PKGS-6000"]
 
     def run(self, ctx):
         if shutil.which("dnf"):
@@ -151,26 +156,23 @@ class PKGS_6005_UnattendedUpgrades(Check):
             return self.ok(notes="unattended-upgrades настроен")
         return self.skip(notes="unattended-upgrades не настроен")
 
-import shutil
 
 class PKGS_6006_DangerousPackages(Check):
     id = "PKGS-6006"
     title = "Проверка наличия небезопасных пакетов"
     category = "PKGS"
+    requires = ["fact:installed_packages"]
 
     def run(self, ctx):
-        bad_pkgs = ["telnet", "rsh-client", "rsh-server", "tftp", "talk", "ftp"]
-        found = []
-        if shutil.which("dpkg"):
-            for pkg in bad_pkgs:
-                proc = subprocess.run(["dpkg", "-s", pkg], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                if proc.returncode == 0:
-                    found.append(pkg)
-        elif shutil.which("rpm"):
-            for pkg in bad_pkgs:
-                proc = subprocess.run(["rpm", "-q", pkg], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                if proc.returncode == 0:
-                    found.append(pkg)
+        banned = dict.fromkeys(BANNED_PACKAGES)
+        if ctx.profile is not None:
+            banned.update(dict.fromkeys(ctx.profile.banned_packages))
+        # Инвентарь кэшируется между циклами агента, пока база не изменилась
+        installed = installed_packages(ctx)
+        found = [
+            f"{pkg} {'/'.join(dict.fromkeys(installed.versions(pkg)))}".strip()
+            for pkg in banned if pkg in installed
+        ]
         if found:
             return self.fail([
                 Finding(
@@ -1,8 +1,9 @@
 from __future__ import annotations
-import shutil, subprocess
+import shutil
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..utils.cmd import run_cmd
 
 class SecurityUpdates(Check):
     id = "PATCH:security-updates"
@@ -12,14 +13,14 @@ class SecurityUpdates(Check):
     def run(self, ctx):
         # Debian/Ubuntu
         if shutil.which("apt"):
-            p = subprocess.run(["apt","list","--upgradable"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            p = run_cmd(["apt","list","--upgradable"], check=False, timeout=60)
             up = [l for l in p.stdout.splitlines() if "security" in l.lower()]
             if up:
                 return self.fail([Finding(id=self.id+":pending", description=f"Доступны security-обновления: {len(up)}", severity=Severity.WARNING)])
             return self.ok()
         # RHEL/CentOS
         if shutil.which("yum"):
-            p = subprocess.run(["yum","check-update","--security","-q"], stdout=subprocess.PIPE, text=True)
+            p = run_cmd(["yum","check-update","--security","-q"], check=False, timeout=120)
             out = p.stdout.strip()
             if out:
                 return self.fail([Finding(id=self.id+":pending", description="Есть security-обновления (yum)", severity=Severity.WARNING)])
@@ -1,23 +1,19 @@
 from __future__ import annotations
 
-import subprocess
-from pathlib import Path
-
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.accounts import accounts
+from ..facts.processes import processes
 
 
 class PROC_7000_RootProcesses(Check):
     id = "PROC-7000"
     title = "Проверка процессов, запущенных от root"
     category = "PROC"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            output = subprocess.check_output(["ps", "-eo", "user,comm"], text=True)
-        except Exception:
-            return self.skip(notes="Команда ps недоступна")
-        root_procs = [line for line in output.splitlines() if line.startswith("root ")]
+        root_procs = processes(ctx).by_uid.get(0, [])
         return self.ok(notes=f"Процессов от root: {len(root_procs)}")
 
 
@@ -25,13 +21,10 @@ class PROC_7001_ZombieProcesses(Check):
     id = "PROC-7001"
     title = "Проверка на зомби-процессы"
     category = "PROC"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            output = subprocess.check_output(["ps", "-eo", "stat,comm"], text=True)
-        except Exception:
-            return self.skip(notes="Команда ps недоступна")
-        zombies = [line for line in output.splitlines() if line.startswith("Z")]  # STAT Z
+        zombies = [s for s in processes(ctx).state if s == "Z"]
         if zombies:
             f = Finding(
                 id=self.id + ":zombies",
@@ -46,19 +39,18 @@ class PROC_7002_SuspiciousTmpExec(Check):
     id = "PROC-7002"
     title = "Проверка процессов, запущенных из /tmp"
     category = "PROC"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            output = subprocess.check_output(["ps", "-eo", "pid,comm,args"], text=True)
-        except Exception:
-            return self.skip(notes="Команда ps недоступна")
+        table = processes(ctx)
         bad: list[Finding] = []
-        for line in output.splitlines():
-            if "/tmp/" in line:
+        for i, pid in enumerate(table.pid):
+            exe, args = table.exe[i] or "", table.cmdline[i]
+            if exe.startswith("/tmp/") or "/tmp/" in args:
                 bad.append(
                     Finding(
                         id=self.id + ":tmp",
-                        description=f"Процесс запущен из /tmp: {line}",
+                        description=f"Процесс запущен из /tmp: {pid} {table.comm[i]} {args or exe}",
                         severity=Severity.HIGH,
                     )
                 )
@@ -71,13 +63,10 @@ class PROC_7003_OrphanedProcesses(Check):
     id = "PROC-7003"
     title = "Проверка осиротевших процессов (ppid=1)"
     category = "PROC"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            output = subprocess.check_output(["ps", "-eo", "ppid,comm"], text=True)
-        except Exception:
-            return self.skip(notes="Команда ps недоступна")
-        orphans = [line for line in output.splitlines() if line.strip().startswith("1 ")]
+        orphans = [p for p in processes(ctx).ppid if p == 1]
         if orphans:
             return self.ok(notes=f"Осиротевших процессов: {len(orphans)}")
         return self.ok(notes="Осиротевшие процессы отсутствуют")
@@ -87,28 +76,21 @@ class PROC_7004_LongRunningHighCpu(Check):
     id = "PROC-7004"
     title = "Проверка процессов с высоким использованием CPU"
     category = "PROC"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            output = subprocess.check_output(["ps", "-eo", "%cpu,comm"], text=True)
-        except Exception:
-            return self.skip(notes="Команда ps недоступна")
+        table = processes(ctx)
         bad: list[Finding] = []
-        for line in output.splitlines()[1:]:
-            parts = line.split(None, 1)
-            if len(parts) == 2:
-                try:
-                    cpu = float(parts[0])
-                    if cpu > 80.0:
-                        bad.append(
-                            Finding(
-                                id=self.id + ":cpu",
-                                description=f"Высокая загрузка CPU: {line}",
-                                severity=Severity.SUGGESTION,
-                            )
-                        )
-                except ValueError:
-                    continue
+        for i, pid in enumerate(table.pid):
+            cpu = table.cpu_percent(i)
+            if cpu > 80.0:
+                bad.append(
+                    Finding(
+                        id=self.id + ":cpu",
+                        description=f"Высокая загрузка CPU: {cpu:.1f}% {pid} {table.comm[i]}",
+                        severity=Severity.SUGGESTION,
+                    )
+                )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Процессов с высокой нагрузкой на CPU не найдено")
@@ -118,28 +100,17 @@ class PROC_7005_UnknownUsers(Check):
     id = "PROC-7005"
     title = "Проверка процессов с неизвестными пользователями"
     category = "PROC"
+    requires = ["fact:accounts", "fact:processes"]
 
     def run(self, ctx):
-        try:
-            passwd_lines = Path("/etc/passwd").read_text(encoding="utf-8").splitlines()
-            known_users = {u.split(":", 1)[0] for u in passwd_lines if u and ":" in u}
-        except (PermissionError, FileNotFoundError):
-            return self.skip(notes="Не удалось прочитать /etc/passwd")
-        try:
-            output = subprocess.check_output(["ps", "-eo", "user,comm"], text=True)
-        except Exception:
-            return self.skip(notes="Команда ps недоступна")
+        known = accounts(ctx).by_uid
         bad: list[Finding] = []
-        for line in output.splitlines()[1:]:
-            parts = line.split(None, 1)
-            if not parts:
-                continue
-            user = parts[0]
-            if user not in known_users:
+        for uid in sorted(processes(ctx).by_uid):
+            if uid not in known:
                 bad.append(
                     Finding(
                         id=self.id + ":unkusr",
-                        description=f"Процесс запущен от неизвестного пользователя: {user}",
+                        description=f"Процесс запущен от неизвестного пользователя: UID {uid}",
                         severity=Severity.WARNING,
                     )
                 )
@@ -1,7 +1,7 @@
-import subprocess
 from pathlib import Path
 from .base import Check
 from ..core.types import Finding, Severity
+from ..utils.cmd import run_cmd
 
 
 class SEC_1000_SELinux(Check):
@@ -13,7 +13,7 @@ class SEC_1000_SELinux(Check):
         if not Path("/etc/selinux/config").exists():
             return self.skip(notes="SELinux не установлен")
         try:
-            proc = subprocess.run(["getenforce"], capture_output=True, text=True)
+            proc = run_cmd(["getenforce"], check=False)
             if proc.returncode == 0:
                 mode = proc.stdout.strip()
                 if mode == "Enforcing":
@@ -39,7 +39,7 @@ class SEC_1001_AppArmor(Check):
         if not Path("/etc/apparmor").exists():
             return self.skip(notes="AppArmor не установлен")
         try:
-            proc = subprocess.run(["aa-status"], capture_output=True, text=True)
+            proc = run_cmd(["aa-status"], check=False)
             if proc.returncode == 0:
                 data = proc.stdout
                 if "enforce mode" in data.lower():
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import subprocess
 import os
 from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.processes import processes
 
 class SERVICES_1000_X11TcpDisabled(Check):
     id = "SERVICES-1000"
@@ -75,20 +75,17 @@ class SERVICES_1003_CupsDisabled(Check):
     id = "SERVICES-1003"
     title = "Проверка службы печати CUPS"
     category = "SERVICES"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            proc = subprocess.run(["pidof", "cupsd"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-            if proc.returncode == 0:
-                return self.fail([
-                    Finding(
-                        id=self.id + ":active",
-                        description="Служба печати cups активна",
-                        severity=Severity.SUGGESTION,
-                    )
-                ])
-        except Exception:
-            return self.skip(notes="Не удалось проверить cups")
+        if processes(ctx).running("cupsd"):
+            return self.fail([
+                Finding(
+                    id=self.id + ":active",
+                    description="Служба печати cups активна",
+                    severity=Severity.SUGGESTION,
+                )
+            ])
         return self.ok(notes="CUPS не работает")
 
 
@@ -96,18 +93,15 @@ class SERVICES_1004_NfsDisabled(Check):
     id = "SERVICES-1004"
     title = "Проверка службы NFS"
     category = "SERVICES"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
-        try:
-            proc = subprocess.run(["pidof", "nfsd"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-            if proc.returncode == 0:
-                return self.fail([
-                    Finding(
-                        id=self.id + ":active",
-                        description="Служба NFS активна",
-                        severity=Severity.SUGGESTION,
-                    )
-                ])
-        except Exception:
-            return self.skip(notes="Не удалось проверить nfsd")
+        if processes(ctx).running("nfsd"):
+            return self.fail([
+                Finding(
+                    id=self.id + ":active",
+                    description="Служба NFS активна",
+                    severity=Severity.SUGGESTION,
+                )
+            ])
         return self.ok(notes="NFS не работает")
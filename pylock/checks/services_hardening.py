@@ -1,20 +1,28 @@
 from __future__ import annotations
-import shutil, subprocess
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.processes import processes
+from ..facts.sockets import socket_owners, sockets
 
 class NoLegacyServices(Check):
     id = "NET:no-legacy"
     title = "Отсутствуют устаревшие сетевые службы (telnet/ftp/rsync без auth)"
     category = "OTHER"
+    requires = ["fact:sockets", "fact:processes"]
 
     def run(self, ctx):
-        if shutil.which("ss"):
-            p = subprocess.run(["ss","-lntup"], stdout=subprocess.PIPE, text=True)
-            out = p.stdout.lower()
-            for bad in ("telnet","in.telnetd","vsftpd","proftpd","pure-ftpd","tftp","in.tftpd"):
-                if bad in out:
-                    return self.fail([Finding(id=self.id+":legacy", description=f"Обнаружен {bad}", severity=Severity.HIGH)])
-            return self.ok()
-        return self.skip("ss недоступен")
+        table = processes(ctx)
+        owners = socket_owners(ctx)
+        row = {pid: i for i, pid in enumerate(table.pid)}
+        names: set[str] = set()
+        for sock in sockets(ctx).sockets:
+            for pid in owners.get(sock.inode, ()):
+                if pid in row:
+                    names.add(table.comm[row[pid]].lower())
+        for bad in ("telnet","in.telnetd","vsftpd","proftpd","pure-ftpd","tftp","in.tftpd"):
+            if any(bad in name for name in names):
+                return self.fail([Finding(
+                    id=self.id+":legacy", description=f"Обнаружен {bad}", severity=Severity.HIGH
+                )])
+        return self.ok()
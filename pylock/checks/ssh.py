@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-import subprocess
 from .base import Check
 from ..core.types import Finding, Severity
+from ..utils.cmd import run_cmds
+from ..facts.sshd import SSH_DIR, SSHD_CONFIG, ssh_host_key_bits, sshd_model
 
 
 class SSH_8000_SshdConfigExists(Check):
@@ -12,7 +13,7 @@ class SSH_8000_SshdConfigExists(Check):
     category = "SSH"
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
+        p = Path(SSHD_CONFIG)
         if p.exists():
             return self.ok(notes="Файл sshd_config найден")
         return self.fail([
@@ -24,93 +25,81 @@ class SSH_8000_SshdConfigExists(Check):
         ])
 
 
+def _expect(
+    check, cfg, key: str, expected: str, suffix: str, description: str, severity
+) -> list[Finding]:
+    """Находки, если эффективное значение параметра (глобально или в Match) не равно expected"""
+    findings: list[Finding] = []
+    if (cfg.get(key) or "").lower() != expected:
+        findings.append(Finding(id=check.id + suffix, description=description, severity=severity))
+    for criteria, value in cfg.overrides(key):
+        if value.lower() != expected:
+            findings.append(Finding(
+                id=check.id + suffix + ":match",
+                description=f"{description} (Match {criteria})",
+                severity=severity,
+            ))
+    return findings
+
+
 class SSH_8001_PermitRootLogin(Check):
     id = "SSH-8001"
     title = "Проверка параметра PermitRootLogin"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
-        if not p.exists():
-            return self.skip(notes="Файл sshd_config отсутствует")
-        try:
-            data = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return self.skip(notes="Не удалось прочитать sshd_config")
-        if "PermitRootLogin no" in data:
-            return self.ok(notes="Вход root по SSH запрещён")
-        return self.fail([
-            Finding(
-                id=self.id + ":rootlogin",
-                description="Разрешён вход root по SSH",
-                severity=Severity.WARNING,
-            )
-        ])
+        findings = _expect(self, sshd_model(ctx), "PermitRootLogin", "no", ":rootlogin",
+                           "Разрешён вход root по SSH", Severity.WARNING)
+        if findings:
+            return self.fail(findings)
+        return self.ok(notes="Вход root по SSH запрещён")
 
 
 class SSH_8002_PasswordAuthentication(Check):
     id = "SSH-8002"
     title = "Проверка параметра PasswordAuthentication"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
-        if not p.exists():
-            return self.skip(notes="Файл sshd_config отсутствует")
-        try:
-            data = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return self.skip(notes="Не удалось прочитать sshd_config")
-        if "PasswordAuthentication no" in data:
-            return self.ok(notes="Аутентификация по паролю отключена")
-        return self.fail([
-            Finding(
-                id=self.id + ":pwdauth",
-                description="Разрешена аутентификация по паролю",
-                severity=Severity.SUGGESTION,
-            )
-        ])
+        findings = _expect(self, sshd_model(ctx), "PasswordAuthentication", "no", ":pwdauth",
+                           "Разрешена аутентификация по паролю", Severity.SUGGESTION)
+        if findings:
+            return self.fail(findings)
+        return self.ok(notes="Аутентификация по паролю отключена")
 
 
 class SSH_8003_ProtocolVersion(Check):
     id = "SSH-8003"
     title = "Проверка версии протокола SSH"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
-        if not p.exists():
-            return self.skip(notes="Файл sshd_config отсутствует")
-        try:
-            data = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return self.skip(notes="Не удалось прочитать sshd_config")
-        if "Protocol 2" in data:
-            return self.ok(notes="Используется только протокол SSH 2")
-        return self.fail([
-            Finding(
-                id=self.id + ":proto",
-                description="Не принудительно используется SSH Protocol 2",
-                severity=Severity.WARNING,
-            )
-        ])
+        # Начиная с OpenSSH 7.4 поддерживается только протокол 2, параметр Protocol устарел
+        value = sshd_model(ctx).get("Protocol")
+        if value and "1" in [v.strip() for v in value.split(",")]:
+            return self.fail([
+                Finding(
+                    id=self.id + ":proto",
+                    description=f"Разрешён устаревший протокол SSH 1 (Protocol {value})",
+                    severity=Severity.WARNING,
+                )
+            ])
+        return self.ok(notes="Используется только протокол SSH 2")
 
 
 class SSH_8004_IdleTimeout(Check):
     id = "SSH-8004"
     title = "Проверка параметра ClientAliveInterval"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
-        if not p.exists():
-            return self.skip(notes="Файл sshd_config отсутствует")
-        try:
-            data = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return self.skip(notes="Не удалось прочитать sshd_config")
-        if "ClientAliveInterval" in data:
-            return self.ok(notes="Задан ClientAliveInterval")
+        value = (sshd_model(ctx).get("ClientAliveInterval") or "0").strip()
+        if value not in ("", "0"):
+            return self.ok(notes=f"Задан ClientAliveInterval {value}")
         return self.fail([
             Finding(
                 id=self.id + ":idle",
@@ -124,70 +113,46 @@ class SSH_8005_StrictModes(Check):
     id = "SSH-8005"
     title = "Проверка параметра StrictModes"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
-        if not p.exists():
-            return self.skip(notes="Файл sshd_config отсутствует")
-        try:
-            data = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return self.skip(notes="Не удалось прочитать sshd_config")
-        if "StrictModes yes" in data:
-            return self.ok(notes="StrictModes включён")
-        return self.fail([
-            Finding(
-                id=self.id + ":strict",
-                description="StrictModes не включён",
-                severity=Severity.SUGGESTION,
-            )
-        ])
+        findings = _expect(self, sshd_model(ctx), "StrictModes", "yes", ":strict",
+                           "StrictModes не включён", Severity.SUGGESTION)
+        if findings:
+            return self.fail(findings)
+        return self.ok(notes="StrictModes включён")
 
 
 class SSH_8006_X11Forwarding(Check):
     id = "SSH-8006"
     title = "Проверка параметра X11Forwarding"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        p = Path("/etc/ssh/sshd_config")
-        if not p.exists():
-            return self.skip(notes="Файл sshd_config отсутствует")
-        try:
-            data = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return self.skip(notes="Не удалось прочитать sshd_config")
-        if "X11Forwarding no" in data:
-            return self.ok(notes="X11 Forwarding отключён")
-        return self.fail([
-            Finding(
-                id=self.id + ":x11",
-                description="X11 Forwarding включён",
-                severity=Severity.SUGGESTION,
-            )
-        ])
+        findings = _expect(self, sshd_model(ctx), "X11Forwarding", "no", ":x11",
+                           "X11 Forwarding включён", Severity.SUGGESTION)
+        if findings:
+            return self.fail(findings)
+        return self.ok(notes="X11 Forwarding отключён")
 
 class SSH_8007_SshAlgorithms(Check):
     id = "SSH-8007"
     title = "Проверка sshd_config на устаревшие алгоритмы"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        cfg = Path("/etc/ssh/sshd_config")
-        if not cfg.exists():
-            return self.skip(notes="sshd_config не найден")
-        data = cfg.read_text(encoding="utf-8", errors="ignore")
+        cfg = sshd_model(ctx)
         bad_algos = ["arcfour", "3des", "blowfish", "aes128-cbc", "hmac-md5"]
         findings: list[Finding] = []
 
-        for line in data.splitlines():
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if any(bad in line.lower() for bad in bad_algos):
+        for key in ("Ciphers", "MACs", "KexAlgorithms", "HostKeyAlgorithms"):
+            weak = sorted({a for a in cfg.algorithms(key) if any(bad in a for bad in bad_algos)})
+            if weak:
                 findings.append(Finding(
                     id=self.id + ":weak",
-                    description=f"Обнаружен устаревший алгоритм в конфиге: {line}",
+                    description=f"Обнаружены устаревшие алгоритмы в {key}: {', '.join(weak)}",
                     severity=Severity.HIGH,
                 ))
         if findings:
@@ -201,22 +166,17 @@ class SSH_8008_SshKeyStrength(Check):
     category = "SSH"
 
     def run(self, ctx):
-        ssh_dir = Path("/etc/ssh")
-        if not ssh_dir.exists():
+        if not Path(SSH_DIR).exists():
             return self.skip(notes="Каталог /etc/ssh отсутствует")
         findings: list[Finding] = []
-        for keyfile in ssh_dir.glob("ssh_host_*_key.pub"):
-            try:
-                out = subprocess.check_output(["ssh-keygen", "-lf", str(keyfile)], text=True)
-                bits = int(out.split()[0])
-                if bits < 2048:
-                    findings.append(Finding(
-                        id=self.id + f":{keyfile.name}",
-                        description=f"Слабый SSH-ключ {keyfile.name} ({bits} бит)",
-                        severity=Severity.HIGH,
-                    ))
-            except Exception:
-                continue
+        # Длины ключей кэшируются между циклами агента, пока ключи не изменились
+        for name, bits in ssh_host_key_bits(ctx).items():
+            if bits is not None and bits < 2048:
+                findings.append(Finding(
+                    id=self.id + f":{name}",
+                    description=f"Слабый SSH-ключ {name} ({bits} бит)",
+                    severity=Severity.HIGH,
+                ))
         if findings:
             return self.fail(findings)
         return self.ok(notes="Все SSH-ключи имеют достаточную длину")
@@ -225,24 +185,27 @@ class SSH_8009_SshCiphers(Check):
     id = "SSH-8009"
     title = "Проверка списка Ciphers в sshd_config"
     category = "SSH"
+    requires = ["fact:sshd_config", "fact:sshd_model"]
 
     def run(self, ctx):
-        cfg = Path("/etc/ssh/sshd_config")
-        if not cfg.exists():
-            return self.skip(notes="sshd_config не найден")
-        data = cfg.read_text(encoding="utf-8", errors="ignore")
-        for line in data.splitlines():
-            if line.strip().startswith("Ciphers"):
-                if any(x in line for x in ["arcfour", "3des", "aes128-cbc"]):
-                    return self.fail([
-                        Finding(
-                            id=self.id + ":weak",
-                            description=f"Обнаружены слабые Ciphers: {line}",
-                            severity=Severity.HIGH,
-                        )
-                    ])
-                return self.ok(notes="Ciphers заданы и безопасны")
-        return self.skip(notes="Ciphers не заданы в sshd_config")
+        cfg = sshd_model(ctx)
+        if not cfg.explicit("Ciphers"):
+            return self.skip(notes="Ciphers не заданы в sshd_config")
+        weak = [
+            a for a in cfg.algorithms("Ciphers")
+            if any(x in a for x in ["arcfour", "3des", "aes128-cbc"])
+        ]
+        if weak:
+            return self.fail([
+                Finding(
+                    id=self.id + ":weak",
+                    description=f"Обнаружены слабые Ciphers: {', '.join(weak)}",
+                    severity=Severity.HIGH,
+                )
+            ])
+        if cfg.extends_defaults("Ciphers"):
+            return self.ok(notes="Ciphers изменяют встроенный список OpenSSH, слабых не добавлено")
+        return self.ok(notes="Ciphers заданы и безопасны")
 
 
 class SSL_1000_CertExpiry(Check):
@@ -255,10 +218,12 @@ class SSL_1000_CertExpiry(Check):
         if not certs:
             return self.skip(notes="Сертификаты не найдены")
         findings: list[Finding] = []
-        for cert in certs:
+        procs = run_cmds([["openssl", "x509", "-in", str(c), "-noout", "-enddate"] for c in certs])
+        for cert, proc in zip(certs, procs):
             try:
-                out = subprocess.check_output(["openssl", "x509", "-in", str(cert), "-noout", "-enddate"], text=True)
-                enddate = out.strip().split("=", 1)[1]
+                if proc.returncode != 0:
+                    continue
+                enddate = proc.stdout.strip().split("=", 1)[1]
                 # просто пишем дату, без сложного парсинга (иначе нужна dateutil)
                 findings.append(Finding(
                     id=self.id + f":{cert.name}",
@@ -1,198 +1,57 @@
 from __future__ import annotations
 
-from pathlib import Path
-import subprocess
-from .base import Check
+from .base import Check, SysctlRule, define_sysctl_checks
 from ..core.types import Finding, Severity
-
-
-class SYSCTL_9000_IpForward(Check):
-    id = "SYSCTL-9000"
-    title = "Проверка net.ipv4.ip_forward"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/ip_forward")
-        if not path.exists():
-            return self.skip(notes="Параметр ip_forward недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать ip_forward")
-        if val == "0":
-            return self.ok(notes="IP forwarding отключён")
-        f = Finding(
-            id=self.id + ":on",
-            description="Включён IP forwarding",
-            severity=Severity.SUGGESTION,
-        )
-        return self.fail([f])
-
-
-class SYSCTL_9001_IcmpRedirects(Check):
-    id = "SYSCTL-9001"
-    title = "Проверка net.ipv4.conf.all.accept_redirects"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/conf/all/accept_redirects")
-        if not path.exists():
-            return self.skip(notes="Параметр accept_redirects недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать accept_redirects")
-        if val == "0":
-            return self.ok(notes="ICMP redirects отключены")
-        f = Finding(
-            id=self.id + ":on",
-            description="Разрешены ICMP redirects",
-            severity=Severity.WARNING,
-        )
-        return self.fail([f])
-
-
-class SYSCTL_9002_SecureRedirects(Check):
-    id = "SYSCTL-9002"
-    title = "Проверка net.ipv4.conf.all.secure_redirects"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/conf/all/secure_redirects")
-        if not path.exists():
-            return self.skip(notes="Параметр secure_redirects недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать secure_redirects")
-        if val == "0":
-            return self.ok(notes="Secure redirects отключены")
-        f = Finding(
-            id=self.id + ":on",
-            description="Разрешены secure redirects",
-            severity=Severity.SUGGESTION,
-        )
-        return self.fail([f])
-
-
-class SYSCTL_9003_AcceptSourceRoute(Check):
-    id = "SYSCTL-9003"
-    title = "Проверка net.ipv4.conf.all.accept_source_route"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/conf/all/accept_source_route")
-        if not path.exists():
-            return self.skip(notes="Параметр accept_source_route недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать accept_source_route")
-        if val == "0":
-            return self.ok(notes="Source routing отключён")
-        f = Finding(
-            id=self.id + ":on",
-            description="Разрешён source routing",
-            severity=Severity.WARNING,
-        )
-        return self.fail([f])
-
-
-class SYSCTL_9004_LogMartians(Check):
-    id = "SYSCTL-9004"
-    title = "Проверка net.ipv4.conf.all.log_martians"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/conf/all/log_martians")
-        if not path.exists():
-            return self.skip(notes="Параметр log_martians недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать log_martians")
-        if val == "1":
-            return self.ok(notes="Логирование martian-пакетов включено")
-        f = Finding(
-            id=self.id + ":off",
-            description="Логирование martian-пакетов отключено",
-            severity=Severity.SUGGESTION,
-        )
-        return self.fail([f])
-
-
-class SYSCTL_9005_Ipv6Disable(Check):
-    id = "SYSCTL-9005"
-    title = "Проверка net.ipv6.conf.all.disable_ipv6"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv6/conf/all/disable_ipv6")
-        if not path.exists():
-            return self.skip(notes="Параметр disable_ipv6 недоступен")
-        try:
-            val = path.read_text().strip()
-        except (PermissionError, FileNotFoundError, OSError):
-            return self.skip(notes="Не удалось прочитать disable_ipv6")
-        if val == "1":
-            return self.ok(notes="IPv6 отключён")
-        return self.ok(notes="IPv6 включён")
-
-class SYSCTL_9006_RpFilter(Check):
-    id = "SYSCTL-9006"
-    title = "Проверка net.ipv4.conf.all.rp_filter"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/conf/all/rp_filter")
-        if not path.exists():
-            return self.skip(notes="rp_filter недоступен")
-        val = path.read_text().strip()
-        if val in {"1", "2"}:
-            return self.ok(notes=f"rp_filter включён ({val})")
-        return self.fail([
-            Finding(
-                id=self.id + ":off",
-                description="rp_filter выключен — защита от IP spoofing отсутствует",
-                severity=Severity.WARNING,
-            )
-        ])
-
-
-class SYSCTL_9007_IcmpBroadcast(Check):
-    id = "SYSCTL-9007"
-    title = "Проверка net.ipv4.icmp_echo_ignore_broadcasts"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/icmp_echo_ignore_broadcasts")
-        if not path.exists():
-            return self.skip(notes="icmp_echo_ignore_broadcasts недоступен")
-        val = path.read_text().strip()
-        if val == "1":
-            return self.ok(notes="ICMP broadcast игнорируются")
-        return self.fail([
-            Finding(
-                id=self.id + ":on",
-                description="ICMP broadcast разрешены (может быть использован Smurf-атакой)",
-                severity=Severity.WARNING,
-            )
-        ])
+from ..facts.processes import processes
+
+
+SYSCTL_RULES = (
+    SysctlRule("SYSCTL-9000", "SYSCTL_9000_IpForward", "net.ipv4.ip_forward", frozenset({"0"}),
+               "IP forwarding отключён", "Включён IP forwarding", Severity.SUGGESTION),
+    SysctlRule("SYSCTL-9001", "SYSCTL_9001_IcmpRedirects", "net.ipv4.conf.all.accept_redirects",
+               frozenset({"0"}), "ICMP redirects отключены", "Разрешены ICMP redirects"),
+    SysctlRule("SYSCTL-9002", "SYSCTL_9002_SecureRedirects", "net.ipv4.conf.all.secure_redirects",
+               frozenset({"0"}), "Secure redirects отключены", "Разрешены secure redirects",
+               Severity.SUGGESTION),
+    SysctlRule("SYSCTL-9003", "SYSCTL_9003_AcceptSourceRoute",
+               "net.ipv4.conf.all.accept_source_route", frozenset({"0"}),
+               "Source routing отключён", "Разрешён source routing"),
+    SysctlRule("SYSCTL-9004", "SYSCTL_9004_LogMartians", "net.ipv4.conf.all.log_martians",
+               frozenset({"1"}), "Логирование martian-пакетов включено",
+               "Логирование martian-пакетов отключено", Severity.SUGGESTION, "off"),
+    SysctlRule("SYSCTL-9005", "SYSCTL_9005_Ipv6Disable", "net.ipv6.conf.all.disable_ipv6",
+               frozenset({"1"}), "IPv6 отключён", other_note="IPv6 включён"),
+    SysctlRule("SYSCTL-9006", "SYSCTL_9006_RpFilter", "net.ipv4.conf.all.rp_filter",
+               frozenset({"1", "2"}), "rp_filter включён ({value})",
+               "rp_filter выключен — защита от IP spoofing отсутствует", suffix="off"),
+    SysctlRule("SYSCTL-9007", "SYSCTL_9007_IcmpBroadcast", "net.ipv4.icmp_echo_ignore_broadcasts",
+               frozenset({"1"}), "ICMP broadcast игнорируются",
+               "ICMP broadcast разрешены (может быть использован Smurf-атакой)"),
+    SysctlRule("SYSCTL-9008", "SYSCTL_9008_Ipv6Forward", "net.ipv6.conf.all.forwarding",
+               frozenset({"0"}), "IPv6 forwarding отключён", "IPv6 forwarding включён"),
+    SysctlRule("SYSCTL-9009", "SYSCTL_9009_SendRedirects", "net.ipv4.conf.all.send_redirects",
+               frozenset({"0"}), "send_redirects отключены",
+               "send_redirects включены — небезопасно"),
+    SysctlRule("SYSCTL-9010", "SYSCTL_9010_IcmpBogusResponses",
+               "net.ipv4.icmp_ignore_bogus_error_responses", frozenset({"1"}),
+               "Неверные ICMP-ответы игнорируются", "Система принимает bogus ICMP-ответы",
+               Severity.SUGGESTION, "off"),
+)
+
+define_sysctl_checks(SYSCTL_RULES, globals(), "SYSCTL")
 
 
 class NETW_5007_NtpActive(Check):
     id = "NETW-5007"
     title = "Проверка синхронизации времени (ntpd/chronyd/systemd-timesyncd)"
     category = "NETW"
+    requires = ["fact:processes"]
 
     def run(self, ctx):
+        table = processes(ctx)
         for svc in ("ntpd", "chronyd", "systemd-timesyncd"):
-            try:
-                proc = subprocess.run(["pidof", svc], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-                if proc.returncode == 0:
-                    return self.ok(notes=f"Сервис синхронизации времени активен: {svc}")
-            except Exception:
-                continue
+            if table.running(svc):
+                return self.ok(notes=f"Сервис синхронизации времени активен: {svc}")
         return self.fail([
             Finding(
                 id=self.id + ":inactive",
@@ -200,65 +59,3 @@ class NETW_5007_NtpActive(Check):
                 severity=Severity.SUGGESTION,
             )
         ])
-
-
-class SYSCTL_9008_Ipv6Forward(Check):
-    id = "SYSCTL-9008"
-    title = "Проверка net.ipv6.conf.all.forwarding"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv6/conf/all/forwarding")
-        if not path.exists():
-            return self.skip(notes="IPv6 forwarding недоступен")
-        val = path.read_text().strip()
-        if val == "0":
-            return self.ok(notes="IPv6 forwarding отключён")
-        return self.fail([
-            Finding(
-                id=self.id + ":on",
-                description="IPv6 forwarding включён",
-                severity=Severity.WARNING,
-            )
-        ])
-
-class SYSCTL_9009_SendRedirects(Check):
-    id = "SYSCTL-9009"
-    title = "Проверка net.ipv4.conf.all.send_redirects"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/conf/all/send_redirects")
-        if not path.exists():
-            return self.skip(notes="send_redirects недоступен")
-        val = path.read_text().strip()
-        if val == "0":
-            return self.ok(notes="send_redirects отключены")
-        return self.fail([
-            Finding(
-                id=self.id + ":on",
-                description="send_redirects включены — небезопасно",
-                severity=Severity.WARNING,
-            )
-        ])
-
-
-class SYSCTL_9010_IcmpBogusResponses(Check):
-    id = "SYSCTL-9010"
-    title = "Проверка net.ipv4.icmp_ignore_bogus_error_responses"
-    category = "SYSCTL"
-
-    def run(self, ctx):
-        path = Path("/proc/sys/net/ipv4/icmp_ignore_bogus_error_responses")
-        if not path.exists():
-            return self.skip(notes="icmp_ignore_bogus_error_responses недоступен")
-        val = path.read_text().strip()
-        if val == "1":
-            return self.ok(notes="Неверные ICMP-ответы игнорируются")
-        return self.fail([
-            Finding(
-                id=self.id + ":off",
-                description="Система принимает bogus ICMP-ответы",
-                severity=Severity.SUGGESTION,
-            )
-        ])
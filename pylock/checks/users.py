@@ -4,24 +4,17 @@ from pathlib import Path
 
 from .base import Check
 from ..core.types import Finding, Severity
+from ..facts.accounts import accounts
 
 
 class USERS_10000_RootUid(Check):
     id = "USERS-10000"
     title = "Проверка наличия нескольких аккаунтов с UID 0"
     category = "USERS"
+    requires = ["fact:accounts"]
 
     def run(self, ctx):
-        passwd = Path("/etc/passwd")
-        if not passwd.exists():
-            return self.skip(notes="Файл /etc/passwd отсутствует")
-        try:
-            roots = [
-                line for line in passwd.read_text(encoding="utf-8").splitlines()
-                if len(line.split(":")) > 2 and line.split(":")[2] == "0"
-            ]
-        except Exception:
-            return self.skip(notes="Не удалось прочитать /etc/passwd")
+        roots = accounts(ctx).by_uid.get(0, [])
         if len(roots) > 1:
             f = Finding(
                 id=self.id + ":multi",
@@ -36,25 +29,22 @@ class USERS_10001_EmptyPasswords(Check):
     id = "USERS-10001"
     title = "Проверка пользователей с пустыми паролями"
     category = "USERS"
+    requires = ["fact:accounts"]
 
     def run(self, ctx):
-        shadow = Path("/etc/shadow")
-        if not shadow.exists():
-            return self.skip(notes="Файл /etc/shadow отсутствует")
+        db = accounts(ctx)
+        if not db.shadow_readable:
+            return self.skip(notes="Не удалось прочитать /etc/shadow")
         bad: list[Finding] = []
-        try:
-            for line in shadow.read_text(encoding="utf-8").splitlines():
-                parts = line.split(":")
-                if len(parts) > 1 and parts[1] == "":
-                    bad.append(
-                        Finding(
-                            id=self.id + f":{parts[0]}",
-                            description=f"У пользователя {parts[0]} пустой пароль",
-                            severity=Severity.HIGH,
-                        )
+        for entry in db.shadow:
+            if entry.password == "":
+                bad.append(
+                    Finding(
+                        id=self.id + f":{entry.name}",
+                        description=f"У пользователя {entry.name} пустой пароль",
+                        severity=Severity.HIGH,
                     )
-        except Exception:
-            return self.skip(notes="Не удалось прочитать /etc/shadow")
+                )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Пользователей с пустыми паролями не найдено")
@@ -64,32 +54,25 @@ class USERS_10002_HomeDirectories(Check):
     id = "USERS-10002"
     title = "Проверка прав на домашние директории пользователей"
     category = "USERS"
+    requires = ["fact:accounts"]
 
     def run(self, ctx):
-        passwd = Path("/etc/passwd")
-        if not passwd.exists():
-            return self.skip(notes="Файл /etc/passwd отсутствует")
         bad: list[Finding] = []
-        try:
-            for line in passwd.read_text(encoding="utf-8").splitlines():
-                parts = line.split(":")
-                if len(parts) > 5:
-                    home = Path(parts[5])
-                    if home.exists():
-                        try:
-                            st = home.stat()
-                        except (PermissionError, FileNotFoundError):
-                            continue
-                        if st.st_mode & 0o022:
-                            bad.append(
-                                Finding(
-                                    id=self.id + f":{parts[0]}",
-                                    description=f"Домашняя директория {parts[0]} имеет слишком широкие права",
-                                    severity=Severity.SUGGESTION,
-                                )
-                            )
-        except Exception:
-            return self.skip(notes="Не удалось прочитать /etc/passwd")
+        for acc in accounts(ctx).users:
+            if not acc.home:
+                continue
+            try:
+                st = Path(acc.home).stat()
+            except OSError:
+                continue
+            if st.st_mode & 0o022:
+                bad.append(
+                    Finding(
+                        id=self.id + f":{acc.name}",
+                        description=f"Домашняя директория {acc.name} имеет слишком широкие права",
+                        severity=Severity.SUGGESTION,
+                    )
+                )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Права домашних директорий пользователей корректны")
@@ -99,31 +82,21 @@ class USERS_10003_NologinShells(Check):
     id = "USERS-10003"
     title = "Проверка системных аккаунтов на использование nologin"
     category = "USERS"
+    requires = ["fact:accounts"]
 
     def run(self, ctx):
-        passwd = Path("/etc/passwd")
-        if not passwd.exists():
-            return self.skip(notes="Файл /etc/passwd отсутствует")
         bad: list[Finding] = []
-        try:
-            for line in passwd.read_text(encoding="utf-8").splitlines():
-                parts = line.split(":")
-                if len(parts) > 6:
-                    shell = parts[6]
-                    try:
-                        uid = int(parts[2])
-                    except ValueError:
-                        continue
-                    if uid < 1000 and not ("nologin" in shell or "false" in shell):
-                        bad.append(
-                            Finding(
-                                id=self.id + f":{parts[0]}",
-                                description=f"Системный аккаунт {parts[0]} использует shell {shell}",
-                                severity=Severity.SUGGESTION,
-                            )
-                        )
-        except Exception:
-            return self.skip(notes="Не удалось прочитать /etc/passwd")
+        for acc in accounts(ctx).users:
+            if acc.uid is None:
+                continue
+            if acc.uid < 1000 and not ("nologin" in acc.shell or "false" in acc.shell):
+                bad.append(
+                    Finding(
+                        id=self.id + f":{acc.name}",
+                        description=f"Системный аккаунт {acc.name} использует shell {acc.shell}",
+                        severity=Severity.SUGGESTION,
+                    )
+                )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Все системные аккаунты используют nologin/false")
@@ -133,30 +106,20 @@ class USERS_10004_DuplicateUIDs(Check):
     id = "USERS-10004"
     title = "Проверка на дублирующиеся UID"
     category = "USERS"
+    requires = ["fact:accounts"]
 
     def run(self, ctx):
-        passwd = Path("/etc/passwd")
-        if not passwd.exists():
-            return self.skip(notes="Файл /etc/passwd отсутствует")
-        uids = {}
         bad: list[Finding] = []
-        try:
-            for line in passwd.read_text(encoding="utf-8").splitlines():
-                parts = line.split(":")
-                if len(parts) > 2:
-                    uid = parts[2]
-                    if uid in uids:
-                        bad.append(
-                            Finding(
-                                id=self.id + f":{parts[0]}",
-                                description=f"UID {uid} используется у {parts[0]} и {uids[uid]}",
-                                severity=Severity.WARNING,
-                            )
-                        )
-                    else:
-                        uids[uid] = parts[0]
-        except Exception:
-            return self.skip(notes="Не удалось прочитать /etc/passwd")
+        for uid, accs in accounts(ctx).duplicate_uids().items():
+            first = accs[0].name
+            for acc in accs[1:]:
+                bad.append(
+                    Finding(
+                        id=self.id + f":{acc.name}",
+                        description=f"UID {uid} используется у {acc.name} и {first}",
+                        severity=Severity.WARNING,
+                    )
+                )
         if bad:
             return self.fail(bad)
         return self.ok(notes="Дублирующихся UID не найдено")
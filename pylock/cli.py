@@ -3,14 +3,16 @@ from __future__ import annotations
 import argparse
 import sys
 import time
-import subprocess
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-import requests
+from .reporters import REPORTERS
 
-from .engine.auditor import Auditor
-from .config.loader import load_profile
-from .utils.discovery import discover_server
+if TYPE_CHECKING:
+    from .core.types import Report
+    from .engine.auditor import Auditor
+
+# Движок аудита, транспорт (requests) и репортёры импортируются по
+# требованию: `pylock --help` и запуск из cron не платят за лишние модули.
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -20,27 +22,73 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "command",
-        choices=["audit", "agentd", "ui"],
+        choices=["audit", "agentd", "ui", "fim-update"],
         help="Команда для запуска",
     )
     parser.add_argument(
         "subject", nargs="?", default=None, help="Что проверять (по умолчанию: зона+ip)"
     )
     parser.add_argument("--profile", dest="profile", help="Path to profile (.prf/.ini/.toml)")
-    parser.add_argument("--tests", dest="tests", help="Comma-separated list of tests to run")
-    parser.add_argument("--skip", dest="skip", help="Comma-separated list of tests to skip")
+    parser.add_argument(
+        "--tests",
+        dest="tests",
+        help="Comma-separated test selectors to run: ID, SSH-*, category:FILE, tag:firewalld",
+    )
+    parser.add_argument("--skip", dest="skip", help="Comma-separated test selectors to skip")
     parser.add_argument("--interval", type=int, default=300, help="Интервал между аудитами (сек)")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Количество параллельных потоков проверок"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="Лимит времени одной проверки (сек)"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Общий лимит времени аудита (сек); для agentd по умолчанию — интервал",
+    )
+    parser.add_argument(
+        "--isolate",
+        dest="isolate",
+        help="Comma-separated tests, categories or selectors to run in separate processes",
+    )
+    parser.add_argument(
+        "--isolate-mem", type=int, default=None, help="Лимит памяти изолированной проверки (МБ)"
+    )
+    parser.add_argument(
+        "--max-procs",
+        type=int,
+        default=None,
+        help="Максимум одновременно запущенных внешних команд",
+    )
+    parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=sorted(REPORTERS),
+        default=None,
+        help="Сформировать отчёт репортёром заданного формата (вместо payload для сервера)",
+    )
+    parser.add_argument(
+        "--output", "-o", dest="output", default=None, help="Файл для отчёта (с --format)"
+    )
 
     return parser
 
 
-def run_audit(args) -> dict:
-    """Запускает аудит и возвращает отчёт в виде dict"""
-    profile = load_profile(args.profile)
-    tests = args.tests.split(",") if args.tests else profile.include_tests
-    skip = args.skip.split(",") if args.skip else profile.skip_tests
+def audit_report(args, auditor: Optional[Auditor] = None) -> Report:
+    """
+    Запускает аудит и возвращает Report.
+    Переданный auditor переиспользуется (кэши профиля и фактов между циклами).
+    """
+    # Списки из профиля подставляет Auditor.run
+    tests = args.tests.split(",") if args.tests else None
+    skip = args.skip.split(",") if args.skip else None
 
-    auditor = Auditor(verbose=False, debug=False)
+    if auditor is None:
+        from .engine.auditor import Auditor
+
+        auditor = Auditor(verbose=False, debug=False)
 
     subject = None if args.subject == "checks" else args.subject
 
@@ -49,8 +97,21 @@ def run_audit(args) -> dict:
         profile_path=args.profile,
         tests=tests,
         skip=skip,
+        workers=args.workers,
+        timeout=args.timeout,
+        deadline=args.deadline,
+        isolate=args.isolate.split(",") if args.isolate else None,
+        isolate_mem=args.isolate_mem,
+        max_procs=args.max_procs,
     )
+    return report
+
 
+def run_audit(args, auditor: Optional[Auditor] = None) -> dict:
+    """Запускает аудит и возвращает отчёт в виде dict"""
+    from dataclasses import asdict
+
+    report = audit_report(args, auditor)
     payload = {
         "subject": report.subject,
         "meta": report.meta,
@@ -60,6 +121,7 @@ def run_audit(args) -> dict:
                 "status": c.status,
                 "title": c.title,
                 "notes": c.notes,
+                "metrics": asdict(c.metrics) if c.metrics else None,
                 "findings": [
                     {
                         "id": f.id,
@@ -77,6 +139,8 @@ def run_audit(args) -> dict:
 
 def send_report(payload: dict, server_url: str) -> bool:
     try:
+        import requests  # тяжёлый импорт (urllib3, certifi) нужен только здесь
+
         resp = requests.post(server_url, json=payload, timeout=10)
         print(f"[AGENT] Отчёт отправлен на {server_url}, статус {resp.status_code}")
         return resp.status_code == 200
@@ -87,9 +151,21 @@ def send_report(payload: dict, server_url: str) -> bool:
 
 def run_agentd(args):
     """Фоновый агент"""
+    from .config.loader import load_profile
+    from .engine.auditor import Auditor
+    from .utils.discovery import discover_server
+
+    if args.deadline is None and load_profile(args.profile).deadline is None:
+        # Аудит не должен наезжать на следующий цикл
+        args.deadline = float(args.interval)
     server_url = None
+    # Один экземпляр на всё время работы демона: кэши переживают циклы
+    auditor = Auditor(verbose=False, debug=False)
     while True:
-        payload = run_audit(args)
+        payload = run_audit(args, auditor)
+        wall = payload["meta"].get("metrics", {}).get("wall_s")
+        if wall is not None:
+            print(f"[AGENTD] Аудит выполнен за {wall:.2f} сек.")
 
         if not server_url:
             server_url = discover_server(timeout=args.interval)
@@ -103,8 +179,35 @@ def run_agentd(args):
         time.sleep(args.interval)
 
 
+def run_fim_update(args) -> int:
+    """Принять текущее состояние контролируемых и SUID/SGID-файлов как эталон"""
+    from .config.loader import load_profile
+    from .engine.context import Context
+    from .facts.integrity import fim, fim_store, suid_inventory, suid_store
+
+    profile = load_profile(args.profile)
+    ctx = Context(subject="fim", profile_path=args.profile, env={}, profile=profile)
+    # Снять текущее состояние (хеши неизменившихся файлов берутся из прошлого запуска)
+    rep = fim(ctx)
+    if rep is None:
+        print("[FIM] Контролируемые пути не найдены")
+        return 1
+    if not rep.saved:
+        print("[FIM] Не удалось записать состояние")
+        return 1
+    print(f"[FIM] Эталон обновлён: {fim_store().accept()} файлов")
+    inv = suid_inventory(ctx)
+    if not inv.complete or not inv.saved:
+        print("[FIM] Не удалось снять инвентарь SUID/SGID")
+        return 1
+    print(f"[FIM] Эталон SUID/SGID обновлён: {suid_store().accept()} файлов")
+    return 0
+
+
 def run_ui():
     """Запуск streamlit дашборда"""
+    import subprocess
+
     try:
         subprocess.run(
             ["streamlit", "run", "pylock/ui_streamlit.py"],
@@ -119,7 +222,19 @@ def main(argv: Optional[List[str]] = None) -> int:
     args = build_parser().parse_args(argv)
 
     if args.command == "audit":
-        payload = run_audit(args)
+        try:
+            if args.fmt:
+                from .reporters import get_reporter
+
+                get_reporter(args.fmt).emit(audit_report(args), args.output)
+                return 0
+            payload = run_audit(args)
+        except ValueError as e:
+            # Ошибка в селекторах проверок
+            print(f"[ERROR] {e}")
+            return 2
+        from .utils.discovery import discover_server
+
         server_url = discover_server(timeout=10)
         if server_url:
             send_report(payload, server_url)
@@ -132,6 +247,9 @@ def main(argv: Optional[List[str]] = None) -> int:
         run_agentd(args)
         return 0
 
+    if args.command == "fim-update":
+        return run_fim_update(args)
+
     if args.command == "ui":
         run_ui()
         return 0
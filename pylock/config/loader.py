@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List
 import configparser
 import pathlib
@@ -16,8 +16,24 @@ class Profile:
     """Описание профиля pylock"""
     name: str
     path: Optional[str]
-    include_tests: List[str]
+    include_tests: List[str]  # Селекторы проверок: id, "SSH-*", "category:FILE", "tag:ufw"
     skip_tests: List[str]
+    workers: Optional[int] = None
+    timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    isolate: List[str] = field(default_factory=list)
+    isolate_mem: Optional[int] = None
+    max_procs: Optional[int] = None
+    # В дополнение к встроенному списку PKGS-6006
+    banned_packages: List[str] = field(default_factory=list)
+    fs_one_device: bool = False  # Обход ФС не покидает устройство корня (как find -xdev)
+    fs_workers: Optional[int] = None  # Потоков обхода ФС (None — по числу CPU)
+    # Секунд между полными обходами ФС (0 — без индекса)
+    fs_full_scan_interval: Optional[int] = None
+    # Лимит времени общего обхода ФС, сек (None — встроенный, 0 — без лимита)
+    fs_walk_timeout: Optional[float] = None
+    # Контролируемые FIM пути (пусто — встроенный список)
+    fim_paths: List[str] = field(default_factory=list)
 
 
 # Профиль по умолчанию
@@ -33,6 +49,18 @@ def _parse_ini(text: str) -> Profile:
         return _DEF
     include: list[str] = []
     skip: list[str] = []
+    workers: Optional[int] = None
+    timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    isolate: list[str] = []
+    isolate_mem: Optional[int] = None
+    max_procs: Optional[int] = None
+    banned: list[str] = []
+    one_device = False
+    fs_workers: Optional[int] = None
+    full_scan: Optional[int] = None
+    walk_timeout: Optional[float] = None
+    fim_paths: list[str] = []
     if cp.has_section("pylock"):
         include = [
             x.strip()
@@ -44,7 +72,48 @@ def _parse_ini(text: str) -> Profile:
             for x in cp.get("pylock", "skip", fallback="").split(",")
             if x.strip()
         ]
-    return Profile(name="ini", path=None, include_tests=include, skip_tests=skip)
+        workers = cp.getint("pylock", "workers", fallback=None)
+        timeout = cp.getfloat("pylock", "timeout", fallback=None)
+        deadline = cp.getfloat("pylock", "deadline", fallback=None)
+        isolate = [
+            x.strip()
+            for x in cp.get("pylock", "isolate", fallback="").split(",")
+            if x.strip()
+        ]
+        isolate_mem = cp.getint("pylock", "isolate_mem", fallback=None)
+        max_procs = cp.getint("pylock", "max_procs", fallback=None)
+        banned = [
+            x.strip()
+            for x in cp.get("pylock", "banned_packages", fallback="").split(",")
+            if x.strip()
+        ]
+        one_device = cp.getboolean("pylock", "fs_one_device", fallback=False)
+        fs_workers = cp.getint("pylock", "fs_workers", fallback=None)
+        full_scan = cp.getint("pylock", "fs_full_scan_interval", fallback=None)
+        walk_timeout = cp.getfloat("pylock", "fs_walk_timeout", fallback=None)
+        fim_paths = [
+            x.strip()
+            for x in cp.get("pylock", "fim_paths", fallback="").split(",")
+            if x.strip()
+        ]
+    return Profile(
+        name="ini",
+        path=None,
+        include_tests=include,
+        skip_tests=skip,
+        workers=workers,
+        timeout=timeout,
+        deadline=deadline,
+        isolate=isolate,
+        isolate_mem=isolate_mem,
+        max_procs=max_procs,
+        banned_packages=banned,
+        fs_one_device=one_device,
+        fs_workers=fs_workers,
+        fs_full_scan_interval=full_scan,
+        fs_walk_timeout=walk_timeout,
+        fim_paths=fim_paths,
+    )
 
 
 def _parse_toml(data: bytes) -> Profile:
@@ -58,7 +127,36 @@ def _parse_toml(data: bytes) -> Profile:
     node = doc.get("pylock", {})
     include = node.get("tests", []) or []
     skip = node.get("skip", []) or []
-    return Profile(name="toml", path=None, include_tests=list(include), skip_tests=list(skip))
+    workers = node.get("workers")
+    timeout = node.get("timeout")
+    deadline = node.get("deadline")
+    isolate = node.get("isolate", []) or []
+    isolate_mem = node.get("isolate_mem")
+    max_procs = node.get("max_procs")
+    banned = node.get("banned_packages", []) or []
+    one_device = node.get("fs_one_device", False)
+    fs_workers = node.get("fs_workers")
+    full_scan = node.get("fs_full_scan_interval")
+    walk_timeout = node.get("fs_walk_timeout")
+    fim_paths = node.get("fim_paths", []) or []
+    return Profile(
+        name="toml",
+        path=None,
+        include_tests=list(include),
+        skip_tests=list(skip),
+        workers=int(workers) if workers is not None else None,
+        timeout=float(timeout) if timeout is not None else None,
+        deadline=float(deadline) if deadline is not None else None,
+        isolate=list(isolate),
+        isolate_mem=int(isolate_mem) if isolate_mem is not None else None,
+        max_procs=int(max_procs) if max_procs is not None else None,
+        banned_packages=list(banned),
+        fs_one_device=bool(one_device),
+        fs_workers=int(fs_workers) if fs_workers is not None else None,
+        fs_full_scan_interval=int(full_scan) if full_scan is not None else None,
+        fs_walk_timeout=float(walk_timeout) if walk_timeout is not None else None,
+        fim_paths=list(fim_paths),
+    )
 
 
 def load_profile(path: Optional[str]) -> Profile:
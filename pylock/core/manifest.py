@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import importlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+from ..utils.storage import cache_dir, read_json, write_json_atomic
+from .selectors import Selector, matches_any
+
+CHECKS_PACKAGE = "pylock.checks"
+MANIFEST_NAME = "checks-manifest.json"
+# Увеличивать при изменении формата манифеста
+MANIFEST_VERSION = 1
+
+
+def _package_dir() -> Path:
+    # Пакет pylock.checks пуст, импорт самого пакета модули проверок не тянет
+    pkg = importlib.import_module(CHECKS_PACKAGE)
+    return Path(next(iter(pkg.__path__)))
+
+
+def _sources(pkg_dir: Path) -> Dict[str, List[int]]:
+    """Имя модуля -> [mtime_ns, size] исходника: отпечаток для проверки актуальности."""
+    out: Dict[str, List[int]] = {}
+    with os.scandir(pkg_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith(".py") or name == "__init__.py":
+                continue
+            st = entry.stat()
+            out[f"{CHECKS_PACKAGE}.{name[:-3]}"] = [st.st_mtime_ns, st.st_size]
+    return out
+
+
+def _import_module(name: str) -> bool:
+    try:
+        importlib.import_module(name)
+        return True
+    except Exception as e:
+        # Не даём упасть всему процессу при ошибке загрузки одного модуля
+        print(f"[WARN] Не удалось загрузить модуль проверки {name}: {e}")
+        return False
+
+
+def build_manifest(sources: Optional[Dict[str, List[int]]] = None) -> dict:
+    """
+    Построить манифест: импортировать все модули проверок и записать,
+    в каком модуле находится каждая проверка.
+
+    :param sources: Отпечатки исходников (по умолчанию — снимаются заново).
+    :return: Манифест {"version", "sources", "checks": {id: {...}}}.
+    """
+    from .registry import _REGISTRY
+
+    if sources is None:
+        sources = _sources(_package_dir())
+    for name in sorted(sources):
+        _import_module(name)
+    checks = {
+        cid: {
+            "module": cls.__module__,
+            "category": getattr(cls, "category", None),
+            "tags": list(getattr(cls, "tags", None) or []),
+            "requires": list(getattr(cls, "requires", None) or []),
+        }
+        for cid, cls in _REGISTRY.items()
+        if cls.__module__ in sources
+    }
+    return {"version": MANIFEST_VERSION, "sources": sources, "checks": checks}
+
+
+_MANIFEST: Optional[dict] = None
+
+
+def _valid_checks(checks: object, sources: Dict[str, List[int]]) -> bool:
+    """
+    Записи манифеста ссылаются только на модули из sources: имена модулей
+    из кэша импортируются, и чужой модуль вне pylock.checks недопустим.
+    """
+    if not isinstance(checks, dict):
+        return False
+    for e in checks.values():
+        if not isinstance(e, dict):
+            return False
+        module = e.get("module")
+        if not isinstance(module, str) or module not in sources:
+            return False
+        if not module.startswith(CHECKS_PACKAGE + "."):
+            return False
+    return True
+
+
+def load_manifest() -> dict:
+    """
+    Актуальный манифест проверок.
+
+    Берётся из памяти процесса или из кэша на диске; если набор модулей или
+    их mtime/размер изменились или записи ссылаются на модули вне
+    pylock.checks, манифест перестраивается и перезаписывается.
+    """
+    global _MANIFEST
+    sources = _sources(_package_dir())
+    if _MANIFEST is not None and _MANIFEST.get("sources") == sources:
+        return _MANIFEST
+    path = cache_dir() / MANIFEST_NAME
+    data = read_json(path)
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != MANIFEST_VERSION
+        or data.get("sources") != sources
+        or not _valid_checks(data.get("checks"), sources)
+    ):
+        data = build_manifest(sources)
+        # Недоступный для записи кэш не мешает работе: манифест остаётся в памяти
+        write_json_atomic(path, data)
+    _MANIFEST = data
+    return data
+
+
+def modules_for(
+    include: Optional[Sequence[Selector]] = None, exclude: Optional[Sequence[Selector]] = None
+) -> Set[str]:
+    """
+    Модули, которые нужно импортировать для запуска выбранных проверок.
+
+    :param include: Селекторы нужных проверок (None — все).
+    :param exclude: Селекторы проверок, которые не нужны.
+    """
+    entries: Dict[str, dict] = load_manifest()["checks"]
+    out: Set[str] = set()
+    for cid, e in entries.items():
+        cat, tags = e.get("category"), e.get("tags") or ()
+        if include is not None and not matches_any(include, cid, cat, tags):
+            continue
+        if exclude and matches_any(exclude, cid, cat, tags):
+            continue
+        out.add(e["module"])
+    return out
+
+
+def load_checks(
+    include: Optional[Sequence[Selector]] = None, exclude: Optional[Sequence[Selector]] = None
+) -> None:
+    """Импортировать только модули, нужные для выбранных проверок."""
+    for name in sorted(modules_for(include, exclude)):
+        _import_module(name)
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import Dict, List, Type
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Type
 
-from ..checks.base import Check
+from .selectors import Selector, compile_selectors
+
+if TYPE_CHECKING:  # избегаем циклического импорта: checks.base импортирует registry
+    from ..checks.base import Check
 
 
 # Реестр всех зарегистрированных проверок
 _REGISTRY: Dict[str, Type[Check]] = {}
+# Индексы по категории и тегу: значение -> множество id
+_BY_CATEGORY: Dict[str, Set[str]] = defaultdict(set)
+_BY_TAG: Dict[str, Set[str]] = defaultdict(set)
+# Планы выполнения по (включаемые, исключаемые) селекторам; сбрасываются
+# при регистрации новых проверок
+_PLANS: Dict[Tuple[Tuple[Selector, ...], Tuple[Selector, ...]], Tuple[Type[Check], ...]] = {}
 
 
 def register(check_cls: Type[Check]) -> None:
@@ -20,20 +30,54 @@ def register(check_cls: Type[Check]) -> None:
     if cid in _REGISTRY:
         raise ValueError(f"Дубликат id проверки: {cid}")
     _REGISTRY[cid] = check_cls
+    category = getattr(check_cls, "category", None)
+    if category:
+        _BY_CATEGORY[category].add(cid)
+    for tag in getattr(check_cls, "tags", None) or []:
+        _BY_TAG[tag].add(cid)
+    _PLANS.clear()
+
+
+def _resolve(selectors: Tuple[Selector, ...]) -> Set[str]:
+    """id зарегистрированных проверок, подходящих хотя бы под один селектор."""
+    out: Set[str] = set()
+    for sel in selectors:
+        if sel.kind == "id":
+            if sel.value in _REGISTRY:
+                out.add(sel.value)
+        elif sel.kind == "category":
+            out |= _BY_CATEGORY.get(sel.value, set())
+        elif sel.kind == "tag":
+            out |= _BY_TAG.get(sel.value, set())
+        else:
+            out.update(cid for cid in _REGISTRY if sel.matches(cid, None))
+    return out
 
 
 def get_checks(ids: List[str] | None = None, skip: List[str] | None = None) -> List[Type[Check]]:
     """
     Получить список зарегистрированных проверок.
 
-    :param ids: Список id проверок, которые нужно выбрать (если None — все).
-    :param skip: Список id проверок, которые нужно исключить.
+    Элементы ids и skip — селекторы: точный id ("SSH-8001"), шаблон
+    ("SSH-*"), категория ("category:FILE") или тег ("tag:firewalld").
+    План для одного и того же набора селекторов вычисляется один раз.
+
+    :param ids: Селекторы проверок, которые нужно выбрать (если None — все).
+    :param skip: Селекторы проверок, которые нужно исключить.
     :return: Отсортированный список классов проверок.
+    :raises ValueError: Селектор не удалось разобрать.
     """
-    checks = list(_REGISTRY.values())
-    if ids:
-        checks = [c for c in checks if c.id in ids]
-    if skip:
-        checks = [c for c in checks if c.id not in skip]
-    checks.sort(key=lambda c: c.id)
-    return checks
+    include = compile_selectors(ids)
+    exclude = compile_selectors(skip)
+    key = (include, exclude)
+    plan = _PLANS.get(key)
+    if plan is None:
+        from .manifest import load_checks
+
+        # Импортируются только модули выбранных проверок (см. core.manifest)
+        load_checks(include or None, exclude)
+        chosen = _resolve(include) if include else set(_REGISTRY)
+        chosen -= _resolve(exclude)
+        plan = tuple(_REGISTRY[cid] for cid in sorted(chosen))
+        _PLANS[key] = plan
+    return list(plan)
@@ -1,50 +1,322 @@
 from __future__ import annotations
 
-from typing import List
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set, Type
 
-from .types import CheckResult, Report
+from .types import CheckMetrics, CheckResult, Report
 from ..engine.context import Context
+from ..engine.isolate import Isolation, run_isolated
+from ..engine.metrics import CheckMeter, summarize
+from ..engine.scope import CheckScope, activate, deactivate
 from .registry import get_checks
+from ..checks.base import Check
+from ..facts.base import get_fact
 
 
-def run_checks(ctx: Context, ids: list[str] | None, skip: list[str] | None) -> List[CheckResult]:
+def _failed_result(CheckCls: Type[Check], status: str, notes: str) -> CheckResult:
+    return CheckResult(
+        id=getattr(CheckCls, "id", "unknown"),
+        title=getattr(CheckCls, "title", "Неизвестная проверка"),
+        category=getattr(CheckCls, "category", "UNKNOWN"),
+        status=status,
+        notes=notes,
+    )
+
+
+def run_check(CheckCls: Type[Check], ctx: Context) -> CheckResult:
+    """
+    Выполняет одну проверку с перехватом ошибок.
+
+    :param CheckCls: Класс проверки.
+    :param ctx: Контекст выполнения.
+    :return: Результат проверки (status="error", если проверка упала).
+    """
+    try:
+        check = CheckCls()
+        return check.run(ctx)
+    except Exception as e:
+        # Перехватываем ошибки, чтобы падение одной проверки не остановило все
+        return _failed_result(CheckCls, "error", f"Ошибка выполнения проверки: {e}")
+
+
+FACT_PREFIX = "fact:"
+
+
+def _requires(CheckCls: Type[Check]) -> List[str]:
+    return list(getattr(CheckCls, "requires", None) or [])
+
+
+def _missing_fact(CheckCls: Type[Check], ctx: Context) -> Optional[str]:
+    """
+    Проверяет предусловия-факты проверки.
+    :return: Заметка для пропуска, если какой-то факт ложен, иначе None.
+    """
+    for req in _requires(CheckCls):
+        if not req.startswith(FACT_PREFIX):
+            continue
+        name = req[len(FACT_PREFIX):]
+        try:
+            if ctx.fact(name):
+                continue
+        except Exception as e:
+            return f"Не удалось определить предусловие {name}: {e}"
+        return get_fact(name).missing or f"Не выполнено предусловие: {name}"
+    return None
+
+
+def _execute(CheckCls: Type[Check], ctx: Context, isolation: Optional[Isolation]) -> CheckResult:
+    """
+    Выполнить проверку в текущем процессе или изолированно, согласно политике.
+    Если ложен какой-либо факт из requires, проверка пропускается без запуска.
+    """
+    missing = _missing_fact(CheckCls, ctx)
+    if missing is not None:
+        return _failed_result(CheckCls, "skipped", missing)
+    if isolation is not None and isolation.matches(CheckCls):
+        return run_isolated(CheckCls, ctx, mem_limit_mb=isolation.mem_limit_mb)
+    return run_check(CheckCls, ctx)
+
+
+def _run_measured(
+    CheckCls: Type[Check], ctx: Context, isolation: Optional[Isolation], scope: CheckScope
+) -> CheckResult:
+    """Выполнить проверку в области scope и приложить к результату метрики стоимости."""
+    token = activate(scope)
+    meter = CheckMeter()
+    try:
+        res = _execute(CheckCls, ctx, isolation)
+    finally:
+        deactivate(token)
+    metrics = meter.finish(scope)
+    if res.metrics is not None:
+        # Изолированная проверка приносит метрики своего процесса
+        res.metrics.wall_s = metrics.wall_s
+    else:
+        res.metrics = metrics
+    return res
+
+
+def _worker(
+    idx: int,
+    CheckCls: Type[Check],
+    ctx: Context,
+    isolation: Optional[Isolation],
+    scope: CheckScope,
+    done: "queue.SimpleQueue[tuple[int, CheckResult]]",
+) -> None:
+    done.put((idx, _run_measured(CheckCls, ctx, isolation, scope)))
+
+
+def _deadline(
+    now: float, timeout: Optional[float], audit_deadline: Optional[float]
+) -> Optional[float]:
+    candidates = [d for d in (now + timeout if timeout else None, audit_deadline) if d is not None]
+    return min(candidates) if candidates else None
+
+
+def _build_dag(
+    checks: List[Type[Check]],
+) -> tuple[Dict[int, Set[int]], Dict[int, List[int]], Set[int]]:
+    """
+    Граф зависимостей между выбранными проверками.
+
+    Предусловия-id, не попавшие в текущий набор проверок, игнорируются
+    (проверка сама обрабатывает отсутствие данных).
+
+    :return: (предусловия по индексу, зависимые по индексу, индексы в циклах).
+    """
+    index = {getattr(c, "id", None): i for i, c in enumerate(checks)}
+    deps: Dict[int, Set[int]] = {}
+    dependents: Dict[int, List[int]] = defaultdict(list)
+    for i, CheckCls in enumerate(checks):
+        deps[i] = {
+            index[r] for r in _requires(CheckCls)
+            if not r.startswith(FACT_PREFIX) and r in index and index[r] != i
+        }
+        for d in deps[i]:
+            dependents[d].append(i)
+
+    # Алгоритм Кана: всё, что не удалось упорядочить, лежит на цикле
+    indegree = {i: len(d) for i, d in deps.items()}
+    stack = [i for i, n in indegree.items() if n == 0]
+    ordered: Set[int] = set()
+    while stack:
+        i = stack.pop()
+        ordered.add(i)
+        for j in dependents[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                stack.append(j)
+    cyclic = set(deps) - ordered
+    return deps, dependents, cyclic
+
+
+def _run_scheduled(
+    ctx: Context,
+    checks: List[Type[Check]],
+    workers: int,
+    timeout: Optional[float],
+    deadline: Optional[float],
+    isolation: Optional[Isolation] = None,
+    inline: bool = False,
+) -> List[CheckResult]:
+    """
+    Выполнение проверок по графу зависимостей.
+
+    Проверка становится готовой, когда завершились все её предусловия;
+    независимые ветви графа выполняются параллельно. Если предусловие
+    завершилось не со статусом "ok", зависимые проверки (и их потомки)
+    сразу получают status="skipped" и не запускаются.
+
+    Каждая проверка запускается в отдельном daemon-потоке, одновременно
+    работает не больше workers проверок. Проверка, не уложившаяся в свой
+    лимит или в общий дедлайн, получает status="timeout", её область
+    отменяется (внешние команды прерываются), а слот сразу освобождается
+    для следующей проверки — зависший поток не задерживает остальной аудит.
+    При inline=True (без лимитов времени) проверки выполняются по очереди
+    в текущем потоке.
+    """
+    started = time.monotonic()
+    audit_deadline = started + deadline if deadline else None
+    results: Dict[int, CheckResult] = {}
+    running: Dict[int, tuple[Type[Check], CheckScope, float]] = {}
+    done: "queue.SimpleQueue[tuple[int, CheckResult]]" = queue.SimpleQueue()
+
+    deps, dependents, cyclic = _build_dag(checks)
+    for idx in sorted(cyclic):
+        results[idx] = _failed_result(
+            checks[idx], "error", "Циклическая зависимость между проверками"
+        )
+    waiting = {i: set(d) for i, d in deps.items() if i not in cyclic}
+    ready = deque(i for i in sorted(waiting) if not waiting[i])
+    for i in ready:
+        del waiting[i]
+
+    def settle(idx: int, res: CheckResult) -> None:
+        results[idx] = res
+        for j in dependents[idx]:
+            if j not in waiting:
+                continue
+            if res.status != "ok":
+                del waiting[j]
+                note = f"Не выполнено предусловие: {checks[idx].id} ({res.status})"
+                settle(j, _failed_result(checks[j], "skipped", note))
+                continue
+            waiting[j].discard(idx)
+            if not waiting[j]:
+                del waiting[j]
+                ready.append(j)
+
+    while ready or running:
+        now = time.monotonic()
+        if audit_deadline is not None and now >= audit_deadline:
+            for idx in list(ready) + sorted(waiting):
+                results[idx] = _failed_result(
+                    checks[idx], "timeout", "Не запущена: исчерпан общий лимит времени аудита"
+                )
+            ready.clear()
+            waiting.clear()
+        if inline:
+            if ready:
+                idx = ready.popleft()
+                scope = CheckScope(getattr(checks[idx], "id", "unknown"))
+                settle(idx, _run_measured(checks[idx], ctx, isolation, scope))
+            continue
+        while ready and len(running) < workers:
+            idx = ready.popleft()
+            CheckCls = checks[idx]
+            check_deadline = _deadline(now, timeout, audit_deadline)
+            scope = CheckScope(getattr(CheckCls, "id", "unknown"), check_deadline)
+            running[idx] = (CheckCls, scope, now)
+            threading.Thread(
+                target=_worker,
+                args=(idx, CheckCls, ctx, isolation, scope, done),
+                name=f"pylock-check-{scope.check_id}",
+                daemon=True,
+            ).start()
+        if not running:
+            continue
+
+        deadlines = [s.deadline for _, s, _ in running.values() if s.deadline is not None]
+        wait = max(0.0, min(deadlines) - now) if deadlines else None
+        try:
+            idx, res = done.get(timeout=wait)
+        except queue.Empty:
+            pass
+        else:
+            # Результат проверки, уже помеченной как timeout, отбрасываем;
+            # проверка, успевшая вернуться только после срока (её команды были
+            # прерваны по таймауту), тоже считается просроченной ниже.
+            if idx in running and not running[idx][1].expired():
+                del running[idx]
+                settle(idx, res)
+
+        now = time.monotonic()
+        for idx, (CheckCls, scope, began) in list(running.items()):
+            if scope.expired(now):
+                scope.cancel()
+                del running[idx]
+                if audit_deadline is not None and scope.deadline == audit_deadline:
+                    notes = "Прервана: исчерпан общий лимит времени аудита"
+                else:
+                    notes = f"Превышен лимит времени проверки ({timeout:g} с)"
+                res = _failed_result(CheckCls, "timeout", notes)
+                res.metrics = CheckMetrics(
+                    wall_s=round(now - began, 6), subprocesses=len(scope.commands)
+                )
+                settle(idx, res)
+
+    return [results[i] for i in range(len(checks))]
+
+
+def run_checks(
+    ctx: Context,
+    ids: list[str] | None,
+    skip: list[str] | None,
+    *,
+    workers: int = 1,
+    timeout: float | None = None,
+    deadline: float | None = None,
+    isolation: Isolation | None = None,
+) -> List[CheckResult]:
     """
     Запускает все проверки и возвращает список результатов.
 
+    Проверки выполняются по графу предусловий (Check.requires). При
+    workers > 1 независимые проверки выполняются параллельно в потоках:
+    большая часть времени уходит на ожидание внешних команд (ps, ss,
+    systemctl, ...), поэтому потоки дают выигрыш несмотря на GIL.
+    Порядок результатов всегда совпадает с порядком id.
+
     :param ctx: Контекст выполнения (например, настройки запуска).
     :param ids: Список id проверок, которые нужно выполнить (если None — все).
     :param skip: Список id проверок, которые нужно пропустить.
-    :return: Список объектов CheckResult.
+    :param workers: Количество потоков (1 — последовательное выполнение).
+    :param timeout: Лимит времени одной проверки в секундах (None — без лимита).
+    :param deadline: Общий лимит времени аудита в секундах (None — без лимита).
+    :param isolation: Какие проверки выполнять в отдельных процессах (None — все в текущем).
+    :return: Список объектов CheckResult; просроченные проверки имеют status="timeout".
     """
-    results: List[CheckResult] = []
-    for CheckCls in get_checks(ids=ids, skip=skip):
-        try:
-            check = CheckCls()
-            res = check.run(ctx)
-            results.append(res)
-        except Exception as e:
-            # Перехватываем ошибки, чтобы падение одной проверки не остановило все
-            results.append(
-                CheckResult(
-                    id=getattr(CheckCls, "id", "unknown"),
-                    title=getattr(CheckCls, "title", "Неизвестная проверка"),
-                    category=getattr(CheckCls, "category", "UNKNOWN"),
-                    status="error",
-                    notes=f"Ошибка выполнения проверки: {e}",
-                )
-            )
-    return results
+    checks = get_checks(ids=ids, skip=skip)
+    inline = workers <= 1 and not timeout and not deadline
+    return _run_scheduled(ctx, checks, max(1, workers), timeout, deadline, isolation, inline)
 
 
-def build_report(subject: str, results: List[CheckResult]) -> Report:
+def build_report(subject: str, results: List[CheckResult], wall_s: float | None = None) -> Report:
     """
     Формирует итоговый отчёт из результатов проверок.
 
     :param subject: Заголовок/тема отчёта (например, имя хоста).
     :param results: Список результатов проверок.
-    :return: Объект Report.
+    :param wall_s: Полное время аудита в секундах (для итоговых метрик).
+    :return: Объект Report; meta["metrics"] содержит суммарную стоимость аудита.
     """
-    meta = {"host": ctx_hostname_safe()}
+    if wall_s is None:
+        wall_s = sum(r.metrics.wall_s for r in results if r.metrics is not None)
+    meta = {"host": ctx_hostname_safe(), "metrics": summarize(results, wall_s)}
     return Report(subject=subject, checks=results, meta=meta)
 
 
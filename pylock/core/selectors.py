@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence, Tuple
+
+# Виды селекторов: точный id, шаблон id, категория, тег
+KINDS = ("id", "glob", "category", "tag")
+_GLOB_CHARS = frozenset("*?[")
+
+
+@dataclass(slots=True, frozen=True)
+class Selector:
+    """
+    Скомпилированный селектор проверок.
+
+    Синтаксис: "SSH-8001" (точный id), "SSH-*" (шаблон id в стиле fnmatch),
+    "category:FILE", "tag:firewalld", явная форма "id:SSH-8001".
+
+    :param kind: Вид селектора (см. KINDS).
+    :param value: Значение селектора без префикса.
+    """
+    kind: str
+    value: str
+    _pattern: Optional[re.Pattern] = field(default=None, compare=False, repr=False)
+
+    def matches(self, cid: str, category: Optional[str], tags: Sequence[str] = ()) -> bool:
+        if self.kind == "id":
+            return cid == self.value
+        if self.kind == "glob":
+            return self._pattern.match(cid) is not None
+        if self.kind == "category":
+            return category == self.value
+        return self.value in tags
+
+    def __str__(self) -> str:
+        return self.value if self.kind in ("id", "glob") else f"{self.kind}:{self.value}"
+
+
+def compile_selector(text: str) -> Selector:
+    """
+    Разобрать текстовый селектор.
+
+    Префикс распознаётся только для id:/category:/tag: — двоеточие
+    встречается и в самих id проверок (например, "FW:running").
+
+    :raises ValueError: Пустой селектор.
+    """
+    text = text.strip()
+    kind, sep, value = text.partition(":")
+    kind = kind.strip().lower()
+    if not sep or kind not in ("id", "category", "tag"):
+        kind, value = "id", text
+    value = value.strip()
+    if not value:
+        raise ValueError(f"Пустой селектор проверок: {text!r}")
+    if kind == "id" and _GLOB_CHARS.intersection(value):
+        return Selector("glob", value, re.compile(fnmatch.translate(value)))
+    return Selector(kind, value)
+
+
+def compile_selectors(items: Iterable[str] | None) -> Tuple[Selector, ...]:
+    """
+    Скомпилировать список селекторов; пустые элементы игнорируются.
+    Результат упорядочен и без повторов, поэтому годится как ключ кэша.
+    """
+    out = {compile_selector(s) for s in (items or []) if s and s.strip()}
+    return tuple(sorted(out, key=lambda s: (s.kind, s.value)))
+
+
+def matches_any(
+    selectors: Iterable[Selector], cid: str, category: Optional[str], tags: Sequence[str] = ()
+) -> bool:
+    return any(s.matches(cid, category, tags) for s in selectors)
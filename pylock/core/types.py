@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class Severity(str, Enum):
@@ -21,19 +21,29 @@ class Finding:
     data: Dict[str, str] = field(default_factory=dict)
 
 
+@dataclass(slots=True)
+class CheckMetrics:
+    wall_s: float = 0.0          # время выполнения (сек)
+    cpu_s: float = 0.0           # процессорное время потока/процесса проверки (сек)
+    rss_peak_delta_kb: int = 0   # прирост пикового RSS процесса за время проверки (КБ)
+    subprocesses: int = 0        # количество запущенных внешних команд
+    bytes_read: int = 0          # прочитано байт (файлы и вывод команд)
+
+
 @dataclass(slots=True)
 class CheckResult:
     id: str
     title: str
     category: str
-    status: str  # "ok" | "fail" | "skipped"
+    status: str  # "ok" | "fail" | "skipped" | "error" | "timeout"
     findings: List[Finding] = field(default_factory=list)
     tags: List[str] = field(default_factory=list)
     notes: Optional[str] = None
+    metrics: Optional[CheckMetrics] = None
 
 
 @dataclass(slots=True)
 class Report:
     subject: str
     checks: List[CheckResult]
-    meta: Dict[str, str] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
@@ -1,28 +1,21 @@
 from __future__ import annotations
 
-import importlib
-import pkgutil
+import os
 import socket
+import time
 from typing import List, Optional
 
 from ..core.runner import run_checks, build_report
 from ..engine.context import Context
-from ..config.loader import load_profile
+from ..engine.files import FileCache
+from ..engine.isolate import Isolation
+from ..config.loader import Profile, load_profile
+from ..facts.base import FactStore
+from ..utils.cmd import set_max_procs
 
-
-def _autodiscover_checks() -> None:
-    """
-    Автоматически загружает все модули с проверками из пакета pylock.checks.
-    Если какой-то модуль не удаётся импортировать, он пропускается.
-    """
-    pkg_name = "pylock.checks"
-    pkg = importlib.import_module(pkg_name)
-    for m in pkgutil.walk_packages(pkg.__path__, pkg_name + "."):
-        try:
-            importlib.import_module(m.name)
-        except Exception as e:
-            # Не даём упасть всему процессу при ошибке загрузки одного модуля
-            print(f"[WARN] Не удалось загрузить модуль проверки {m.name}: {e}")
+# Лимит времени одной проверки по умолчанию (сек): обход файловой системы
+# на больших хостах занимает минуты, зависшая утилита — бесконечность.
+DEFAULT_CHECK_TIMEOUT = 300.0
 
 
 def _get_primary_ip() -> str:
@@ -65,7 +58,12 @@ def _get_zone_subject() -> str:
 class Auditor:
     """
     Основной класс для запуска аудита.
-    Автоматически подгружает проверки и формирует отчёт.
+    Подгружает нужные проверки по манифесту и формирует отчёт.
+
+    Экземпляр можно переиспользовать между аудитами (agentd): профиль
+    перечитывается только при изменении файла, а факты с отпечатком
+    (ключи хоста, список пакетов) и содержимое файлов переживают цикл,
+    пока источник не изменился.
     """
 
     def __init__(self, *, verbose: bool = False, debug: bool = False) -> None:
@@ -75,7 +73,24 @@ class Auditor:
         """
         self.verbose = verbose
         self.debug = debug
-        _autodiscover_checks()
+        self.facts = FactStore()
+        self.files = FileCache()
+        self._profile: Optional[Profile] = None
+        self._profile_stamp: Optional[tuple] = None
+
+    def _load_profile(self, profile_path: Optional[str]) -> Profile:
+        """Профиль из кэша экземпляра; перечитывается при изменении пути, mtime или размера."""
+        stamp: tuple = (profile_path,)
+        if profile_path:
+            try:
+                st = os.stat(profile_path)
+                stamp = (profile_path, st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        if self._profile is None or stamp != self._profile_stamp:
+            self._profile = load_profile(profile_path)
+            self._profile_stamp = stamp
+        return self._profile
 
     def run(
         self,
@@ -84,6 +99,12 @@ class Auditor:
         profile_path: Optional[str] = None,
         tests: Optional[List[str]] = None,
         skip: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        isolate: Optional[List[str]] = None,
+        isolate_mem: Optional[int] = None,
+        max_procs: Optional[int] = None,
     ):
         """
         Запуск аудита.
@@ -92,14 +113,32 @@ class Auditor:
         :param profile_path: Путь к профилю (ini/toml), если задан.
         :param tests: Явный список id проверок, которые нужно выполнить.
         :param skip: Список id проверок, которые нужно пропустить.
+        :param workers: Количество параллельных потоков (по умолчанию — из профиля, иначе 1).
+        :param timeout: Лимит времени одной проверки, сек (по умолчанию — из профиля,
+                        иначе DEFAULT_CHECK_TIMEOUT).
+        :param deadline: Общий лимит времени аудита, сек (по умолчанию — из профиля).
+        :param isolate: id проверок или категории, выполняемые в отдельных процессах.
+        :param isolate_mem: Лимит памяти изолированного процесса, МБ.
+        :param max_procs: Максимум одновременно запущенных внешних команд.
         :return: Отчёт (Report).
         """
+        started = time.monotonic()
         if not subject:
             subject = _get_zone_subject()
 
-        profile = load_profile(profile_path)
+        profile = self._load_profile(profile_path)
         ids = tests if tests else (profile.include_tests or None)
         sk = skip if skip else (profile.skip_tests or None)
+        nworkers = workers or profile.workers or 1
+        ntimeout = timeout or profile.timeout or DEFAULT_CHECK_TIMEOUT
+        ndeadline = deadline or profile.deadline
+        isolation = Isolation.of(
+            isolate if isolate else profile.isolate,
+            isolate_mem or profile.isolate_mem,
+        )
+
+        if max_procs or profile.max_procs:
+            set_max_procs(max_procs or profile.max_procs)
 
         ctx = Context(
             subject=subject,
@@ -107,6 +146,19 @@ class Auditor:
             env={},
             verbose=self.verbose,
             debug=self.debug,
+            facts=self.facts,
+            files=self.files,
+            profile=profile,
+        )
+        self.facts.renew()
+        self.files.renew()
+        results = run_checks(
+            ctx,
+            ids=ids,
+            skip=sk,
+            workers=nworkers,
+            timeout=ntimeout,
+            deadline=ndeadline,
+            isolation=isolation,
         )
-        results = run_checks(ctx, ids=ids, skip=sk)
-        return build_report(subject, results)
+        return build_report(subject, results, wall_s=time.monotonic() - started)
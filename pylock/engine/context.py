@@ -1,7 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Mapping, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from ..facts.base import FactStore
+from .files import FileCache
+from .scope import current_scope
+
+if TYPE_CHECKING:
+    from ..config.loader import Profile
 
 
 @dataclass(slots=True)
@@ -11,3 +18,20 @@ class Context:
     env: Mapping[str, str]
     verbose: bool = False
     debug: bool = False
+    facts: FactStore = field(default_factory=FactStore)
+    # Общий кэш файлов: ctx.files.read_text("/etc/passwd") читает файл один раз за аудит
+    files: FileCache = field(default_factory=FileCache)
+    # Загруженный профиль (None — проверка запущена без аудитора, например в тестах)
+    profile: Optional["Profile"] = None
+
+    def fact(self, name: str) -> Any:
+        """Значение именованного факта (вычисляется один раз за аудит)."""
+        return self.facts.get(name, self)
+
+    def cancelled(self) -> bool:
+        """
+        True, если текущая проверка отменена (истёк её лимит или общий дедлайн).
+        Долгие проверки должны периодически опрашивать этот флаг и завершаться.
+        """
+        scope = current_scope()
+        return scope is not None and (scope.cancelled or scope.expired())
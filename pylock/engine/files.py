@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+# Псевдо-ФС: размер и mtime не отражают содержимое, между аудитами не кэшируем
+_VOLATILE_PREFIXES = ("/proc/", "/sys/", "/dev/", "/run/")
+
+
+class _Entry:
+    __slots__ = ("key", "data", "error")
+
+    def __init__(self, key: Optional[Tuple[int, int, int, int]], data: Optional[bytes],
+                 error: Optional[OSError]) -> None:
+        self.key = key  # (st_dev, st_ino, st_mtime_ns, st_size) на момент чтения
+        self.data = data
+        self.error = error
+
+
+def _volatile(path: str, key: Optional[Tuple[int, int, int, int]]) -> bool:
+    return key is None or key[3] == 0 or path.startswith(_VOLATILE_PREFIXES)
+
+
+class FileCache:
+    """
+    Общий кэш содержимого файлов для проверок одного аудита.
+
+    Первое чтение пути «закрепляет» его содержимое до конца аудита: все
+    проверки получают одни и те же байты без повторных системных вызовов,
+    даже если файл меняется во время аудита. Ошибки открытия (нет файла,
+    нет прав) тоже запоминаются и пробрасываются повторно.
+
+    Кэш может переживать аудиты (agentd): renew() снимает закрепление, и при
+    следующем обращении содержимое переиспользуется, только если
+    (устройство, inode, mtime, размер) не изменились. Файлы псевдо-ФС
+    (/proc, /sys) и пустые файлы всегда перечитываются в новом аудите.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._pinned: set[str] = set()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _load(path: str) -> _Entry:
+        try:
+            with open(path, "rb") as fh:
+                st = os.fstat(fh.fileno())
+                data = fh.read()
+        except OSError as e:
+            return _Entry(None, None, e)
+        return _Entry((st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size), data, None)
+
+    def _valid(self, path: str, entry: _Entry) -> bool:
+        if _volatile(path, entry.key):
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return entry.key == (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def read_bytes(self, path: Union[str, os.PathLike]) -> bytes:
+        """
+        Содержимое файла (закреплённое на время аудита).
+
+        :raises OSError: Те же исключения, что и open() (FileNotFoundError, PermissionError, ...).
+        """
+        path = os.fspath(path)
+        entry = self._entries.get(path)
+        if entry is None or path not in self._pinned:
+            with self._key_lock(path):
+                entry = self._entries.get(path)
+                if path not in self._pinned:
+                    if entry is None or not self._valid(path, entry):
+                        entry = self._load(path)
+                        self._entries[path] = entry
+                    self._pinned.add(path)
+        if entry.error is not None:
+            raise entry.error
+        return entry.data  # type: ignore[return-value]
+
+    def read_text(self, path: Union[str, os.PathLike], encoding: str = "utf-8",
+                  errors: str = "strict") -> str:
+        """Текст файла; параметры как у Path.read_text()."""
+        return self.read_bytes(path).decode(encoding, errors)
+
+    def lines(self, path: Union[str, os.PathLike], encoding: str = "utf-8",
+              errors: str = "strict") -> List[str]:
+        """Строки файла без символов перевода строки."""
+        return self.read_text(path, encoding, errors).splitlines()
+
+    def renew(self) -> None:
+        """Начать новый аудит: снять закрепление (содержимое перепроверяется по stat)."""
+        with self._lock:
+            self._pinned.clear()
+            for path in [p for p, e in self._entries.items() if _volatile(p, e.key)]:
+                del self._entries[path]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
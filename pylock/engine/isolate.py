@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Optional, Tuple, Type
+
+from ..core.selectors import Selector, compile_selectors, matches_any
+from ..core.types import CheckResult
+from .context import Context
+from .scope import CheckScope, activate, current_scope, deactivate
+
+if TYPE_CHECKING:
+    from ..checks.base import Check
+
+
+# Лимит памяти изолированной проверки по умолчанию (МБ адресного пространства)
+DEFAULT_MEM_LIMIT_MB = 1024
+
+
+@dataclass(slots=True, frozen=True)
+class Isolation:
+    """
+    Политика изоляции: какие проверки выполнять в отдельных процессах.
+
+    :param targets: id проверок, категории или селекторы
+                    (например, "FILE-3002", "FILE", "FILE-*", "tag:firewalld").
+    :param mem_limit_mb: Лимит адресного пространства процесса (None — без лимита).
+    """
+    targets: FrozenSet[str] = field(default_factory=frozenset)
+    mem_limit_mb: Optional[int] = DEFAULT_MEM_LIMIT_MB
+    selectors: Tuple[Selector, ...] = ()
+
+    @classmethod
+    def of(
+        cls, targets: Iterable[str] | None, mem_limit_mb: Optional[int] = None
+    ) -> Optional["Isolation"]:
+        items = frozenset(t.strip() for t in (targets or []) if t and t.strip())
+        if not items:
+            return None
+        return cls(
+            targets=items,
+            mem_limit_mb=mem_limit_mb or DEFAULT_MEM_LIMIT_MB,
+            selectors=compile_selectors(items),
+        )
+
+    def matches(self, CheckCls: Type["Check"]) -> bool:
+        cid = getattr(CheckCls, "id", None)
+        category = getattr(CheckCls, "category", None)
+        # Голое имя категории ("FILE") поддерживается наравне с "category:FILE"
+        return (
+            cid in self.targets
+            or category in self.targets
+            or matches_any(self.selectors, cid, category, getattr(CheckCls, "tags", None) or ())
+        )
+
+
+def _mp_context():
+    """
+    forkserver: дочерние процессы порождаются из чистого процесса-сервера,
+    а не из многопоточного долгоживущего агента (нет унаследованных
+    блокировок и раздутой памяти демона). На платформах без forkserver — spawn.
+    """
+    import multiprocessing  # нужен только при изоляции — не замедляем старт
+
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _context_spec(ctx: Context) -> Dict[str, Any]:
+    # В дочерний процесс передаём только параметры запуска: кэши и
+    # блокировки контекста не сериализуются и строятся заново.
+    return {
+        "subject": ctx.subject,
+        "profile_path": ctx.profile_path,
+        "env": dict(ctx.env),
+        "verbose": ctx.verbose,
+        "debug": ctx.debug,
+        "profile": ctx.profile,
+    }
+
+
+def _set_mem_limit(mem_limit_mb: Optional[int]) -> None:
+    if not mem_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - не POSIX
+        return
+    limit = mem_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _child_main(CheckCls, spec, remaining, mem_limit_mb, conn) -> None:
+    """Точка входа изолированного процесса: выполнить проверку и вернуть результат."""
+    # Собственная группа процессов: жёсткое завершение убьёт и внешние команды
+    try:
+        os.setpgrp()
+    except OSError:
+        pass
+    _set_mem_limit(mem_limit_mb)
+    from ..core.runner import run_check
+    from .metrics import CheckMeter
+
+    ctx = Context(**spec)
+    scope = CheckScope(getattr(CheckCls, "id", "unknown"),
+                       time.monotonic() + remaining if remaining is not None else None)
+    token = activate(scope)
+    meter = CheckMeter()
+    try:
+        res = run_check(CheckCls, ctx)
+    finally:
+        deactivate(token)
+    res.metrics = meter.finish(scope)
+    try:
+        conn.send(res)
+    finally:
+        conn.close()
+
+
+def _kill(proc) -> None:
+    """Жёстко завершить процесс проверки вместе с его группой."""
+    if proc.pid is None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        try:
+            proc.kill()
+        except Exception:
+            pass
+
+
+def run_isolated(
+    CheckCls: Type["Check"], ctx: Context, *, mem_limit_mb: Optional[int] = None
+) -> CheckResult:
+    """
+    Выполнить проверку в отдельном процессе.
+
+    Результат возвращается сериализованным CheckResult через канал. Падение
+    процесса (исключение вне run_check, нехватка памяти, сигнал) превращается
+    в результат со status="error" и не затрагивает основной процесс. При
+    отмене области проверки процесс и его группа завершаются SIGKILL.
+
+    :param CheckCls: Класс проверки (должен импортироваться по имени модуля).
+    :param ctx: Контекст выполнения.
+    :param mem_limit_mb: Лимит адресного пространства процесса в МБ.
+    :return: Результат проверки.
+    """
+    from ..core.runner import _failed_result
+
+    scope = current_scope()
+    remaining = scope.remaining() if scope is not None else None
+    mp = _mp_context()
+    recv_conn, send_conn = mp.Pipe(duplex=False)
+    proc = mp.Process(
+        target=_child_main,
+        args=(CheckCls, _context_spec(ctx), remaining, mem_limit_mb, send_conn),
+        name=f"pylock-isolated-{getattr(CheckCls, 'id', 'unknown')}",
+        daemon=True,
+    )
+    proc.start()
+    send_conn.close()
+
+    def kill() -> None:
+        _kill(proc)
+
+    if scope is not None:
+        scope.on_cancel(kill)
+    try:
+        # Ждём результат; EOF означает, что процесс умер, не ответив
+        if recv_conn.poll(remaining):
+            try:
+                return recv_conn.recv()
+            except (EOFError, OSError):
+                pass
+        else:
+            kill()
+            return _failed_result(
+                CheckCls, "timeout", "Изолированная проверка не уложилась в лимит времени"
+            )
+        proc.join(5)
+        return _failed_result(
+            CheckCls,
+            "error",
+            f"Изолированный процесс проверки завершился аварийно (код {proc.exitcode})",
+        )
+    finally:
+        if scope is not None:
+            scope.discard(kill)
+        recv_conn.close()
+        if proc.is_alive():
+            proc.join(1)
+            if proc.is_alive():
+                kill()
+                proc.join()
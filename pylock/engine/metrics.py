@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - не POSIX
+    resource = None
+
+from ..core.types import CheckMetrics
+from .scope import CheckScope
+
+
+def _maxrss_kb() -> int:
+    """Пиковый RSS процесса в КБ (ru_maxrss на Linux уже в КБ)."""
+    if resource is None:
+        return 0
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _thread_rchar() -> int:
+    """Сколько байт прочитал текущий поток (rchar из /proc/thread-self/io)."""
+    try:
+        with open("/proc/thread-self/io", "rb") as fh:
+            for line in fh:
+                if line.startswith(b"rchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+class CheckMeter:
+    """
+    Замер стоимости одной проверки в потоке, который её выполняет.
+
+    CPU и прочитанные байты считаются по текущему потоку, поэтому при
+    параллельном выполнении проверки не смешиваются. Пиковый RSS — общий
+    для процесса, его прирост при параллельном запуске приблизителен.
+    """
+
+    __slots__ = ("_wall", "_cpu", "_rss", "_rchar")
+
+    def __init__(self) -> None:
+        self._wall = time.monotonic()
+        self._cpu = time.thread_time()
+        self._rss = _maxrss_kb()
+        self._rchar = _thread_rchar()
+
+    def finish(self, scope: Optional[CheckScope] = None) -> CheckMetrics:
+        return CheckMetrics(
+            wall_s=round(time.monotonic() - self._wall, 6),
+            cpu_s=round(time.thread_time() - self._cpu, 6),
+            rss_peak_delta_kb=max(0, _maxrss_kb() - self._rss),
+            subprocesses=len(scope.commands) if scope is not None else 0,
+            bytes_read=max(0, _thread_rchar() - self._rchar),
+        )
+
+
+def summarize(results, wall_s: float) -> dict:
+    """Итоговые метрики аудита для Report.meta."""
+    total = {
+        "wall_s": round(wall_s, 6),
+        "checks_wall_s": 0.0,
+        "cpu_s": 0.0,
+        "subprocesses": 0,
+        "bytes_read": 0,
+        "rss_peak_kb": _maxrss_kb(),
+    }
+    for r in results:
+        m = r.metrics
+        if m is None:
+            continue
+        total["checks_wall_s"] += m.wall_s
+        total["cpu_s"] += m.cpu_s
+        total["subprocesses"] += m.subprocesses
+        total["bytes_read"] += m.bytes_read
+    total["checks_wall_s"] = round(total["checks_wall_s"], 6)
+    total["cpu_s"] = round(total["cpu_s"], 6)
+    return total
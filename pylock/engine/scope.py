@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+
+class CheckScope:
+    """
+    Область выполнения одной проверки: срок окончания и флаг отмены.
+
+    Активная область хранится в ContextVar, поэтому run_cmd и Context
+    видят её без явной передачи. Отмена кооперативная: поток проверки
+    нельзя прервать принудительно, но внешние команды ограничиваются
+    оставшимся временем, а зарегистрированные обработчики (например,
+    завершение дочернего процесса) вызываются при отмене.
+    """
+
+    __slots__ = ("check_id", "deadline", "commands", "_cancelled", "_callbacks", "_lock")
+
+    def __init__(self, check_id: str, deadline: Optional[float] = None) -> None:
+        """
+        :param check_id: id проверки (для диагностики).
+        :param deadline: Момент окончания по time.monotonic() (None — без ограничения).
+        """
+        self.check_id = check_id
+        self.deadline = deadline
+        # Замеры внешних команд проверки (utils.cmd.CommandTiming)
+        self.commands: List = []
+        self._cancelled = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Сколько секунд осталось до срока (None — без ограничения)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        if self.deadline is None:
+            return False
+        return (now if now is not None else time.monotonic()) >= self.deadline
+
+    def on_cancel(self, fn: Callable[[], None]) -> None:
+        """Зарегистрировать обработчик отмены (вызывается сразу, если уже отменено)."""
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(fn)
+                return
+        fn()
+
+    def discard(self, fn: Callable[[], None]) -> None:
+        """Снять ранее зарегистрированный обработчик отмены."""
+        with self._lock:
+            try:
+                self._callbacks.remove(fn)
+            except ValueError:
+                pass
+
+    def cancel(self) -> None:
+        """Отменить проверку и вызвать обработчики отмены."""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn()
+            except Exception:
+                # Отмена не должна падать из-за уже завершившегося процесса
+                pass
+
+
+_CURRENT: ContextVar[Optional[CheckScope]] = ContextVar("pylock_check_scope", default=None)
+
+
+def current_scope() -> Optional[CheckScope]:
+    """Область текущей проверки (None вне раннера)."""
+    return _CURRENT.get()
+
+
+def activate(scope: Optional[CheckScope]):
+    """Сделать область текущей; возвращает токен для deactivate()."""
+    return _CURRENT.set(scope)
+
+
+def deactivate(token) -> None:
+    _CURRENT.reset(token)
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import contextvars
+import os
+import stat
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass(slots=True)
+class WalkEntry:
+    """
+    Элемент обхода: путь и результат lstat (ссылки не разыменовываются).
+    """
+    path: str
+    st: os.stat_result
+
+    @property
+    def is_dir(self) -> bool:
+        return stat.S_ISDIR(self.st.st_mode)
+
+    @property
+    def is_file(self) -> bool:
+        return stat.S_ISREG(self.st.st_mode)
+
+
+class Visitor:
+    """
+    Посетитель общего обхода ФС: получает каждый элемент ровно один раз.
+    visit() должен быть дешёвым — он вызывается для каждого inode.
+
+    При параллельном обходе каждый поток работает со своей копией из
+    fork(), после обхода копии сливаются в исходный посетитель через
+    merge() в порядке потоков. Порядок visit() при этом не определён,
+    поэтому result() должен упорядочивать итог сам.
+    """
+
+    def visit(self, entry: WalkEntry) -> None:
+        raise NotImplementedError
+
+    def match(self, entry: WalkEntry) -> bool:
+        """Нужен ли элемент посетителю (visit() учитывает только такие)."""
+        return True
+
+    def fork(self) -> "Visitor":
+        """Пустая копия с теми же настройками для отдельного потока."""
+        raise NotImplementedError
+
+    def merge(self, other: "Visitor") -> None:
+        """Добавить накопленное копией из fork()."""
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        """Итог посетителя после обхода."""
+        return None
+
+
+@dataclass(slots=True)
+class WalkStats:
+    """
+    Итоги обхода.
+
+    :param entries: Передано посетителям элементов (включая корни).
+    :param dirs: Прочитано каталогов.
+    :param reused: Каталогов, взятых из индекса без чтения.
+    :param pruned: Пропущено каталогов (псевдо-/сетевые ФС, другое устройство).
+    :param errors: Каталогов и элементов, которые не удалось прочитать.
+    :param complete: False — обход прерван отменой проверки.
+    """
+    entries: int = 0
+    dirs: int = 0
+    reused: int = 0
+    pruned: int = 0
+    errors: int = 0
+    complete: bool = True
+
+
+# Ключ каталога: (устройство, inode, mtime_ns, ctime_ns). Создание, удаление
+# и переименование элемента меняют mtime каталога, смена его прав — ctime
+DirKey = Tuple[int, int, int, int]
+
+
+def dir_key(st: os.stat_result) -> DirKey:
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_ctime_ns)
+
+
+@dataclass(slots=True)
+class DirRecord:
+    """
+    Запись индекса обхода о прочитанном каталоге.
+
+    :param key: Ключ каталога на момент чтения.
+    :param subdirs: Имена всех подкаталогов (включая отсечённые).
+    :param files: Имена всех остальных элементов (файлы, ссылки, устройства).
+    """
+    key: DirKey
+    subdirs: Tuple[str, ...] = ()
+    files: Tuple[str, ...] = ()
+
+
+# Элемент очереди обхода: (каталог, устройство корня, ключ каталога)
+_Task = Tuple[str, int, DirKey]
+# Индекс обхода: путь каталога -> запись
+WalkIndex = Dict[str, DirRecord]
+
+
+class _Walker:
+    """Настройки обхода, общие для всех потоков."""
+
+    def __init__(self, prune: Optional[Callable[[str], bool]], one_device: bool,
+                 index: Optional[WalkIndex]) -> None:
+        self.prune = prune
+        self.one_device = one_device
+        self.index = index
+
+    def descend(self, path: str, st: os.stat_result, root_dev: int, stats: WalkStats) -> bool:
+        other_device = self.one_device and st.st_dev != root_dev
+        if other_device or (self.prune is not None and self.prune(path)):
+            stats.pruned += 1
+            return False
+        return True
+
+    def read_dir(self, task: _Task, visitors: Sequence[Visitor], stats: WalkStats,
+                 out: Optional[WalkIndex]) -> List[_Task]:
+        """Прочитать один каталог целиком и закрыть его; вернуть подкаталоги для обхода."""
+        directory, root_dev, key = task
+        old = self.index.get(directory) if self.index is not None else None
+        if old is not None and old.key == key:
+            return self._replay(task, old, visitors, stats, out)
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            stats.errors += 1
+            return []
+        stats.dirs += 1
+        errors = stats.errors
+        subdirs: List[_Task] = []
+        names: List[str] = []
+        files: List[str] = []
+        with it:
+            for de in it:
+                try:
+                    st = de.stat(follow_symlinks=False)
+                except OSError:
+                    stats.errors += 1
+                    continue
+                entry = WalkEntry(de.path, st)
+                stats.entries += 1
+                for v in visitors:
+                    v.visit(entry)
+                if stat.S_ISDIR(st.st_mode):
+                    names.append(de.name)
+                    if self.descend(de.path, st, root_dev, stats):
+                        subdirs.append((de.path, root_dev, dir_key(st)))
+                elif out is not None:
+                    files.append(de.name)
+        # Каталог с ошибками чтения не запоминается: в следующий раз он будет прочитан заново
+        if out is not None and stats.errors == errors:
+            out[directory] = DirRecord(key, tuple(sorted(names)), tuple(sorted(files)))
+        # В обратном порядке: со стека каталоги снимаются по алфавиту
+        subdirs.sort(reverse=True)
+        return subdirs
+
+    def _replay(self, task: _Task, record: DirRecord, visitors: Sequence[Visitor],
+                stats: WalkStats, out: Optional[WalkIndex]) -> List[_Task]:
+        """
+        Каталог не менялся с прошлого обхода: вместо scandir повторно
+        проверить lstat всех его элементов. Права и владелец файла не входят
+        в ключ каталога, поэтому lstat нужен каждому файлу, а не только
+        прошлым находкам: иначе chmod u+s не был бы замечен.
+        """
+        directory, root_dev, key = task
+        stats.reused += 1
+        errors = stats.errors
+        subdirs: List[_Task] = []
+        files: List[str] = []
+        for name in record.files:
+            path = os.path.join(directory, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                stats.errors += 1
+                continue
+            entry = WalkEntry(path, st)
+            stats.entries += 1
+            for v in visitors:
+                v.visit(entry)
+            files.append(name)
+        for name in record.subdirs:
+            path = os.path.join(directory, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                stats.errors += 1
+                continue
+            entry = WalkEntry(path, st)
+            stats.entries += 1
+            for v in visitors:
+                v.visit(entry)
+            if stat.S_ISDIR(st.st_mode) and self.descend(path, st, root_dev, stats):
+                subdirs.append((path, root_dev, dir_key(st)))
+        if out is not None and stats.errors == errors:
+            out[directory] = DirRecord(key, record.subdirs, tuple(files))
+        subdirs.sort(reverse=True)
+        return subdirs
+
+
+class _Pool:
+    """
+    Очереди обхода с перехватом работы: каждый поток берёт каталоги с
+    конца своей очереди (в глубину), а опустевший поток забирает самые
+    старые (самые крупные поддеревья) из начала чужих.
+    """
+
+    def __init__(self, nworkers: int, cancelled: Optional[Callable[[], bool]]) -> None:
+        self.queues: List[Deque[_Task]] = [deque() for _ in range(nworkers)]
+        # Каталоги в очередях и в обработке; 0 — обход закончен
+        self.pending = 0
+        self.stop = False
+        self.cancelled = cancelled
+        self.error: Optional[BaseException] = None
+        self.cond = threading.Condition()
+
+    def push(self, worker: int, tasks: List[_Task], done: int = 0) -> None:
+        with self.cond:
+            # Сначала счётчик, потом очередь: иначе другой поток может
+            # перехватить и завершить новый каталог раньше, чем он учтён,
+            # и увидеть pending == 0 при ещё не сделанной работе
+            self.pending += len(tasks) - done
+            self.queues[worker].extend(tasks)
+            if tasks or self.pending == 0:
+                self.cond.notify_all()
+
+    def take(self, worker: int) -> Optional[_Task]:
+        own = self.queues[worker]
+        while True:
+            if self.stop:
+                return None
+            try:
+                return own.pop()
+            except IndexError:
+                pass
+            n = len(self.queues)
+            for i in range(1, n):
+                try:
+                    return self.queues[(worker + i) % n].popleft()
+                except IndexError:
+                    continue
+            with self.cond:
+                if self.pending == 0:
+                    return None
+                self.cond.wait(0.05)
+
+    def halt(self, error: Optional[BaseException] = None) -> None:
+        with self.cond:
+            self.stop = True
+            if error is not None and self.error is None:
+                self.error = error
+            self.cond.notify_all()
+
+    def run(self, worker: int, walker: _Walker, visitors: Sequence[Visitor], stats: WalkStats,
+            out: Optional[WalkIndex]) -> None:
+        try:
+            while True:
+                task = self.take(worker)
+                if task is None:
+                    return
+                if self.cancelled is not None and self.cancelled():
+                    stats.complete = False
+                    self.halt()
+                    return
+                self.push(worker, walker.read_dir(task, visitors, stats, out), done=1)
+        except BaseException as e:
+            self.halt(e)
+
+
+def _merge_stats(into: WalkStats, part: WalkStats) -> None:
+    into.entries += part.entries
+    into.dirs += part.dirs
+    into.reused += part.reused
+    into.pruned += part.pruned
+    into.errors += part.errors
+    into.complete = into.complete and part.complete
+
+
+def _walk_serial(
+    tasks: List[_Task],
+    walker: _Walker,
+    visitors: Sequence[Visitor],
+    stats: WalkStats,
+    out: Optional[WalkIndex],
+    cancelled: Optional[Callable[[], bool]],
+) -> WalkStats:
+    stack = tasks[::-1]
+    while stack:
+        if cancelled is not None and cancelled():
+            stats.complete = False
+            return stats
+        stack.extend(walker.read_dir(stack.pop(), visitors, stats, out))
+    return stats
+
+
+def walk(
+    roots: Iterable[str],
+    visitors: Sequence[Visitor],
+    *,
+    prune: Optional[Callable[[str], bool]] = None,
+    one_device: bool = False,
+    cancelled: Optional[Callable[[], bool]] = None,
+    workers: int = 1,
+    index: Optional[WalkIndex] = None,
+    out: Optional[WalkIndex] = None,
+) -> WalkStats:
+    """
+    Один проход по дереву каталогов на os.scandir: каждый элемент
+    получает один lstat и рассылается всем посетителям.
+
+    С workers > 1 поддеревья распределяются между потоками с перехватом
+    работы: scandir и lstat отпускают GIL, так что потоки держат очередь
+    ввода-вывода устройства занятой. Каждый поток держит открытым не
+    больше одного каталога (он читается целиком и закрывается до
+    спуска), поэтому открытых каталогов не больше числа потоков.
+    Посетители работают с копиями из Visitor.fork() и сливаются в
+    исходные в порядке потоков.
+
+    С индексом прошлого обхода каталоги, ключ которых (inode, mtime, ctime)
+    не изменился, не читаются: их элементы берутся из индекса и заново
+    проверяются lstat, так что смена прав или владельца файла (chmod,
+    chown) видна сразу; экономится только чтение каталогов.
+
+    :param roots: Корни обхода (сами корни тоже передаются посетителям).
+    :param prune: prune(path) -> True — не спускаться в каталог (сам каталог посетители видят).
+    :param one_device: Не переходить на другие устройства (как find -xdev).
+    :param cancelled: Опрашивается перед чтением каждого каталога.
+    :param workers: Число потоков обхода.
+    :param index: Индекс прошлого обхода (None — полный обход).
+    :param out: Сюда записывается индекс этого обхода.
+    """
+    stats = WalkStats()
+    tasks: List[_Task] = []
+    for root in roots:
+        try:
+            st = os.lstat(root)
+        except OSError:
+            stats.errors += 1
+            continue
+        entry = WalkEntry(root, st)
+        stats.entries += 1
+        for v in visitors:
+            v.visit(entry)
+        if entry.is_dir:
+            tasks.append((root, st.st_dev, dir_key(st)))
+
+    walker = _Walker(prune, one_device, index)
+    if workers <= 1:
+        return _walk_serial(tasks, walker, visitors, stats, out, cancelled)
+
+    pool = _Pool(workers, cancelled)
+    pool.push(0, tasks[::-1])
+    forks = [[v.fork() for v in visitors] for _ in range(workers)]
+    parts = [WalkStats() for _ in range(workers)]
+    outs: List[Optional[WalkIndex]] = [{} if out is not None else None for _ in range(workers)]
+    threads = []
+    for i in range(workers):
+        # Копия контекста: в потоке видна область текущей проверки (отмена, срок)
+        run = contextvars.copy_context().run
+        t = threading.Thread(
+            target=run, args=(pool.run, i, walker, forks[i], parts[i], outs[i]),
+            name=f"pylock-walk-{i}", daemon=True,
+        )
+        try:
+            t.start()
+        except RuntimeError:
+            # Нет ресурсов на поток (лимит памяти изолированной проверки):
+            # работают уже запущенные, их очереди доступны для перехвата
+            break
+        threads.append(t)
+    if not threads:
+        return _walk_serial(tasks, walker, visitors, stats, out, cancelled)
+    for t in threads:
+        t.join()
+    if pool.error is not None:
+        raise pool.error
+    for i in range(workers):
+        _merge_stats(stats, parts[i])
+        if out is not None:
+            out.update(outs[i])  # type: ignore[arg-type]
+        for v, part in zip(visitors, forks[i]):
+            v.merge(part)
+    return stats
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Tuple
+
+from ..utils.storage import from_sqlite_int, to_sqlite_int
+from .walk import DirRecord, WalkIndex
+
+# Версия схемы: при смене формата старый файл просто не читается
+SCHEMA = 2
+_SEP = b"\0"
+
+
+def _names(blob: bytes) -> Tuple[str, ...]:
+    return tuple(os.fsdecode(n) for n in blob.split(_SEP)) if blob else ()
+
+
+def _blob(names: Tuple[str, ...]) -> bytes:
+    return _SEP.join(os.fsencode(n) for n in names)
+
+
+def load_index(path: Path, signature: str) -> Tuple[WalkIndex, float]:
+    """
+    Прочитать индекс обхода ФС.
+
+    :param signature: Подпись настроек обхода; индекс с другой подписью не используется.
+    :return: (индекс, время последнего полного обхода); ({}, 0.0) — индекса нет,
+        он повреждён или построен с другими настройками.
+    """
+    if not path.is_file():
+        return {}, 0.0
+    try:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return {}, 0.0
+    try:
+        meta = dict(db.execute("SELECT k, v FROM meta"))
+        if meta.get("schema") != str(SCHEMA) or meta.get("signature") != signature:
+            return {}, 0.0
+        index: WalkIndex = {}
+        for p, dev, ino, mtime, ctime, subdirs, files in db.execute(
+            "SELECT path, dev, ino, mtime, ctime, subdirs, files FROM dirs"
+        ):
+            key = (from_sqlite_int(dev), from_sqlite_int(ino), mtime, ctime)
+            index[os.fsdecode(p)] = DirRecord(key, _names(subdirs), _names(files))
+        return index, float(meta.get("full_at", 0))
+    except (sqlite3.Error, ValueError):
+        return {}, 0.0
+    finally:
+        db.close()
+
+
+def save_index(path: Path, signature: str, index: WalkIndex, full_at: float) -> bool:
+    """
+    Записать индекс обхода целиком: во временный файл и rename, чтобы
+    параллельный аудит не прочитал наполовину записанный индекс.
+
+    :return: False, если каталог недоступен для записи.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if tmp.exists():
+            tmp.unlink()
+        db = sqlite3.connect(tmp)
+        try:
+            db.execute("PRAGMA journal_mode=OFF")
+            db.execute("PRAGMA synchronous=OFF")
+            db.execute("CREATE TABLE meta (k TEXT PRIMARY KEY, v TEXT)")
+            db.execute(
+                "CREATE TABLE dirs (path BLOB PRIMARY KEY, dev INTEGER, ino INTEGER,"
+                " mtime INTEGER, ctime INTEGER, subdirs BLOB, files BLOB)"
+            )
+            db.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("schema", str(SCHEMA)), ("signature", signature), ("full_at", repr(full_at)),
+            ])
+            db.executemany("INSERT INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                (os.fsencode(p), to_sqlite_int(r.key[0]), to_sqlite_int(r.key[1]),
+                 r.key[2], r.key[3], _blob(r.subdirs), _blob(r.files))
+                for p, r in index.items()
+            ))
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp, path)
+        return True
+    except (OSError, sqlite3.Error):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
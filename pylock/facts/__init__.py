@@ -0,0 +1 @@
+# Facts package
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .base import fact, path_stamp
+
+PASSWD = "/etc/passwd"
+SHADOW = "/etc/shadow"
+GROUP = "/etc/group"
+GSHADOW = "/etc/gshadow"
+
+
+@dataclass(slots=True)
+class ShadowEntry:
+    """Запись /etc/shadow (числовые поля — как в файле, пустые строки допустимы)."""
+    name: str
+    password: str
+    lastchg: str = ""
+    min: str = ""
+    max: str = ""
+    warn: str = ""
+    inactive: str = ""
+    expire: str = ""
+
+
+@dataclass(slots=True)
+class Account:
+    """Запись /etc/passwd с присоединённой записью shadow."""
+    name: str
+    password: str
+    uid: Optional[int]
+    gid: Optional[int]
+    gecos: str
+    home: str
+    shell: str
+    shadow: Optional[ShadowEntry] = None
+
+
+@dataclass(slots=True)
+class Group:
+    """Запись /etc/group; admins и password_hash — из /etc/gshadow, если он прочитан."""
+    name: str
+    password: str
+    gid: Optional[int]
+    members: List[str] = field(default_factory=list)
+    admins: List[str] = field(default_factory=list)
+    password_hash: Optional[str] = None
+
+
+@dataclass(slots=True)
+class AccountDB:
+    """
+    Индексированная база учётных записей.
+
+    :param users: Учётки в порядке /etc/passwd.
+    :param by_name: Имя -> учётка (первая при дублях).
+    :param by_uid: UID -> все учётки с этим UID.
+    :param shadow: Записи /etc/shadow в порядке файла (пусто, если не прочитан).
+    :param shadow_readable: Удалось ли прочитать /etc/shadow.
+    :param groups: Группы в порядке /etc/group.
+    :param groups_by_name: Имя -> группа.
+    :param groups_by_gid: GID -> все группы с этим GID.
+    :param member_of: Имя пользователя -> группы, где он указан дополнительным участником.
+    """
+    users: List[Account] = field(default_factory=list)
+    by_name: Dict[str, Account] = field(default_factory=dict)
+    by_uid: Dict[int, List[Account]] = field(default_factory=dict)
+    shadow: List[ShadowEntry] = field(default_factory=list)
+    shadow_readable: bool = False
+    groups: List[Group] = field(default_factory=list)
+    groups_by_name: Dict[str, Group] = field(default_factory=dict)
+    groups_by_gid: Dict[int, List[Group]] = field(default_factory=dict)
+    member_of: Dict[str, List[Group]] = field(default_factory=dict)
+
+    def duplicate_uids(self) -> Dict[int, List[Account]]:
+        """UID, используемые несколькими учётками."""
+        return {uid: accs for uid, accs in self.by_uid.items() if len(accs) > 1}
+
+    def primary_group(self, account: Account) -> Optional[Group]:
+        groups = self.groups_by_gid.get(account.gid) if account.gid is not None else None
+        return groups[0] if groups else None
+
+    def groups_of(self, name: str) -> List[Group]:
+        """Основная и дополнительные группы пользователя."""
+        out: List[Group] = []
+        account = self.by_name.get(name)
+        primary = self.primary_group(account) if account is not None else None
+        if primary is not None:
+            out.append(primary)
+        out.extend(g for g in self.member_of.get(name, []) if g is not primary)
+        return out
+
+
+def _int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _records(text: str, min_fields: int):
+    # Пустые строки, комментарии и NIS-записи (+/-) учётками не являются
+    for line in text.splitlines():
+        if not line or line[0] in "#+-":
+            continue
+        parts = line.split(":")
+        if len(parts) >= min_fields:
+            yield parts
+
+
+def _accounts_stamp(ctx) -> tuple:
+    return path_stamp(PASSWD, SHADOW, GROUP, GSHADOW)
+
+
+@fact("accounts", missing="Файл /etc/passwd отсутствует или недоступен", stamp=_accounts_stamp)
+def accounts(ctx) -> Optional[AccountDB]:
+    """
+    База учётных записей из passwd/shadow/group/gshadow (через ctx.files).
+    None — /etc/passwd не прочитан; недоступные shadow/gshadow просто не присоединяются.
+    """
+    try:
+        passwd_text = ctx.files.read_text(PASSWD, errors="replace")
+    except OSError:
+        return None
+    db = AccountDB()
+    for p in _records(passwd_text, 7):
+        acc = Account(p[0], p[1], _int(p[2]), _int(p[3]), p[4], p[5], p[6])
+        db.users.append(acc)
+        db.by_name.setdefault(acc.name, acc)
+        if acc.uid is not None:
+            db.by_uid.setdefault(acc.uid, []).append(acc)
+
+    try:
+        shadow_text = ctx.files.read_text(SHADOW, errors="replace")
+        db.shadow_readable = True
+    except OSError:
+        shadow_text = ""
+    for p in _records(shadow_text, 2):
+        entry = ShadowEntry(p[0], p[1], *(p[2:8] + [""] * (8 - len(p)))[:6])
+        db.shadow.append(entry)
+        acc = db.by_name.get(entry.name)
+        if acc is not None and acc.shadow is None:
+            acc.shadow = entry
+
+    try:
+        group_text = ctx.files.read_text(GROUP, errors="replace")
+    except OSError:
+        group_text = ""
+    for p in _records(group_text, 4):
+        grp = Group(p[0], p[1], _int(p[2]), [m for m in p[3].split(",") if m])
+        db.groups.append(grp)
+        db.groups_by_name.setdefault(grp.name, grp)
+        if grp.gid is not None:
+            db.groups_by_gid.setdefault(grp.gid, []).append(grp)
+        for member in grp.members:
+            db.member_of.setdefault(member, []).append(grp)
+
+    try:
+        gshadow_text = ctx.files.read_text(GSHADOW, errors="replace")
+    except OSError:
+        gshadow_text = ""
+    for p in _records(gshadow_text, 4):
+        grp = db.groups_by_name.get(p[0])
+        if grp is not None:
+            grp.password_hash = p[1]
+            grp.admins = [a for a in p[2].split(",") if a]
+    return db
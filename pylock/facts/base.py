@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import functools
+import os
+import stat
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set
+
+if TYPE_CHECKING:
+    from ..engine.context import Context
+
+
+@dataclass(slots=True, frozen=True)
+class FactSpec:
+    """Описание именованного факта о системе"""
+    name: str
+    fn: Callable[["Context"], Any]
+    missing: Optional[str] = None  # заметка для проверок, пропущенных из-за ложного факта
+    # Дешёвый отпечаток источника (mtime/размер файлов): пока он не изменился,
+    # значение переживает смену аудита в долгоживущем агенте
+    stamp: Optional[Callable[["Context"], Any]] = None
+
+
+@dataclass(slots=True, frozen=True)
+class Transient:
+    """
+    Значение факта только для текущего аудита: поставщик со stamp
+    возвращает его, если источник не удалось опросить (команда упала,
+    истёк лимит, проверка отменена). Хранилище отдаёт value, но не
+    запоминает его по отпечатку — следующий аудит вычислит факт заново.
+    """
+    value: Any
+
+
+# Реестр всех известных фактов
+_FACTS: Dict[str, FactSpec] = {}
+
+
+def register_fact(spec: FactSpec) -> None:
+    """
+    Регистрация факта по имени.
+    Если имя дублируется — выбрасывается ValueError, чтобы избежать конфликтов.
+    """
+    if spec.name in _FACTS:
+        raise ValueError(f"Дубликат имени факта: {spec.name}")
+    _FACTS[spec.name] = spec
+
+
+def get_fact(name: str) -> FactSpec:
+    try:
+        return _FACTS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный факт: {name}") from None
+
+
+def path_stamp(*paths: str) -> tuple:
+    """
+    Отпечаток файлов для FactSpec.stamp: (путь, mtime_ns, размер) каждого
+    пути; для каталога учитываются и его непосредственные записи.
+    Отсутствующий путь тоже часть отпечатка (появление файла его меняет).
+    """
+    out = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            out.append((path, None, None))
+            continue
+        out.append((path, st.st_mtime_ns, st.st_size))
+        if stat.S_ISDIR(st.st_mode):
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            est = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        out.append((entry.path, est.st_mtime_ns, est.st_size))
+            except OSError:
+                pass
+    return tuple(sorted(out, key=lambda x: x[0]))
+
+
+def fact(
+    name: str,
+    *,
+    missing: Optional[str] = None,
+    stamp: Optional[Callable[["Context"], Any]] = None,
+):
+    """
+    Декоратор: регистрирует функцию как поставщик факта.
+
+    Факт вычисляется не более одного раза за аудит (значение хранится в
+    ctx.facts), поэтому декорированную функцию можно вызывать из любого
+    числа проверок: fn(ctx) вернёт закэшированное значение. Имя факта можно
+    указать в Check.requires как "fact:<name>" — если значение ложно,
+    проверка пропускается без запуска.
+
+    Если задан stamp, значение переиспользуется и в следующих аудитах того
+    же хранилища, пока stamp(ctx) возвращает то же самое (None — не кэшировать).
+    Такие значения не должны изменяться вызывающими. Значение, полученное
+    при сбое источника, поставщик возвращает обёрнутым в Transient.
+    """
+    def deco(fn: Callable[["Context"], Any]) -> Callable[["Context"], Any]:
+        register_fact(FactSpec(name=name, fn=fn, missing=missing, stamp=stamp))
+
+        @functools.wraps(fn)
+        def accessor(ctx: "Context") -> Any:
+            return ctx.fact(name)
+
+        accessor.fact_name = name  # type: ignore[attr-defined]
+        return accessor
+
+    return deco
+
+
+class FactStore:
+    """
+    Потокобезопасное хранилище вычисленных фактов.
+    Параллельные проверки, запросившие один факт, ждут единственного вычисления.
+
+    Хранилище может обслуживать несколько аудитов подряд (agentd): renew()
+    перед очередным аудитом сбрасывает всё, кроме фактов с отпечатком (stamp),
+    а те перепроверяются по отпечатку при первом обращении.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[str, Any] = {}
+        self._stamps: Dict[str, Any] = {}
+        # Факты, значения которых актуальны в текущем аудите
+        self._fresh: Set[str] = set()
+        self._errors: Dict[str, BaseException] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.Lock()
+            return lock
+
+    def get(self, name: str, ctx: "Context") -> Any:
+        """
+        Значение факта; при первом обращении вызывает поставщик.
+        Исключение поставщика запоминается и пробрасывается всем вызывающим.
+        """
+        if name in self._fresh:
+            return self._values[name]
+        with self._key_lock(name):
+            if name in self._fresh:
+                return self._values[name]
+            if name in self._errors:
+                raise self._errors[name]
+            spec = get_fact(name)
+            stamp = None
+            if spec.stamp is not None:
+                try:
+                    stamp = spec.stamp(ctx)
+                except Exception:
+                    stamp = None
+                if stamp is not None and name in self._values and self._stamps.get(name) == stamp:
+                    self._fresh.add(name)
+                    return self._values[name]
+            try:
+                value = spec.fn(ctx)
+            except Exception as e:
+                self._errors[name] = e
+                raise
+            if isinstance(value, Transient):
+                value, stamp = value.value, None
+            self._values[name] = value
+            if stamp is not None:
+                self._stamps[name] = stamp
+            else:
+                self._stamps.pop(name, None)
+            self._fresh.add(name)
+            return value
+
+    def renew(self) -> None:
+        """Начать новый аудит: оставить только факты с отпечатком."""
+        with self._lock:
+            for name in list(self._values):
+                if name not in self._stamps:
+                    del self._values[name]
+            self._fresh.clear()
+            self._errors.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._stamps.clear()
+            self._fresh.clear()
+            self._errors.clear()
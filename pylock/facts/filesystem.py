@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from ..engine.walk import Visitor, WalkEntry, WalkIndex, WalkStats, walk
+from ..engine.walkindex import load_index, save_index
+from ..utils.storage import cache_dir
+from .accounts import accounts
+from .base import fact
+from .mounts import mounts
+
+if TYPE_CHECKING:
+    from ..engine.context import Context
+
+WALK_ROOTS = ("/",)
+INDEX_NAME = "fs-index.sqlite"
+# Полный обход раз в сутки: страховка на случай, если индекс разошёлся с ФС
+# (каталог изменён с восстановлением mtime и ctime, например при откате снимка)
+FULL_SCAN_INTERVAL = 24 * 3600
+# Лимит времени общего обхода (сек). Обход идёт в потоке проверки, первой
+# запросившей fs_scan, но её лимит и отмена на него не действуют: иначе
+# остальные проверки ФС получили бы обход, оборванный чужим таймаутом
+WALK_TIMEOUT = 1800.0
+
+
+def default_walk_workers() -> int:
+    # Обход упирается в задержки ввода-вывода, а не в CPU: потоков вдвое
+    # больше ядер; на одном ядре лишний поток только мешает тёплому кэшу
+    cpus = os.cpu_count() or 1
+    return 1 if cpus == 1 else min(8, cpus * 2)
+
+# Посетители общего обхода: имя -> фабрика(ctx) (None — посетитель в этом аудите не нужен)
+_VISITORS: Dict[str, Callable[["Context"], Optional[Visitor]]] = {}
+
+
+def fs_visitor(name: str):
+    """
+    Декоратор: зарегистрировать фабрику посетителя общего обхода ФС.
+    Результат посетителя доступен проверкам как fs_scan(ctx).results[name].
+    """
+    def deco(factory: Callable[["Context"], Optional[Visitor]]):
+        if name in _VISITORS:
+            raise ValueError(f"Дубликат имени посетителя: {name}")
+        _VISITORS[name] = factory
+        return factory
+
+    return deco
+
+
+class _PathVisitor(Visitor):
+    """Посетитель, собирающий пути; результат — отсортированный список."""
+
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+
+    def fork(self) -> "_PathVisitor":
+        return type(self)()
+
+    def merge(self, other: Visitor) -> None:
+        self.paths.extend(other.paths)  # type: ignore[attr-defined]
+
+    def result(self) -> List[str]:
+        return sorted(self.paths)
+
+
+class WorldWritableDirs(_PathVisitor):
+    """Каталоги с правом записи для всех и без sticky-бита."""
+
+    def match(self, entry: WalkEntry) -> bool:
+        mode = entry.st.st_mode
+        return mode & 0o1002 == 0o002 and stat.S_ISDIR(mode)
+
+    def visit(self, entry: WalkEntry) -> None:
+        if self.match(entry):
+            self.paths.append(entry.path)
+
+
+class SetIdFiles(Visitor):
+    """Обычные файлы с SUID или SGID: (путь, режим, uid)."""
+
+    def __init__(self) -> None:
+        self.files: List[Tuple[str, int, int]] = []
+
+    def match(self, entry: WalkEntry) -> bool:
+        mode = entry.st.st_mode
+        return bool(mode & 0o6000) and stat.S_ISREG(mode)
+
+    def visit(self, entry: WalkEntry) -> None:
+        if self.match(entry):
+            self.files.append((entry.path, entry.st.st_mode, entry.st.st_uid))
+
+    def fork(self) -> "SetIdFiles":
+        return SetIdFiles()
+
+    def merge(self, other: Visitor) -> None:
+        self.files.extend(other.files)  # type: ignore[attr-defined]
+
+    def result(self) -> List[Tuple[str, int, int]]:
+        return sorted(self.files)
+
+
+class UnownedFiles(_PathVisitor):
+    """Элементы, UID или GID которых нет в passwd/group."""
+
+    def __init__(self, uids: FrozenSet[int], gids: FrozenSet[int]) -> None:
+        super().__init__()
+        self.uids = uids
+        self.gids = gids
+
+    def fork(self) -> "UnownedFiles":
+        return UnownedFiles(self.uids, self.gids)
+
+    def match(self, entry: WalkEntry) -> bool:
+        st = entry.st
+        return st.st_uid not in self.uids or st.st_gid not in self.gids
+
+    def visit(self, entry: WalkEntry) -> None:
+        if self.match(entry):
+            self.paths.append(entry.path)
+
+
+class WorldWritableFiles(_PathVisitor):
+    """Обычные файлы с правом записи для всех."""
+
+    def match(self, entry: WalkEntry) -> bool:
+        mode = entry.st.st_mode
+        return bool(mode & 0o002) and stat.S_ISREG(mode)
+
+    def visit(self, entry: WalkEntry) -> None:
+        if self.match(entry):
+            self.paths.append(entry.path)
+
+
+@fs_visitor("world_writable_dirs")
+def _world_writable_dirs(ctx) -> Visitor:
+    return WorldWritableDirs()
+
+
+@fs_visitor("setid_files")
+def _setid_files(ctx) -> Visitor:
+    return SetIdFiles()
+
+
+@fs_visitor("unowned")
+def _unowned(ctx) -> Optional[Visitor]:
+    db = accounts(ctx)
+    if db is None:
+        return None
+    return UnownedFiles(frozenset(db.by_uid), frozenset(db.groups_by_gid))
+
+
+@fs_visitor("world_writable_files")
+def _world_writable_files(ctx) -> Visitor:
+    return WorldWritableFiles()
+
+
+@dataclass(slots=True)
+class FsScan:
+    """
+    Итог общего обхода ФС.
+
+    :param results: Имя посетителя -> его результат (посетителя нет — его не запускали).
+    :param full: True — полный обход, False — по индексу прошлого аудита.
+    """
+    results: Dict[str, Any] = field(default_factory=dict)
+    stats: WalkStats = field(default_factory=WalkStats)
+    full: bool = True
+
+
+def _walk_signature(one_device: bool) -> str:
+    parts = [repr(WALK_ROOTS), repr(one_device)]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+@fact("fs_scan")
+def fs_scan(ctx) -> FsScan:
+    """
+    Один обход файловой системы на все зарегистрированные посетители.
+    Точки монтирования псевдо- и сетевых ФС не обходятся; с параметром
+    профиля fs_one_device обход не покидает устройство корня. Поддеревья
+    обходятся параллельно (fs_workers в профиле, по умолчанию — по числу CPU);
+    результаты посетителей упорядочены и от числа потоков не зависят.
+
+    Между аудитами хранится индекс каталогов (в кэше pylock): неизменившиеся
+    каталоги не читаются, их элементы только перепроверяются lstat.
+    Раз в fs_full_scan_interval секунд (по умолчанию сутки) и при смене
+    настроек обхода выполняется полный обход; 0 отключает индекс.
+
+    У обхода свой лимит времени (fs_walk_timeout в профиле, по умолчанию
+    WALK_TIMEOUT; 0 — без лимита), не зависящий от лимита запросившей
+    проверки. Если та проверка не дождётся обхода, она получит timeout,
+    а обход продолжится: проверки, запросившие fs_scan позже, получат
+    полный результат, а индекс будет сохранён для следующего аудита.
+    """
+    profile = ctx.profile
+    active = {}
+    for name, factory in _VISITORS.items():
+        visitor = factory(ctx)
+        if visitor is not None:
+            active[name] = visitor
+    table = mounts(ctx)
+    one_device = bool(profile is not None and profile.fs_one_device)
+    interval = profile.fs_full_scan_interval if profile is not None else None
+    if interval is None:
+        interval = FULL_SCAN_INTERVAL
+    limit = profile.fs_walk_timeout if profile is not None else None
+    if limit is None:
+        limit = WALK_TIMEOUT
+    walk_deadline = time.monotonic() + limit if limit > 0 else None
+
+    def cancelled() -> bool:
+        return walk_deadline is not None and time.monotonic() >= walk_deadline
+
+    index: WalkIndex = {}
+    full_at = 0.0
+    path = cache_dir() / INDEX_NAME
+    signature = _walk_signature(one_device)
+    if interval > 0:
+        index, full_at = load_index(path, signature)
+    now = time.time()
+    full = not index or not 0 <= now - full_at < interval
+    out: Optional[WalkIndex] = {} if interval > 0 else None
+    stats = walk(
+        WALK_ROOTS,
+        list(active.values()),
+        prune=table.prune if table is not None else None,
+        one_device=one_device,
+        cancelled=cancelled,
+        workers=(profile.fs_workers if profile is not None else None) or default_walk_workers(),
+        index=None if full else index,
+        out=out,
+    )
+    # Прерванный обход оставил бы в индексе дыры: сохраняется только полный
+    if out is not None and stats.complete:
+        save_index(path, signature, out, now if full else full_at)
+    return FsScan(results={name: v.result() for name, v in active.items()}, stats=stats, full=full)
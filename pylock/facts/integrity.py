@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..engine.walk import Visitor, WalkEntry, walk
+from ..utils.storage import from_sqlite_int, state_dir, to_sqlite_int
+from .base import fact
+from .filesystem import default_walk_workers, fs_scan
+
+# Контролируемые по умолчанию пути: исполняемые файлы и конфигурация входа
+FIM_PATHS = (
+    "/bin", "/sbin", "/usr/bin", "/usr/sbin", "/usr/local/bin", "/usr/local/sbin",
+    "/etc/pam.d", "/etc/ssh", "/etc/sudoers", "/etc/sudoers.d",
+    "/etc/passwd", "/etc/shadow", "/etc/group",
+)
+STORE_NAME = "fim.sqlite"
+SUID_STORE_NAME = "suid.sqlite"
+DIGEST = "sha256"
+CHUNK = 1 << 20
+
+_COLUMNS = "path, link, mode, uid, gid, size, mtime, ctime, ino, digest"
+
+# Названия изменений из FileState.changes() для находок
+CHANGE_NAMES = {
+    "content": "содержимое", "link": "цель ссылки", "mode": "права", "owner": "владелец",
+}
+
+
+@dataclass(slots=True)
+class FileState:
+    """
+    Состояние контролируемого файла.
+
+    :param link: Цель символической ссылки (None — обычный файл).
+    :param digest: Хеш содержимого; пустая строка — файл не удалось прочитать.
+    """
+    path: str
+    link: Optional[str]
+    mode: int
+    uid: int
+    gid: int
+    size: int
+    mtime: int
+    ctime: int
+    ino: int
+    digest: str = ""
+
+    @property
+    def key(self) -> Tuple[int, int, int, int]:
+        """Пока (размер, mtime, ctime, inode) не изменились, хеш не пересчитывается."""
+        return (self.size, self.mtime, self.ctime, self.ino)
+
+    def changes(self, old: "FileState") -> List[str]:
+        """Чем состояние отличается от эталонного: content, link, mode, owner."""
+        out = []
+        if self.link != old.link:
+            out.append("link")
+        elif self.digest and old.digest and self.digest != old.digest:
+            out.append("content")
+        if stat.S_IMODE(self.mode) != stat.S_IMODE(old.mode):
+            out.append("mode")
+        if (self.uid, self.gid) != (old.uid, old.gid):
+            out.append("owner")
+        return out
+
+
+def file_digest(path: str) -> str:
+    """
+    Хеш содержимого обычного файла потоково, без чтения целиком в память.
+    Файл, подменённый после lstat на ссылку или FIFO, не читается.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK | getattr(os, "O_CLOEXEC", 0))
+    with open(fd, "rb", buffering=0) as fh:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            raise OSError(f"{path}: не обычный файл")
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(fh, DIGEST).hexdigest()
+        h = hashlib.new(DIGEST)
+        for chunk in iter(lambda: fh.read(CHUNK), b""):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+class _Collector(Visitor):
+    """Обычные файлы и символические ссылки под контролируемыми путями."""
+
+    def __init__(self) -> None:
+        self.entries: List[WalkEntry] = []
+
+    def match(self, entry: WalkEntry) -> bool:
+        mode = entry.st.st_mode
+        return stat.S_ISREG(mode) or stat.S_ISLNK(mode)
+
+    def visit(self, entry: WalkEntry) -> None:
+        if self.match(entry):
+            self.entries.append(entry)
+
+    def fork(self) -> "_Collector":
+        return _Collector()
+
+    def merge(self, other: Visitor) -> None:
+        self.entries.extend(other.entries)  # type: ignore[attr-defined]
+
+
+def _state(entry: WalkEntry) -> FileState:
+    st = entry.st
+    link = None
+    if stat.S_ISLNK(st.st_mode):
+        try:
+            link = os.readlink(entry.path)
+        except OSError:
+            link = ""
+    return FileState(entry.path, link, st.st_mode, st.st_uid, st.st_gid, st.st_size,
+                     st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+
+
+def _hash(state: FileState) -> None:
+    try:
+        state.digest = file_digest(state.path)
+    except OSError:
+        state.digest = ""
+
+
+@dataclass(slots=True)
+class FimScan:
+    """
+    Текущее состояние контролируемых файлов.
+
+    :param hashed: Файлов, хеш которых пришлось пересчитать.
+    :param complete: False — сканирование прервано отменой проверки.
+    """
+    files: Dict[str, FileState] = field(default_factory=dict)
+    hashed: int = 0
+    complete: bool = True
+
+
+def snapshot(
+    entries: Iterable[WalkEntry],
+    known: Dict[str, FileState],
+    *,
+    workers: int = 1,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> FimScan:
+    """
+    Снять состояние файлов. Хеш берётся из known, если ключ файла не
+    изменился; остальные файлы хешируются параллельно (hashlib отпускает
+    GIL при хешировании, чтение — тоже).
+
+    :param entries: Обычные файлы и символические ссылки (остальное пропускается).
+    :param known: Путь -> ранее снятое состояние (эталон или прошлый запуск).
+    """
+    out = FimScan()
+    pending: List[FileState] = []
+    for entry in entries:
+        if not stat.S_ISREG(entry.st.st_mode) and not stat.S_ISLNK(entry.st.st_mode):
+            continue
+        cur = _state(entry)
+        prev = known.get(cur.path)
+        if cur.link is None:
+            if prev is not None and prev.link is None and prev.digest and prev.key == cur.key:
+                cur.digest = prev.digest
+            else:
+                pending.append(cur)
+        out.files[cur.path] = cur
+    if workers <= 1 or len(pending) < 2:
+        for cur in pending:
+            if cancelled is not None and cancelled():
+                out.complete = False
+                break
+            _hash(cur)
+            out.hashed += 1
+        return out
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pylock-fim") as pool:
+        futures = [pool.submit(_hash, cur) for cur in pending]
+        # Отмена опрашивается здесь: в потоках пула нет области текущей проверки
+        for fut in as_completed(futures):
+            fut.result()
+            out.hashed += 1
+            if cancelled is not None and cancelled():
+                out.complete = False
+                for f in futures:
+                    f.cancel()
+                break
+    return out
+
+
+def scan(
+    paths: Sequence[str],
+    known: Dict[str, FileState],
+    *,
+    workers: int = 1,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> FimScan:
+    """Снять состояние всех файлов под paths (см. snapshot)."""
+    collector = _Collector()
+    stats = walk(paths, [collector], cancelled=cancelled, workers=workers)
+    out = snapshot(collector.entries, known, workers=workers, cancelled=cancelled)
+    out.complete = out.complete and stats.complete
+    return out
+
+
+def _to_row(s: FileState) -> tuple:
+    return (os.fsencode(s.path), os.fsencode(s.link) if s.link is not None else None,
+            s.mode, s.uid, s.gid, s.size, s.mtime, s.ctime, to_sqlite_int(s.ino), s.digest)
+
+
+def _from_row(row: tuple) -> FileState:
+    path, link, mode, uid, gid, size, mtime, ctime, ino, digest = row
+    return FileState(os.fsdecode(path), os.fsdecode(link) if link is not None else None,
+                     mode, uid, gid, size, mtime, ctime, from_sqlite_int(ino), digest)
+
+
+class FimStore:
+    """
+    Эталон FIM в sqlite: таблица baseline — принятое состояние, таблица
+    seen — последнее снятое (из неё берутся хеши неизменившихся файлов).
+    В meta отмечается, какие таблицы записаны: пустой эталон — тоже эталон.
+
+    Очередной запуск переписывает в seen только изменившиеся строки
+    (update), эталон при сравнении читается построчно (rows).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+        for table in ("baseline", "seen"):
+            db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (path BLOB PRIMARY KEY, link BLOB,"
+                " mode INTEGER, uid INTEGER, gid INTEGER, size INTEGER, mtime INTEGER,"
+                " ctime INTEGER, ino INTEGER, digest TEXT)"
+            )
+        return db
+
+    def exists(self, table: str) -> bool:
+        """Записывалась ли таблица хоть раз."""
+        if not self.path.is_file():
+            return False
+        try:
+            db = self._connect()
+        except (OSError, sqlite3.Error):
+            return False
+        try:
+            return db.execute("SELECT 1 FROM meta WHERE k = ?", (table,)).fetchone() is not None
+        except sqlite3.Error:
+            return False
+        finally:
+            db.close()
+
+    def rows(self, table: str) -> Iterator[FileState]:
+        """Строки таблицы по одной с курсора; ошибка чтения завершает перебор."""
+        if not self.path.is_file():
+            return
+        try:
+            db = self._connect()
+        except (OSError, sqlite3.Error):
+            return
+        try:
+            for row in db.execute(f"SELECT {_COLUMNS} FROM {table}"):
+                yield _from_row(row)
+        except sqlite3.Error:
+            return
+        finally:
+            db.close()
+
+    def load(self, table: str) -> Dict[str, FileState]:
+        """Прочитать таблицу; пустой словарь — эталона нет или файл недоступен."""
+        return {s.path: s for s in self.rows(table)}
+
+    def _write(self, table: str, states: Iterable[FileState], removed: Iterable[str],
+               replace_all: bool) -> bool:
+        try:
+            db = self._connect()
+        except (OSError, sqlite3.Error):
+            return False
+        try:
+            with db:
+                if replace_all:
+                    db.execute(f"DELETE FROM {table}")
+                db.executemany(f"DELETE FROM {table} WHERE path = ?",
+                               ((os.fsencode(p),) for p in removed))
+                sql = (f"INSERT OR REPLACE INTO {table} ({_COLUMNS})"
+                       " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+                db.executemany(sql, (_to_row(s) for s in states))
+                db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (table, repr(time.time())))
+            return True
+        except sqlite3.Error:
+            return False
+        finally:
+            db.close()
+
+    def save(self, table: str, states: Iterable[FileState]) -> bool:
+        """Заменить содержимое таблицы одной транзакцией; False — запись не удалась."""
+        return self._write(table, states, (), replace_all=True)
+
+    def update(self, table: str, current: Dict[str, FileState],
+               previous: Dict[str, FileState]) -> bool:
+        """
+        Привести таблицу с содержимым previous к current: записываются только
+        новые и изменившиеся строки, исчезнувшие пути удаляются.
+
+        :return: False — запись не удалась.
+        """
+        changed = [s for path, s in current.items() if previous.get(path) != s]
+        removed = previous.keys() - current.keys()
+        if not changed and not removed and self.exists(table):
+            return True
+        return self._write(table, changed, removed, replace_all=False)
+
+    def accept(self) -> int:
+        """Принять последнее снятое состояние как эталон; число файлов в эталоне."""
+        try:
+            db = self._connect()
+        except (OSError, sqlite3.Error) as e:
+            raise OSError(f"Не удалось записать эталон FIM: {self.path}") from e
+        try:
+            with db:
+                db.execute("DELETE FROM baseline")
+                n = db.execute(f"INSERT INTO baseline SELECT {_COLUMNS} FROM seen").rowcount
+                db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                           ("baseline", repr(time.time())))
+            return n
+        except sqlite3.Error as e:
+            raise OSError(f"Не удалось записать эталон FIM: {self.path}") from e
+        finally:
+            db.close()
+
+
+@dataclass(slots=True)
+class FimReport:
+    """
+    Сравнение контролируемых файлов с эталоном.
+
+    :param created: Эталона не было — он создан этим запуском.
+    :param saved: False — эталон или состояние не удалось записать.
+    :param modified: (путь, что изменилось: content/link/mode/owner).
+    """
+    files: int = 0
+    hashed: int = 0
+    created: bool = False
+    saved: bool = True
+    complete: bool = True
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[Tuple[str, List[str]]] = field(default_factory=list)
+
+
+def compare(
+    baseline: Iterable[FileState], current: Dict[str, FileState], report: FimReport
+) -> None:
+    """Сравнить эталон (строки по одной) с текущим состоянием."""
+    matched = set()
+    for old in baseline:
+        cur = current.get(old.path)
+        if cur is None:
+            report.removed.append(old.path)
+            continue
+        matched.add(old.path)
+        what = cur.changes(old)
+        if what:
+            report.modified.append((old.path, what))
+    report.added = sorted(current.keys() - matched)
+    report.removed.sort()
+    report.modified.sort()
+
+
+def check_baseline(store: FimStore, seen: Dict[str, FileState], result: FimScan) -> FimReport:
+    """
+    Записать снятое состояние и сравнить его с эталоном; если эталона ещё
+    нет, он создаётся из этого состояния. Прерванное сканирование не
+    записывается и не сравнивается.
+
+    :param seen: Содержимое таблицы seen до этого запуска: в неё
+                 дописываются только отличия от него.
+    """
+    report = FimReport(files=len(result.files), hashed=result.hashed, complete=result.complete)
+    if not result.complete:
+        return report
+    report.saved = store.update("seen", result.files, seen)
+    if not store.exists("baseline"):
+        report.created = True
+        report.saved = report.saved and store.save("baseline", result.files.values())
+        return report
+    compare(store.rows("baseline"), result.files, report)
+    return report
+
+
+def fim_paths(profile) -> List[str]:
+    paths = profile.fim_paths if profile is not None and profile.fim_paths else FIM_PATHS
+    return [p for p in paths if os.path.lexists(p)]
+
+
+def fim_store() -> FimStore:
+    return FimStore(state_dir() / STORE_NAME)
+
+
+@fact("fim", missing="Контролируемые FIM пути не найдены")
+def fim(ctx) -> Optional[FimReport]:
+    """
+    Встроенный контроль целостности: файлы под fim_paths (профиль) или
+    FIM_PATHS сравниваются с эталоном в каталоге состояния pylock. Первый
+    запуск создаёт эталон; изменения остаются в отчёте, пока их не примут
+    командой `pylock fim-update`. Хешируются только файлы, у которых
+    изменились размер, mtime, ctime или inode.
+    """
+    paths = fim_paths(ctx.profile)
+    if not paths:
+        return None
+    profile = ctx.profile
+    store = fim_store()
+    seen = store.load("seen")
+    result = scan(
+        paths, seen or store.load("baseline"),
+        workers=(profile.fs_workers if profile is not None else None) or default_walk_workers(),
+        cancelled=ctx.cancelled,
+    )
+    return check_baseline(store, seen, result)
+
+
+def suid_store() -> FimStore:
+    return FimStore(state_dir() / SUID_STORE_NAME)
+
+
+def _setid_entries(files: Iterable[Tuple[str, int, int]]) -> Iterator[WalkEntry]:
+    # Свежий lstat: владелец, размер и ключ хеша; бит мог быть снят после обхода
+    for path, _, _ in files:
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue
+        if st.st_mode & 0o6000 and stat.S_ISREG(st.st_mode):
+            yield WalkEntry(path, st)
+
+
+@fact("suid_inventory")
+def suid_inventory(ctx) -> FimReport:
+    """
+    Инвентарь SUID/SGID-файлов из общего обхода ФС (путь, владелец, режим,
+    размер, хеш) в сравнении с эталоном в каталоге состояния pylock.
+    Хешируются только новые и изменившиеся файлы; эталон обновляется
+    командой `pylock fim-update`.
+    """
+    scan_ = fs_scan(ctx)
+    profile = ctx.profile
+    store = suid_store()
+    seen = store.load("seen")
+    result = snapshot(
+        _setid_entries(scan_.results["setid_files"]), seen or store.load("baseline"),
+        workers=(profile.fs_workers if profile is not None else None) or default_walk_workers(),
+        cancelled=ctx.cancelled,
+    )
+    # Файлы за прерванным обходом выглядели бы удалёнными
+    result.complete = result.complete and scan_.stats.complete
+    return check_baseline(store, seen, result)
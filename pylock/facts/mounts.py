@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
+
+from .base import fact
+
+MOUNTINFO = "/proc/self/mountinfo"
+PROC_MOUNTS = "/proc/mounts"
+FSTAB = "/etc/fstab"
+
+# Псевдо-ФС ядра: содержимое генерируется на лету, обходить их бессмысленно
+PSEUDO_FSTYPES = frozenset({
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs",
+    "devpts", "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs",
+    "proc", "pstore", "rpc_pipefs", "securityfs", "selinuxfs", "sysfs", "tracefs",
+})
+# Сетевые ФС: обход идёт по сети и может зависнуть
+NETWORK_FSTYPES = frozenset({
+    "9p", "afs", "ceph", "cifs", "davfs", "fuse.glusterfs", "fuse.sshfs", "glusterfs",
+    "lustre", "ncpfs", "nfs", "nfs4", "smb3", "smbfs",
+})
+
+_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(value: str) -> str:
+    # Ядро экранирует пробел, табуляцию, перевод строки и \ как \ooo
+    return _ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), value)
+
+
+def _options(value: str) -> FrozenSet[str]:
+    return frozenset(o for o in value.split(",") if o)
+
+
+@dataclass(slots=True)
+class Mount:
+    """
+    Смонтированная ФС.
+
+    :param options: Опции точки монтирования и суперблока вместе (как в /proc/mounts).
+    """
+    mountpoint: str
+    fstype: str
+    source: str
+    options: FrozenSet[str] = frozenset()
+    root: str = "/"
+    mount_id: Optional[int] = None
+    parent_id: Optional[int] = None
+
+    @property
+    def pseudo(self) -> bool:
+        return self.fstype in PSEUDO_FSTYPES
+
+    @property
+    def network(self) -> bool:
+        return self.fstype in NETWORK_FSTYPES or self.fstype.startswith("nfs")
+
+
+@dataclass(slots=True)
+class FstabEntry:
+    source: str
+    mountpoint: str
+    fstype: str
+    options: FrozenSet[str] = frozenset()
+
+
+@dataclass(slots=True)
+class MountTable:
+    """
+    Таблица монтирования с индексами.
+
+    :param mounts: Все монтирования в порядке mountinfo.
+    :param by_mountpoint: Точка монтирования -> видимое (последнее) монтирование.
+    :param by_fstype: Тип ФС -> монтирования.
+    :param fstab: Записи /etc/fstab (пусто, если файл не прочитан).
+    :param fstab_readable: Удалось ли прочитать /etc/fstab.
+    """
+    mounts: List[Mount] = field(default_factory=list)
+    by_mountpoint: Dict[str, Mount] = field(default_factory=dict)
+    by_fstype: Dict[str, List[Mount]] = field(default_factory=dict)
+    fstab: List[FstabEntry] = field(default_factory=list)
+    fstab_by_mountpoint: Dict[str, FstabEntry] = field(default_factory=dict)
+    fstab_readable: bool = False
+
+    def add(self, mount: Mount) -> None:
+        self.mounts.append(mount)
+        # Более позднее монтирование в ту же точку перекрывает предыдущее
+        self.by_mountpoint[mount.mountpoint] = mount
+        self.by_fstype.setdefault(mount.fstype, []).append(mount)
+
+    def get(self, mountpoint: str) -> Optional[Mount]:
+        return self.by_mountpoint.get(mountpoint)
+
+    def mount_of(self, path: str) -> Optional[Mount]:
+        """Монтирование, которому принадлежит путь (ближайшая точка монтирования вверх)."""
+        path = os.path.normpath(path)
+        while True:
+            mount = self.by_mountpoint.get(path)
+            if mount is not None or path == "/":
+                return mount
+            path = os.path.dirname(path)
+
+    def prune(self, path: str) -> bool:
+        """Нужно ли обходу ФС пропустить каталог: точка монтирования псевдо- или сетевой ФС."""
+        mount = self.by_mountpoint.get(path)
+        return mount is not None and (mount.pseudo or mount.network)
+
+
+def parse_mountinfo(text: str, table: MountTable) -> None:
+    """Формат: id parent major:minor root mountpoint opts [optional...] - fstype source superopts"""
+    for line in text.splitlines():
+        left, sep, right = line.partition(" - ")
+        if not sep:
+            continue
+        lf, rf = left.split(), right.split()
+        if len(lf) < 6 or len(rf) < 2:
+            continue
+        table.add(Mount(
+            mountpoint=_unescape(lf[4]),
+            fstype=rf[0],
+            source=_unescape(rf[1]),
+            options=_options(lf[5]) | _options(rf[2] if len(rf) > 2 else ""),
+            root=_unescape(lf[3]),
+            mount_id=int(lf[0]),
+            parent_id=int(lf[1]),
+        ))
+
+
+def parse_mounts(text: str, table: MountTable) -> None:
+    """Формат /proc/mounts и /etc/fstab: source mountpoint fstype options ..."""
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 4 and not parts[0].startswith("#"):
+            table.add(Mount(
+                mountpoint=_unescape(parts[1]),
+                fstype=parts[2],
+                source=_unescape(parts[0]),
+                options=_options(parts[3]),
+            ))
+
+
+@fact("mounts", missing="Таблица монтирования (/proc/self/mountinfo) недоступна")
+def mounts(ctx) -> Optional[MountTable]:
+    """
+    Таблица монтирования из /proc/self/mountinfo (запасной вариант — /proc/mounts)
+    и /etc/fstab. None — текущие монтирования прочитать не удалось.
+    """
+    table = MountTable()
+    try:
+        parse_mountinfo(ctx.files.read_text(MOUNTINFO, errors="replace"), table)
+    except OSError:
+        try:
+            parse_mounts(ctx.files.read_text(PROC_MOUNTS, errors="replace"), table)
+        except OSError:
+            return None
+    try:
+        fstab = MountTable()
+        parse_mounts(ctx.files.read_text(FSTAB, errors="replace"), fstab)
+    except OSError:
+        return table
+    table.fstab_readable = True
+    for m in fstab.mounts:
+        entry = FstabEntry(m.source, m.mountpoint, m.fstype, m.options)
+        table.fstab.append(entry)
+        table.fstab_by_mountpoint.setdefault(entry.mountpoint, entry)
+    return table
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+import socket
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .base import fact
+
+SYS_CLASS_NET = "/sys/class/net"
+PROC_NET_ROUTE = "/proc/net/route"
+
+# Флаги из include/uapi/linux/if.h
+IFF_UP = 0x1
+IFF_LOOPBACK = 0x8
+IFF_PROMISC = 0x100
+# Тип из include/uapi/linux/if_arp.h
+ARPHRD_ETHER = 1
+ARPHRD_LOOPBACK = 772
+# Флаги маршрута из include/uapi/linux/route.h
+RTF_UP = 0x1
+RTF_GATEWAY = 0x2
+
+
+@dataclass(slots=True)
+class Interface:
+    """
+    Сетевой интерфейс из /sys/class/net/<name>.
+
+    :param flags: Флаги IFF_* (как в SIOCGIFFLAGS).
+    :param type: Тип ARPHRD_* (1 — Ethernet, 772 — loopback, ...).
+    :param master: Интерфейс, в который включён данный (мост, bond), или None.
+    :param brport: Есть каталог brport/ — интерфейс является портом моста.
+    """
+    name: str
+    flags: int = 0
+    type: Optional[int] = None
+    operstate: str = "unknown"
+    mtu: Optional[int] = None
+    address: str = ""
+    bridge: bool = False
+    master: Optional[str] = None
+    brport: bool = False
+
+    @property
+    def port(self) -> bool:
+        """Порт моста или bond: ядро само держит на нём IFF_PROMISC."""
+        return self.master is not None or self.brport
+
+    @property
+    def up(self) -> bool:
+        return bool(self.flags & IFF_UP)
+
+    @property
+    def promisc(self) -> bool:
+        return bool(self.flags & IFF_PROMISC)
+
+    @property
+    def loopback(self) -> bool:
+        return bool(self.flags & IFF_LOOPBACK) or self.type == ARPHRD_LOOPBACK
+
+
+@dataclass(slots=True)
+class Route:
+    """Маршрут IPv4 из /proc/net/route (адреса — в текстовом виде)."""
+    iface: str
+    destination: str
+    gateway: str
+    mask: str
+    flags: int = 0
+    metric: int = 0
+
+    @property
+    def default(self) -> bool:
+        return self.destination == "0.0.0.0" and self.mask == "0.0.0.0"
+
+
+@dataclass(slots=True)
+class NetworkInventory:
+    """
+    Интерфейсы и маршруты, снятые за один проход.
+
+    :param interfaces: Имя -> интерфейс (в порядке имён).
+    :param members: Имя моста/bond -> имена включённых интерфейсов.
+    :param routes: Маршруты основной таблицы IPv4 (None — /proc/net/route не прочитан).
+    """
+    interfaces: Dict[str, Interface] = field(default_factory=dict)
+    members: Dict[str, List[str]] = field(default_factory=dict)
+    routes: Optional[List[Route]] = None
+
+    def bridges(self) -> List[Interface]:
+        return [i for i in self.interfaces.values() if i.bridge]
+
+    def promiscuous(self) -> List[Interface]:
+        """
+        Интерфейсы в режиме promiscuous, кроме портов мостов и bond.
+        flags в /sys — это dev->flags ядра, где IFF_PROMISC выставлен на
+        каждом порту; ip link показывает запрошенные пользователем gflags.
+        """
+        return [i for i in self.interfaces.values() if i.promisc and not i.port]
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            return fh.read().strip()
+    except OSError:
+        return None
+
+
+def _int(value: Optional[str], base: int = 10) -> Optional[int]:
+    try:
+        return int(value, base) if value is not None else None
+    except ValueError:
+        return None
+
+
+def read_interface(root: str, name: str) -> Interface:
+    base = os.path.join(root, name)
+    iface = Interface(
+        name=name,
+        flags=_int(_read(os.path.join(base, "flags")), 16) or 0,
+        type=_int(_read(os.path.join(base, "type"))),
+        operstate=_read(os.path.join(base, "operstate")) or "unknown",
+        mtu=_int(_read(os.path.join(base, "mtu"))),
+        address=_read(os.path.join(base, "address")) or "",
+        bridge=os.path.isdir(os.path.join(base, "bridge")),
+        brport=os.path.isdir(os.path.join(base, "brport")),
+    )
+    try:
+        iface.master = os.path.basename(os.readlink(os.path.join(base, "master")))
+    except OSError:
+        pass
+    return iface
+
+
+def _ipv4(hexaddr: str) -> str:
+    # Адрес в /proc/net/route — 32-битное слово в порядке байт хоста
+    return socket.inet_ntop(socket.AF_INET, struct.pack("=I", int(hexaddr, 16)))
+
+
+def parse_routes(text: str) -> List[Route]:
+    """Формат: Iface Destination Gateway Flags RefCnt Use Metric Mask MTU Window IRTT"""
+    routes: List[Route] = []
+    for line in text.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 8:
+            continue
+        try:
+            routes.append(Route(
+                iface=parts[0],
+                destination=_ipv4(parts[1]),
+                gateway=_ipv4(parts[2]),
+                mask=_ipv4(parts[7]),
+                flags=int(parts[3], 16),
+                metric=int(parts[6]),
+            ))
+        except (ValueError, struct.error):
+            continue
+    return routes
+
+
+@fact("network", missing="Каталог /sys/class/net недоступен")
+def network(ctx) -> Optional[NetworkInventory]:
+    """
+    Интерфейсы из /sys/class/net и маршруты из /proc/net/route (без вызова ip).
+    None — /sys/class/net не прочитан.
+    """
+    try:
+        names = sorted(os.listdir(SYS_CLASS_NET))
+    except OSError:
+        return None
+    inv = NetworkInventory()
+    for name in names:
+        iface = read_interface(SYS_CLASS_NET, name)
+        inv.interfaces[name] = iface
+        if iface.master:
+            inv.members.setdefault(iface.master, []).append(name)
+    text = _read(PROC_NET_ROUTE)
+    if text is not None:
+        inv.routes = parse_routes(text)
+    return inv
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import shutil
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ..utils.cmd import run_cmd
+from .base import Transient, fact, path_stamp
+
+DPKG_STATUS = "/var/lib/dpkg/status"
+RPM_DB_DIRS = ("/var/lib/rpm", "/usr/lib/sysimage/rpm")
+# Эпоха выводится только если задана: [E:]V-R
+RPM_QUERYFORMAT = "%{NAME}\\t%|EPOCH?{%{EPOCH}:}:{}|%{VERSION}-%{RELEASE}\\t%{ARCH}\\n"
+
+
+@dataclass(slots=True)
+class Package:
+    name: str
+    version: str
+    arch: str = ""
+
+
+@dataclass(slots=True)
+class PackageInventory:
+    """
+    Установленные пакеты с индексом по имени.
+
+    :param manager: "dpkg" или "rpm" — источник списка.
+    :param packages: Пакеты в порядке базы.
+    :param by_name: Имя -> пакеты (несколько при multiarch / multilib).
+    """
+    manager: str
+    packages: List[Package] = field(default_factory=list)
+    by_name: Dict[str, List[Package]] = field(default_factory=dict)
+
+    def add(self, pkg: Package) -> None:
+        self.packages.append(pkg)
+        self.by_name.setdefault(pkg.name, []).append(pkg)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.by_name
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def versions(self, name: str) -> List[str]:
+        return [p.version for p in self.by_name.get(name, [])]
+
+
+def parse_dpkg_status(text: str, inv: PackageInventory) -> None:
+    """
+    Разобрать /var/lib/dpkg/status: строфы через пустую строку, учитываются
+    только пакеты в состоянии installed ("rc" — удалён, остались конфиги).
+    """
+    for stanza in text.split("\n\n"):
+        name = version = arch = status = ""
+        for line in stanza.splitlines():
+            if line.startswith("Package: "):
+                name = line[9:].strip()
+            elif line.startswith("Status: "):
+                status = line[8:]
+            elif line.startswith("Version: "):
+                version = line[9:].strip()
+            elif line.startswith("Architecture: "):
+                arch = line[14:].strip()
+        # Status: <желаемое> <флаг ошибки> <состояние>
+        if name and status.split()[-1:] == ["installed"]:
+            inv.add(Package(name, version, arch))
+
+
+def parse_rpm_list(text: str, inv: PackageInventory) -> None:
+    """Разобрать вывод rpm -qa с RPM_QUERYFORMAT: имя, версия и архитектура через табуляцию."""
+    for line in text.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 3 and parts[0]:
+            arch = parts[2] if parts[2] != "(none)" else ""
+            inv.add(Package(parts[0], parts[1], arch))
+
+
+def _package_db_stamp(ctx) -> tuple:
+    # База меняется только при установке/удалении пакетов
+    return path_stamp(DPKG_STATUS, *RPM_DB_DIRS)
+
+
+@fact("installed_packages", missing="Пакетная база dpkg/rpm недоступна", stamp=_package_db_stamp)
+def installed_packages(ctx) -> Optional[PackageInventory] | Transient:
+    """
+    Установленные пакеты: /var/lib/dpkg/status читается напрямую, для rpm —
+    один вызов rpm -qa. Значение переживает циклы агента, пока база не
+    изменилась. None — нет ни базы dpkg, ни rpm (или rpm -qa не отработал:
+    тогда следующий аудит повторит запрос).
+    """
+    try:
+        with open(DPKG_STATUS, "r", encoding="utf-8", errors="replace") as fh:
+            text = fh.read()
+    except OSError:
+        text = ""
+    if text.strip():
+        inv = PackageInventory(manager="dpkg")
+        parse_dpkg_status(text, inv)
+        return inv
+    rpm = shutil.which("rpm")
+    if rpm and any(os.path.isdir(d) for d in RPM_DB_DIRS):
+        proc = run_cmd([rpm, "-qa", "--queryformat", RPM_QUERYFORMAT], check=False, timeout=60)
+        if proc.returncode != 0:
+            return Transient(None)
+        inv = PackageInventory(manager="rpm")
+        parse_rpm_list(proc.stdout, inv)
+        return inv
+    return None
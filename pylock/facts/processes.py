@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .base import fact
+
+PROC = "/proc"
+# Ядро усекает comm до 15 символов (TASK_COMM_LEN - 1)
+COMM_LEN = 15
+
+try:
+    CLK_TCK = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    CLK_TCK = 100
+
+
+@dataclass(slots=True)
+class ProcessTable:
+    """
+    Снимок таблицы процессов в колоночном виде: i-й элемент каждого
+    списка относится к одному процессу.
+
+    :param cmdline: Аргументы через пробел (пусто у потоков ядра и зомби).
+    :param exe: Путь к исполняемому файлу (None — нет прав или поток ядра).
+    :param name: Имя программы: basename exe, иначе argv[0] (None — ни того, ни другого).
+    :param uid: Эффективный UID (None — строка Uid в status не прочитана).
+    :param cpu_ticks: utime + stime в тиках (CLK_TCK).
+    :param start_ticks: Момент запуска в тиках от загрузки.
+    :param uptime: Время от загрузки на момент снимка, секунды.
+    :param by_comm: comm -> индексы строк.
+    :param by_name: Имя программы -> индексы строк.
+    :param by_uid: UID -> индексы строк.
+    """
+    pid: List[int] = field(default_factory=list)
+    ppid: List[int] = field(default_factory=list)
+    uid: List[Optional[int]] = field(default_factory=list)
+    state: List[str] = field(default_factory=list)
+    comm: List[str] = field(default_factory=list)
+    exe: List[Optional[str]] = field(default_factory=list)
+    cmdline: List[str] = field(default_factory=list)
+    name: List[Optional[str]] = field(default_factory=list)
+    cpu_ticks: List[int] = field(default_factory=list)
+    start_ticks: List[int] = field(default_factory=list)
+    uptime: float = 0.0
+    by_comm: Dict[str, List[int]] = field(default_factory=dict)
+    by_name: Dict[str, List[int]] = field(default_factory=dict)
+    by_uid: Dict[int, List[int]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def add(self, pid: int, ppid: int, uid: Optional[int], state: str, comm: str,
+            exe: Optional[str], cmdline: str, cpu_ticks: int, start_ticks: int) -> None:
+        i = len(self.pid)
+        self.pid.append(pid)
+        self.ppid.append(ppid)
+        self.uid.append(uid)
+        self.state.append(state)
+        self.comm.append(comm)
+        self.exe.append(exe)
+        self.cmdline.append(cmdline)
+        name = _program_name(exe, cmdline)
+        self.name.append(name)
+        self.cpu_ticks.append(cpu_ticks)
+        self.start_ticks.append(start_ticks)
+        self.by_comm.setdefault(comm, []).append(i)
+        if name is not None:
+            self.by_name.setdefault(name, []).append(i)
+        if uid is not None:
+            self.by_uid.setdefault(uid, []).append(i)
+
+    def find(self, name: str) -> List[int]:
+        """
+        PID процессов программы name, как у pidof: совпадение по comm
+        (с учётом усечения) или по имени исполняемого файла / argv[0].
+        """
+        rows = set(self.by_comm.get(name[:COMM_LEN], ()))
+        if len(name) >= COMM_LEN:
+            # comm мог быть усечён от другого имени — уточняем по exe / argv[0]
+            rows = {i for i in rows if self.name[i] in (name, None)}
+        rows.update(self.by_name.get(name, ()))
+        return sorted(self.pid[i] for i in rows)
+
+    def running(self, name: str) -> bool:
+        return bool(self.find(name))
+
+    def cpu_percent(self, i: int) -> float:
+        """Средняя загрузка CPU за время жизни процесса, как %cpu у ps."""
+        elapsed = self.uptime - self.start_ticks[i] / CLK_TCK
+        if elapsed <= 0:
+            return 0.0
+        return self.cpu_ticks[i] / CLK_TCK / elapsed * 100.0
+
+
+def _program_name(exe: Optional[str], cmdline: str) -> Optional[str]:
+    if exe:
+        return os.path.basename(exe.removesuffix(" (deleted)"))
+    argv0 = cmdline.split(" ", 1)[0]
+    return os.path.basename(argv0) if argv0 else None
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def _status_uid(text: str) -> Optional[int]:
+    for line in text.splitlines():
+        if line.startswith("Uid:"):
+            parts = line.split()
+            # Uid: реальный эффективный сохранённый ФС — ps -o uid показывает эффективный
+            return int(parts[2]) if len(parts) > 2 else None
+    return None
+
+
+def scan_processes(root: Optional[str] = None) -> ProcessTable:
+    """
+    Один проход по /proc/[pid]. Процессы, завершившиеся во время обхода,
+    пропускаются.
+
+    :raises OSError: Каталог /proc не удалось прочитать.
+    """
+    root = root or PROC
+    table = ProcessTable()
+    try:
+        table.uptime = float(_read(os.path.join(root, "uptime")).split()[0])
+    except (OSError, IndexError, ValueError):
+        pass
+    with os.scandir(root) as it:
+        pids = sorted(int(e.name) for e in it if e.name.isdigit())
+    for pid in pids:
+        base = os.path.join(root, str(pid))
+        try:
+            stat = _read(os.path.join(base, "stat")).decode("utf-8", "replace")
+            status = _read(os.path.join(base, "status")).decode("utf-8", "replace")
+            raw_cmdline = _read(os.path.join(base, "cmdline"))
+        except OSError:
+            continue
+        # comm в скобках может содержать пробелы и скобки — ищем последнюю ")"
+        head, _, tail = stat.rpartition(")")
+        comm = head.partition("(")[2]
+        rest = tail.split()
+        if len(rest) < 20:
+            continue
+        try:
+            ppid = int(rest[1])
+            cpu_ticks = int(rest[11]) + int(rest[12])
+            start_ticks = int(rest[19])
+            uid = _status_uid(status)
+        except ValueError:
+            continue
+        try:
+            exe: Optional[str] = os.readlink(os.path.join(base, "exe"))
+        except OSError:
+            exe = None
+        cmdline = raw_cmdline.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+        table.add(pid, ppid, uid, rest[0], comm, exe, cmdline, cpu_ticks, start_ticks)
+    return table
+
+
+@fact("processes", missing="Таблица процессов (/proc) недоступна")
+def processes(ctx) -> Optional[ProcessTable]:
+    """
+    Снимок процессов, снимается один раз за аудит (без вызова ps/pidof),
+    поэтому все проверки видят одно и то же состояние системы.
+    None — /proc не смонтирован или недоступен.
+    """
+    try:
+        return scan_processes()
+    except OSError:
+        return None
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import socket
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .base import fact
+
+PROC = "/proc"
+PROC_NET = "/proc/net"
+# Файл /proc/net -> (протокол, семейство)
+SOCKET_FILES = (
+    ("tcp", "tcp", socket.AF_INET),
+    ("tcp6", "tcp", socket.AF_INET6),
+    ("udp", "udp", socket.AF_INET),
+    ("udp6", "udp", socket.AF_INET6),
+)
+# Состояния из include/net/tcp_states.h: TCP_LISTEN; для UDP несвязанный сокет — TCP_CLOSE
+TCP_LISTEN = 0x0A
+TCP_CLOSE = 0x07
+
+WILDCARD_ADDRESSES = frozenset({"0.0.0.0", "::"})
+
+
+@dataclass(slots=True)
+class ListeningSocket:
+    """
+    Слушающий TCP или связанный (UNCONN) UDP сокет.
+
+    :param address: Адрес привязки в текстовом виде ("0.0.0.0", "::1", ...).
+    :param inode: Inode сокета — по нему сокет связывается с процессом.
+    """
+    proto: str
+    family: int
+    address: str
+    port: int
+    uid: int
+    inode: int
+
+    @property
+    def wildcard(self) -> bool:
+        """Привязан ко всем интерфейсам."""
+        return self.address in WILDCARD_ADDRESSES
+
+    @property
+    def loopback(self) -> bool:
+        return self.address == "::1" or self.address.startswith("127.")
+
+    def endpoint(self) -> str:
+        host = f"[{self.address}]" if self.family == socket.AF_INET6 else self.address
+        return f"{host}:{self.port}/{self.proto}"
+
+
+@dataclass(slots=True)
+class SocketTable:
+    """
+    Таблица слушающих сокетов.
+
+    :param sockets: Сокеты в порядке файлов tcp, tcp6, udp, udp6.
+    :param by_port: (протокол, порт) -> сокеты.
+    :param sources: Прочитанные файлы /proc/net.
+    """
+    sockets: List[ListeningSocket] = field(default_factory=list)
+    by_port: Dict[Tuple[str, int], List[ListeningSocket]] = field(default_factory=dict)
+    sources: List[str] = field(default_factory=list)
+
+    def add(self, sock: ListeningSocket) -> None:
+        self.sockets.append(sock)
+        self.by_port.setdefault((sock.proto, sock.port), []).append(sock)
+
+    def listening(self, proto: Optional[str] = None) -> List[ListeningSocket]:
+        return [s for s in self.sockets if proto is None or s.proto == proto]
+
+
+def _address(hexaddr: str, family: int) -> str:
+    # Ядро печатает адрес 32-битными словами в порядке байт хоста
+    words = [int(hexaddr[i:i + 8], 16) for i in range(0, len(hexaddr), 8)]
+    return socket.inet_ntop(family, b"".join(struct.pack("=I", w) for w in words))
+
+
+def parse_proc_net(text: str, proto: str, family: int, table: SocketTable) -> None:
+    """
+    Формат /proc/net/{tcp,udp}[6]:
+    sl local_address rem_address st tx:rx tr:when retrnsmt uid timeout inode ...
+    """
+    want = TCP_LISTEN if proto == "tcp" else TCP_CLOSE
+    for line in text.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 10:
+            continue
+        try:
+            if int(parts[3], 16) != want:
+                continue
+            addr, _, port = parts[1].partition(":")
+            table.add(ListeningSocket(
+                proto=proto,
+                family=family,
+                address=_address(addr, family),
+                port=int(port, 16),
+                uid=int(parts[7]),
+                inode=int(parts[9]),
+            ))
+        except (ValueError, OSError, struct.error):
+            continue
+
+
+@fact("sockets", missing="Таблицы сокетов /proc/net недоступны")
+def sockets(ctx) -> Optional[SocketTable]:
+    """
+    Слушающие сокеты из /proc/net/{tcp,tcp6,udp,udp6} (без вызова ss/netstat).
+    None — ни один файл не прочитан (нет /proc или сетевого стека).
+    """
+    table = SocketTable()
+    for name, proto, family in SOCKET_FILES:
+        path = os.path.join(PROC_NET, name)
+        try:
+            with open(path, "r", encoding="ascii", errors="replace") as fh:
+                text = fh.read()
+        except OSError:
+            continue
+        table.sources.append(path)
+        parse_proc_net(text, proto, family, table)
+    return table if table.sources else None
+
+
+def scan_socket_owners(root: Optional[str] = None) -> Dict[int, List[int]]:
+    """
+    Inode сокета -> PID владельцев: один проход по ссылкам /proc/*/fd.
+    Процессы, чьи fd недоступны (чужие без root) или завершились, пропускаются.
+    """
+    root = root or PROC
+    owners: Dict[int, List[int]] = {}
+    try:
+        with os.scandir(root) as it:
+            pids = sorted(int(e.name) for e in it if e.name.isdigit())
+    except OSError:
+        return owners
+    for pid in pids:
+        fd_dir = os.path.join(root, str(pid), "fd")
+        try:
+            with os.scandir(fd_dir) as it:
+                links = [e.path for e in it]
+        except OSError:
+            continue
+        for link in links:
+            try:
+                target = os.readlink(link)
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                inode = int(target[8:-1])
+                pids_of = owners.setdefault(inode, [])
+                if not pids_of or pids_of[-1] != pid:
+                    pids_of.append(pid)
+    return owners
+
+
+@fact("socket_owners")
+def socket_owners(ctx) -> Dict[int, List[int]]:
+    """Владельцы сокетов (inode -> PID); строится только по запросу проверок."""
+    return scan_socket_owners()
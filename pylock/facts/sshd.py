@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import glob
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.cmd import run_cmd, run_cmds
+from .base import Transient, fact, path_stamp
+
+SSHD_CONFIG = "/etc/ssh/sshd_config"
+SSH_DIR = "/etc/ssh"
+
+# Ключевые слова, которые накапливаются, а не подчиняются правилу «первое значение»
+SSHD_MULTI = frozenset({
+    "acceptenv", "allowgroups", "allowusers", "denygroups", "denyusers",
+    "hostcertificate", "hostkey", "listenaddress", "port", "subsystem",
+})
+# Значения по умолчанию OpenSSH для параметров, которые оценивают проверки
+SSHD_DEFAULTS: Dict[str, str] = {
+    "clientaliveinterval": "0",
+    "passwordauthentication": "yes",
+    "permitrootlogin": "prohibit-password",
+    "strictmodes": "yes",
+    "x11forwarding": "no",
+}
+_MAX_INCLUDE_DEPTH = 16
+_LINE = re.compile(r"^([A-Za-z][A-Za-z0-9]*)(?:\s*=\s*|\s+)(.*)$")
+
+
+@dataclass(slots=True)
+class SshdMatch:
+    """Блок Match: условие и параметры, заданные внутри него."""
+    criteria: str
+    options: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SshdConfig:
+    """
+    Эффективная конфигурация sshd.
+
+    :param options: Глобальные параметры: ключевое слово (в нижнем регистре) -> значения.
+                    Для обычных параметров действует первое значение, для SSHD_MULTI — все.
+    :param matches: Блоки Match в порядке следования.
+    :param files: Прочитанные файлы (основной и подключённые через Include).
+    :param source: "sshd -T" — значения взяты у самого sshd, "file" — из разбора файлов.
+    """
+    options: Dict[str, List[str]] = field(default_factory=dict)
+    matches: List[SshdMatch] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    source: str = "file"
+
+    def explicit(self, key: str) -> bool:
+        """Задан ли параметр явно (или выведен sshd -T)."""
+        return key.lower() in self.options
+
+    def get(self, key: str) -> Optional[str]:
+        """Эффективное значение параметра (с учётом значений OpenSSH по умолчанию)."""
+        key = key.lower()
+        values = self.options.get(key)
+        if values:
+            return values[0]
+        return SSHD_DEFAULTS.get(key)
+
+    def get_all(self, key: str) -> List[str]:
+        return list(self.options.get(key.lower(), []))
+
+    def overrides(self, key: str) -> List[Tuple[str, str]]:
+        """Переопределения параметра в блоках Match: [(условие, значение)]."""
+        key = key.lower()
+        return [(m.criteria, m.options[key][0]) for m in self.matches if m.options.get(key)]
+
+    def _algorithm_values(self, key: str) -> List[str]:
+        return [v for v in [self.get(key)] if v] + [v for _, v in self.overrides(key)]
+
+    def algorithms(self, key: str) -> List[str]:
+        """
+        Алгоритмы (Ciphers, MACs, KexAlgorithms, ...), которые глобальное
+        значение и блоки Match явно включают. Модификатор относится ко всему
+        списку: "-" исключает перечисленные алгоритмы из встроенного набора
+        OpenSSH и ничего не включает, "+" и "^" добавляют их к встроенному
+        набору (см. extends_defaults).
+        """
+        out: List[str] = []
+        for value in self._algorithm_values(key):
+            if value.startswith("-"):
+                continue
+            out.extend(a.strip().lower() for a in value.lstrip("+^").split(",") if a.strip())
+        return out
+
+    def extends_defaults(self, key: str) -> bool:
+        """Изменяет ли список алгоритмов встроенный набор OpenSSH (+, -, ^), а не заменяет его."""
+        return any(v[:1] in ("+", "-", "^") for v in self._algorithm_values(key))
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def _put(options: Dict[str, List[str]], key: str, value: str) -> None:
+    if key in SSHD_MULTI:
+        options.setdefault(key, []).append(value)
+    elif key not in options:
+        # sshd: для большинства параметров действует первое значение
+        options[key] = [value]
+
+
+def parse_sshd_config(ctx, path: Optional[str] = None) -> SshdConfig:
+    """
+    Разобрать sshd_config с подключаемыми файлами.
+
+    Include разворачивается на месте (шаблоны — в лексикографическом порядке,
+    относительные пути — от /etc/ssh), как это делает sshd. Параметры после
+    Match относятся к блоку до следующего Match или до конца файла, в котором
+    блок начат. Файлы читаются через ctx.files.
+
+    :raises OSError: Основной файл не удалось прочитать.
+    """
+    cfg = SshdConfig()
+    path = path or SSHD_CONFIG
+
+    def parse(fpath: str, depth: int, block: Optional[SshdMatch]) -> None:
+        text = ctx.files.read_text(fpath, errors="ignore")
+        cfg.files.append(fpath)
+        current = block
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            m = _LINE.match(line)
+            if not m:
+                continue
+            key, value = m.group(1).lower(), _unquote(m.group(2))
+            if key == "match":
+                current = SshdMatch(criteria=value)
+                cfg.matches.append(current)
+            elif key == "include":
+                if depth >= _MAX_INCLUDE_DEPTH:
+                    continue
+                for pattern in value.split():
+                    if not os.path.isabs(pattern):
+                        pattern = os.path.join(SSH_DIR, pattern)
+                    for inc in sorted(glob.glob(pattern)):
+                        try:
+                            parse(inc, depth + 1, current)
+                        except OSError:
+                            continue
+            else:
+                _put(current.options if current is not None else cfg.options, key, value)
+
+    parse(path, 0, None)
+    return cfg
+
+
+def _sshd_effective(path: str) -> Optional[Dict[str, List[str]]]:
+    """Глобальные параметры от самого sshd (sshd -T); None, если недоступно (нет sshd, не root)."""
+    sshd = shutil.which("sshd") or next(
+        (p for p in ("/usr/sbin/sshd", "/usr/local/sbin/sshd") if os.path.exists(p)), None
+    )
+    if not sshd:
+        return None
+    proc = run_cmd([sshd, "-T", "-f", path], check=False, timeout=10)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        return None
+    options: Dict[str, List[str]] = {}
+    for line in proc.stdout.splitlines():
+        key, _, value = line.strip().partition(" ")
+        if key:
+            # sshd -T выводит уже эффективные значения — накапливаем все строки
+            options.setdefault(key.lower(), []).append(value.strip())
+    return options
+
+
+@fact("sshd_config", missing="Файл sshd_config отсутствует")
+def sshd_config_present(ctx) -> bool:
+    """Есть ли основной конфиг sshd"""
+    return Path(SSHD_CONFIG).exists()
+
+
+@fact("sshd_model", missing="Не удалось разобрать конфигурацию sshd")
+def sshd_model(ctx) -> Optional[SshdConfig]:
+    """
+    Эффективная конфигурация sshd, строится один раз за аудит.
+    Глобальные значения берутся из sshd -T, если он отработал, иначе из разбора
+    файлов; блоки Match — всегда из разбора. None — основной файл не прочитан.
+    """
+    try:
+        cfg = parse_sshd_config(ctx, SSHD_CONFIG)
+    except OSError:
+        return None
+    effective = _sshd_effective(SSHD_CONFIG)
+    if effective is not None:
+        cfg.options = effective
+        cfg.source = "sshd -T"
+    return cfg
+
+
+def _host_keys_stamp(ctx) -> tuple:
+    # Ключи хоста меняются только при перегенерации — достаточно mtime каталога и файлов
+    return path_stamp(SSH_DIR)
+
+
+@fact("ssh_host_key_bits", stamp=_host_keys_stamp)
+def ssh_host_key_bits(ctx) -> Dict[str, Optional[int]] | Transient:
+    """
+    Длина публичных ключей хоста: имя файла -> бит (None, если ssh-keygen не разобрал).
+    Если ssh-keygen не запустился или не уложился в лимит, результат не
+    переживает аудит.
+    """
+    keyfiles = sorted(Path(SSH_DIR).glob("ssh_host_*_key.pub"))
+    procs = run_cmds([["ssh-keygen", "-lf", str(k)] for k in keyfiles])
+    out: Dict[str, Optional[int]] = {}
+    failed = False
+    for keyfile, proc in zip(keyfiles, procs):
+        bits = None
+        if proc.returncode == 0:
+            try:
+                bits = int(proc.stdout.split()[0])
+            except (IndexError, ValueError):
+                pass
+        elif proc.returncode in (124, 127):
+            failed = True
+        out[keyfile.name] = bits
+    return Transient(out) if failed else out
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .base import fact
+
+SYSCTL_ROOT = "/proc/sys"
+SYSCTL_CONF = "/etc/sysctl.conf"
+# Каталоги sysctl.d в порядке приоритета (sysctl.d(5)): файл с тем же
+# именем из более раннего каталога перекрывает остальные
+SYSCTL_DIRS = (
+    "/etc/sysctl.d",
+    "/run/sysctl.d",
+    "/usr/local/lib/sysctl.d",
+    "/usr/lib/sysctl.d",
+    "/lib/sysctl.d",
+)
+
+# Ключи, которые читаются одним проходом; пополняется таблицами правил при импорте
+_TRACKED: Set[str] = set()
+
+
+def track(*keys: str) -> None:
+    """Добавить ключи в общий пакетный проход факта sysctl."""
+    _TRACKED.update(normalize_key(k) for k in keys)
+
+
+def normalize_key(key: str) -> str:
+    """Ключ в точечной записи: sysctl допускает и "/" как разделитель."""
+    key = key.strip()
+    if "/" in key and (key.index("/") < key.index(".") if "." in key else True):
+        # net/ipv4/conf/eth0.1/rp_filter: "/" — разделитель, "." — часть имени
+        return ".".join(part.replace(".", "/") for part in key.split("/"))
+    return key
+
+
+def key_path(key: str, root: Optional[str] = None) -> str:
+    """Путь к ключу в /proc/sys ("/" внутри имени записывается как ".")."""
+    parts = [p.replace("/", ".") for p in normalize_key(key).split(".")]
+    return os.path.join(root or SYSCTL_ROOT, *parts)
+
+
+def _value(raw: str) -> str:
+    # Многозначные параметры (например, ip_local_port_range) — через один пробел
+    return " ".join(raw.split())
+
+
+def read_keys(keys: Iterable[str], root: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Текущие значения ключей; None — ключ отсутствует или недоступен."""
+    out: Dict[str, Optional[str]] = {}
+    for key in keys:
+        try:
+            with open(key_path(key, root), "r", encoding="utf-8", errors="replace") as fh:
+                out[key] = _value(fh.read())
+        except OSError:
+            out[key] = None
+    return out
+
+
+def config_files() -> List[str]:
+    """
+    Файлы постоянных настроек в порядке применения: *.conf из SYSCTL_DIRS
+    по имени файла (с учётом перекрытия), затем /etc/sysctl.conf.
+    """
+    chosen: Dict[str, str] = {}
+    for directory in SYSCTL_DIRS:
+        try:
+            with os.scandir(directory) as it:
+                names = [e.name for e in it if e.name.endswith(".conf")]
+        except OSError:
+            continue
+        for name in names:
+            chosen.setdefault(name, os.path.join(directory, name))
+    files = [chosen[name] for name in sorted(chosen)]
+    if os.path.exists(SYSCTL_CONF) and SYSCTL_CONF not in files:
+        files.append(SYSCTL_CONF)
+    return files
+
+
+def parse_sysctl_conf(text: str) -> List[Tuple[str, str]]:
+    """Пары (ключ, значение) из файла формата sysctl.conf."""
+    out: List[Tuple[str, str]] = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        # "-key = value": ошибку применения игнорировать; на значение не влияет
+        out.append((normalize_key(key.lstrip("-")), _value(value)))
+    return out
+
+
+@dataclass(slots=True)
+class SysctlState:
+    """
+    Текущие и постоянные значения sysctl.
+
+    :param runtime: Ключ -> значение из /proc/sys (None — ключ недоступен).
+    :param persistent: Ключ -> значение, которое будет применено при загрузке.
+    :param origin: Ключ -> файл, задавший постоянное значение.
+    :param files: Прочитанные файлы конфигурации в порядке применения.
+    """
+    runtime: Dict[str, Optional[str]] = field(default_factory=dict)
+    persistent: Dict[str, str] = field(default_factory=dict)
+    origin: Dict[str, str] = field(default_factory=dict)
+    files: List[str] = field(default_factory=list)
+    root: str = SYSCTL_ROOT
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Текущее значение; ключи вне пакетного прохода дочитываются по требованию."""
+        key = normalize_key(key)
+        if key not in self.runtime:
+            with self._lock:
+                if key not in self.runtime:
+                    self.runtime.update(read_keys([key], self.root))
+        return self.runtime[key]
+
+
+@fact("sysctl", missing="Каталог /proc/sys недоступен")
+def sysctl(ctx) -> Optional[SysctlState]:
+    """
+    Значения sysctl за один проход: все ключи из таблиц правил читаются
+    из /proc/sys по одному разу, постоянные значения собираются из
+    sysctl.d и /etc/sysctl.conf (через ctx.files) с учётом порядка применения.
+    None — /proc/sys не смонтирован.
+    """
+    if not os.path.isdir(SYSCTL_ROOT):
+        return None
+    state = SysctlState(runtime=read_keys(sorted(_TRACKED)), root=SYSCTL_ROOT)
+    for path in config_files():
+        try:
+            text = ctx.files.read_text(path, errors="replace")
+        except OSError:
+            continue
+        state.files.append(path)
+        for key, value in parse_sysctl_conf(text):
+            state.persistent[key] = value
+            state.origin[key] = path
+    return state
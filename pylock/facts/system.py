@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..utils.cmd import run_cmd
+from .base import fact
+
+# Признак системы под управлением systemd (как sd_booted())
+SYSTEMD_RUNTIME = "/run/systemd/system"
+# Ссылки invocation:<unit> существуют, пока юнит запущен
+SYSTEMD_UNITS_DIR = "/run/systemd/units"
+UNIT_PROPERTIES = ("Id", "LoadState", "ActiveState", "SubState", "UnitFileState")
+
+# Юниты, состояние которых запрашивается одним вызовом; пополняется модулями проверок
+_TRACKED: Set[str] = set()
+
+
+def unit_name(name: str) -> str:
+    """Имя юнита с суффиксом: без него systemctl подразумевает .service."""
+    return name if "." in name else name + ".service"
+
+
+def track_units(*names: str) -> None:
+    """Добавить юниты в общий пакетный запрос факта units."""
+    _TRACKED.update(unit_name(n) for n in names)
+
+
+@fact("systemctl", missing="systemctl недоступен")
+def systemctl_path(ctx) -> str | None:
+    """Путь к systemctl (None, если systemd не используется)"""
+    return shutil.which("systemctl")
+
+
+@dataclass(slots=True)
+class UnitState:
+    """Свойства юнита из systemctl show (пустая строка — свойство не выведено)."""
+    name: str
+    load_state: str = ""
+    active_state: str = ""
+    sub_state: str = ""
+    unit_file_state: str = ""
+
+    @property
+    def active(self) -> bool:
+        return self.active_state == "active"
+
+    @property
+    def loaded(self) -> bool:
+        return self.load_state not in ("", "not-found")
+
+
+def parse_show(text: str, names: List[str]) -> Dict[str, UnitState]:
+    """
+    Разобрать вывод systemctl show для нескольких юнитов: блоки свойств
+    разделены пустой строкой и идут в порядке аргументов.
+    """
+    out: Dict[str, UnitState] = {}
+    for name, block in zip(names, text.strip("\n").split("\n\n")):
+        props = dict(line.partition("=")[::2] for line in block.splitlines() if "=" in line)
+        out[name] = UnitState(
+            name=name,
+            load_state=props.get("LoadState", ""),
+            active_state=props.get("ActiveState", ""),
+            sub_state=props.get("SubState", ""),
+            unit_file_state=props.get("UnitFileState", ""),
+        )
+    return out
+
+
+@dataclass(slots=True)
+class UnitStates:
+    """
+    Состояния юнитов systemd за аудит.
+
+    Все отслеживаемые юниты запрашиваются одним вызовом systemctl show;
+    остальные дозапрашиваются при первом обращении и тоже кэшируются.
+    Если systemctl не отвечает (нет D-Bus, контейнер), активность
+    определяется по ссылкам /run/systemd/units/invocation:<unit>.
+
+    :param source: "systemctl" или "run" — откуда взяты состояния.
+    """
+    systemctl: Optional[str] = None
+    source: str = "systemctl"
+    units: Dict[str, UnitState] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def fetch(self, names: Iterable[str]) -> None:
+        """Запросить состояния юнитов, которых ещё нет в кэше."""
+        with self._lock:
+            missing = sorted({unit_name(n) for n in names} - self.units.keys())
+            if not missing:
+                return
+            if self.source == "systemctl" and self.systemctl:
+                proc = run_cmd(
+                    [self.systemctl, "show", "--no-pager",
+                     "--property=" + ",".join(UNIT_PROPERTIES), *missing],
+                    check=False,
+                )
+                ok = proc.returncode == 0 and proc.stdout.strip()
+                parsed = parse_show(proc.stdout, missing) if ok else {}
+                if len(parsed) == len(missing):
+                    self.units.update(parsed)
+                    return
+                self.source = "run"
+            for name in missing:
+                running = os.path.lexists(os.path.join(SYSTEMD_UNITS_DIR, "invocation:" + name))
+                self.units[name] = UnitState(name, active_state="active" if running else "inactive")
+
+    def get(self, name: str) -> UnitState:
+        name = unit_name(name)
+        if name not in self.units:
+            self.fetch([name])
+        return self.units[name]
+
+    def active(self, name: str) -> bool:
+        return self.get(name).active
+
+
+@fact("units", missing="systemd не используется")
+def units(ctx) -> Optional[UnitStates]:
+    """
+    Состояния юнитов systemd: один вызов systemctl show на все юниты,
+    которые объявили модули проверок. None — система не под systemd.
+    """
+    if not os.path.isdir(SYSTEMD_RUNTIME):
+        return None
+    states = UnitStates(systemctl=shutil.which("systemctl"))
+    if not states.systemctl:
+        states.source = "run"
+    states.fetch(_TRACKED)
+    return states
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:  # пакет импортирует CLI — держим его лёгким
+    from ..core.reporters import Reporter
+
+# Формат вывода -> "модуль:класс"; модуль импортируется только при выборе формата
+REPORTERS: Dict[str, str] = {
+    "console": "pylock.reporters.console:ConsoleReporter",
+    "txt": "pylock.reporters.txt:TXTReporter",
+    "json": "pylock.reporters.json:JSONReporter",
+}
+
+
+def get_reporter(fmt: str) -> Reporter:
+    """
+    Создать репортёр для формата вывода.
+
+    :param fmt: Имя формата (ключ REPORTERS).
+    :raises ValueError: Неизвестный формат.
+    """
+    try:
+        target = REPORTERS[fmt]
+    except KeyError:
+        raise ValueError(f"Неизвестный формат отчёта: {fmt}") from None
+    module, _, cls = target.partition(":")
+    return getattr(importlib.import_module(module), cls)()
@@ -2,12 +2,11 @@ from __future__ import annotations
 
 import json
 import sys
-import requests
+from dataclasses import asdict
 from typing import Optional
 
 from ..core.reporters import Reporter
 from ..core.types import Report
-from ..utils.discovery import discover_server
 
 
 class JSONReporter(Reporter):
@@ -28,6 +27,7 @@ class JSONReporter(Reporter):
                     "status": c.status,
                     "notes": c.notes,
                     "tags": c.tags,
+                    "metrics": asdict(c.metrics) if c.metrics else None,
                     "findings": [
                         {
                             "id": f.id,
@@ -54,9 +54,13 @@ class JSONReporter(Reporter):
             return
 
         # 2. Иначе — пробуем отправить на сервер
+        from ..utils.discovery import discover_server
+
         server_url = discover_server()
         if server_url:
             try:
+                import requests  # тяжёлый импорт нужен только для отправки
+
                 resp = requests.post(server_url, json=payload, timeout=10)
                 print(f"[AGENT] Отчёт отправлен на {server_url}, статус {resp.status_code}")
                 return
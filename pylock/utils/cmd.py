@@ -1,36 +1,242 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import signal
 import subprocess
-from typing import List
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from ..engine.scope import current_scope
 
 
 class CommandError(RuntimeError):
     pass
 
 
-def run_cmd(cmd: List[str], *, check: bool = True, timeout: int | float | None = 10) -> subprocess.CompletedProcess[str]:
+@dataclass(slots=True)
+class CommandTiming:
+    """Замер одной внешней команды (попадает в область текущей проверки)."""
+    cmd: List[str]
+    started: float
+    duration: float
+    returncode: int
+
+
+def _default_max_procs() -> int:
+    env = os.environ.get("PYLOCK_MAX_PROCS")
+    if env and env.isdigit() and int(env) > 0:
+        return int(env)
+    return max(2, min(8, (os.cpu_count() or 1) * 2))
+
+
+# Глобальное ограничение числа одновременно работающих внешних команд:
+# общее для синхронного run_cmd и асинхронного arun_cmd во всех потоках.
+_MAX_PROCS = _default_max_procs()
+_SLOTS = threading.BoundedSemaphore(_MAX_PROCS)
+
+
+def set_max_procs(n: int) -> None:
+    """
+    Изменить лимит одновременно запущенных внешних команд.
+    Вызывать до начала аудита: уже занятые слоты старого семафора не переносятся.
+    """
+    global _MAX_PROCS, _SLOTS
+    n = max(1, int(n))
+    if n != _MAX_PROCS:
+        _MAX_PROCS = n
+        _SLOTS = threading.BoundedSemaphore(n)
+
+
+def _effective_timeout(timeout: int | float | None) -> int | float | None:
+    """Ограничивает таймаут команды оставшимся временем текущей проверки."""
+    scope = current_scope()
+    remaining = scope.remaining() if scope is not None else None
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
+
+
+def _cancelled() -> bool:
+    scope = current_scope()
+    return scope is not None and (scope.cancelled or scope.expired())
+
+
+def _record(cmd: Sequence[str], started: float, returncode: int) -> None:
+    scope = current_scope()
+    if scope is not None:
+        scope.commands.append(
+            CommandTiming(list(cmd), started, time.monotonic() - started, returncode)
+        )
+
+
+def _text(data: str | bytes | None) -> str:
+    # TimeoutExpired хранит вывод в байтах даже при text=True
+    if data is None:
+        return ""
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return data
+
+
+def _finish(
+    proc: subprocess.CompletedProcess[str], check: bool
+) -> subprocess.CompletedProcess[str]:
+    cmd = proc.args
+    if check:
+        if proc.returncode == 127:
+            raise CommandError(f"Command not found: {cmd[0]}")
+        if proc.returncode == 126:
+            raise CommandError(f"Command not executable: {cmd[0]}")
+        if proc.returncode == 124 and proc.stderr in ("timeout", "cancelled"):
+            raise CommandError(f"Timeout running: {' '.join(cmd)}")
+        if proc.returncode != 0:
+            raise CommandError(
+                f"Command failed ({proc.returncode}): {' '.join(cmd)}\n{proc.stderr}"
+            )
+    return proc
+
+
+def _not_started(
+    cmd: List[str], started: float, error: OSError, check: bool
+) -> subprocess.CompletedProcess[str]:
+    # Коды как в shell: 127 — команды нет, 126 — есть, но не запускается
+    code = 127 if isinstance(error, FileNotFoundError) else 126
+    _record(cmd, started, code)
+    return _finish(subprocess.CompletedProcess(cmd, code, stdout="", stderr=str(error)), check)
+
+
+def run_cmd(
+    cmd: List[str], *, check: bool = True, timeout: int | float | None = 10
+) -> subprocess.CompletedProcess[str]:
     """Run external command safely.
     - No shell=True
     - Captures stdout/stderr as text
     - Optional returncode enforcement via check=True
+    - Timeout is capped by the time left for the current check; on expiry
+      the child is killed and returncode 124 is returned (check=False)
+    - A missing command gives returncode 127, a non-executable one 126
+    - Waits for a free slot of the global process limit (see set_max_procs)
     """
-    try:
-        proc = subprocess.run(
-            cmd,
-            check=False,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-    except FileNotFoundError as e:
-        cp = subprocess.CompletedProcess(cmd, returncode=127, stdout="", stderr=str(e))
-        if check:
-            raise CommandError(f"Command not found: {cmd[0]}") from e
-        return cp
-    except subprocess.TimeoutExpired as e:  # pragma: no cover
+    if _cancelled():
+        # Проверка уже отменена — не порождаем новых процессов
         if check:
-            raise CommandError(f"Timeout running: {' '.join(cmd)}") from e
-        return subprocess.CompletedProcess(cmd, returncode=124, stdout=e.stdout or "", stderr=e.stderr or "")
+            raise CommandError(f"Check cancelled, not running: {' '.join(cmd)}")
+        return subprocess.CompletedProcess(cmd, returncode=124, stdout="", stderr="cancelled")
+    eff_timeout = _effective_timeout(timeout)
+    slots = _SLOTS
+    if not slots.acquire(timeout=eff_timeout):
+        return _finish(subprocess.CompletedProcess(cmd, 124, stdout="", stderr="timeout"), check)
+    started = time.monotonic()
+    try:
+        try:
+            proc = subprocess.run(
+                cmd,
+                check=False,
+                capture_output=True,
+                text=True,
+                timeout=_effective_timeout(timeout),
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            return _not_started(cmd, started, e, check)
+        except subprocess.TimeoutExpired as e:
+            # subprocess.run уже убил дочерний процесс
+            _record(cmd, started, 124)
+            if check:
+                raise CommandError(f"Timeout running: {' '.join(cmd)}") from e
+            return subprocess.CompletedProcess(
+                cmd, returncode=124, stdout=_text(e.stdout), stderr=_text(e.stderr)
+            )
+    finally:
+        slots.release()
+    _record(cmd, started, proc.returncode)
     if check and proc.returncode != 0:
         raise CommandError(f"Command failed ({proc.returncode}): {' '.join(cmd)}\n{proc.stderr}")
     return proc
+
+
+async def _acquire_slot(slots: threading.BoundedSemaphore, timeout: Optional[float]) -> bool:
+    # Семафор общий с потоками, поэтому опрашиваем его без блокировки цикла
+    # событий (отмена задачи во время ожидания не «теряет» слот).
+    end = time.monotonic() + timeout if timeout is not None else None
+    delay = 0.005
+    while not slots.acquire(blocking=False):
+        if end is not None and time.monotonic() >= end:
+            return False
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.1)
+    return True
+
+
+async def arun_cmd(
+    cmd: List[str], *, check: bool = True, timeout: int | float | None = 10
+) -> subprocess.CompletedProcess[str]:
+    """Asyncio variant of run_cmd with the same contract.
+
+    Shares the global process limit and the current check's deadline with
+    run_cmd; the child is killed when the timeout expires or the check is
+    cancelled.
+    """
+    if _cancelled():
+        return _finish(subprocess.CompletedProcess(cmd, 124, stdout="", stderr="cancelled"), check)
+    eff_timeout = _effective_timeout(timeout)
+    slots = _SLOTS
+    if not await _acquire_slot(slots, eff_timeout):
+        return _finish(subprocess.CompletedProcess(cmd, 124, stdout="", stderr="timeout"), check)
+    started = time.monotonic()
+    try:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            return _not_started(cmd, started, e, check)
+
+        def kill() -> None:
+            try:
+                os.kill(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        scope = current_scope()
+        if scope is not None:
+            scope.on_cancel(kill)
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), _effective_timeout(timeout))
+        except asyncio.TimeoutError:
+            kill()
+            await proc.wait()
+            _record(cmd, started, 124)
+            timed_out = subprocess.CompletedProcess(cmd, 124, stdout="", stderr="timeout")
+            return _finish(timed_out, check)
+        finally:
+            if scope is not None:
+                scope.discard(kill)
+    finally:
+        slots.release()
+    _record(cmd, started, proc.returncode)
+    cp = subprocess.CompletedProcess(cmd, proc.returncode, stdout=_text(out), stderr=_text(err))
+    return _finish(cp, check)
+
+
+def run_cmds(
+    cmds: Sequence[List[str]], *, timeout: int | float | None = 10
+) -> List[subprocess.CompletedProcess[str]]:
+    """Run several external commands concurrently (check=False semantics).
+
+    Commands are launched through arun_cmd on a private event loop, so at most
+    the global process limit runs at once. Results keep the order of cmds.
+    """
+    if not cmds:
+        return []
+
+    async def _all() -> List[subprocess.CompletedProcess[str]]:
+        return await asyncio.gather(
+            *(arun_cmd(list(c), check=False, timeout=timeout) for c in cmds)
+        )
+
+    return asyncio.run(_all())
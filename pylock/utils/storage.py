@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_dir() -> Path:
+    """
+    Каталог кэша pylock (восстановимые данные: манифест проверок и т.п.).
+    PYLOCK_CACHE_DIR переопределяет расположение, иначе $XDG_CACHE_HOME/pylock
+    или ~/.cache/pylock.
+    """
+    env = os.environ.get("PYLOCK_CACHE_DIR")
+    if env:
+        return Path(env)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return Path(xdg or Path.home() / ".cache") / "pylock"
+
+
+def state_dir() -> Path:
+    """
+    Каталог состояния pylock (невосстановимые данные: эталоны FIM).
+    PYLOCK_STATE_DIR переопределяет расположение, иначе $XDG_STATE_HOME/pylock
+    или ~/.local/state/pylock.
+    """
+    env = os.environ.get("PYLOCK_STATE_DIR")
+    if env:
+        return Path(env)
+    xdg = os.environ.get("XDG_STATE_HOME")
+    return Path(xdg or Path.home() / ".local" / "state") / "pylock"
+
+
+def to_sqlite_int(v: int) -> int:
+    """Беззнаковое 64-битное (inode, номер устройства) -> знаковое INTEGER sqlite."""
+    return v - (1 << 64) if v >= 1 << 63 else v
+
+
+def from_sqlite_int(v: int) -> int:
+    return v + (1 << 64) if v < 0 else v
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """Прочитать JSON-файл; None, если файла нет или он повреждён."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: Path, data: Any) -> bool:
+    """
+    Записать JSON атомарно (временный файл + rename), чтобы параллельный
+    читатель не увидел наполовину записанный файл.
+
+    :return: False, если каталог недоступен для записи.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
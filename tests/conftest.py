@@ -1,2 +1,40 @@
 import os, sys
 sys.path.insert(0, os.path.abspath('.'))
+
+import pytest
+
+from pylock.engine.context import Context
+
+
+@pytest.fixture(autouse=True)
+def _pylock_dirs(tmp_path_factory, monkeypatch):
+    # Аудит в тестах не должен трогать эталоны FIM и кэш пользователя
+    monkeypatch.setenv("PYLOCK_STATE_DIR", str(tmp_path_factory.mktemp("state")))
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
+@pytest.fixture
+def ctx():
+    """Контекст проверки без аудитора (профиль не загружен)."""
+    return Context(subject="s", profile_path=None, env={})
+
+
+@pytest.fixture
+def redirect(tmp_path, monkeypatch):
+    """
+    redirect(module, NAME, rel, content=None) — направить путь-константу
+    модуля (PROC, SYS_CLASS_NET, ...) в tmp_path / rel. Если задано
+    содержимое (str или bytes), файл создаётся. Возвращает новый путь.
+    """
+    def _redirect(module, name, rel, content=None):
+        path = tmp_path / rel
+        if content is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+        monkeypatch.setattr(module, name, str(path))
+        return path
+
+    return _redirect
@@ -0,0 +1,55 @@
+from pylock.checks.users import (
+    USERS_10000_RootUid,
+    USERS_10001_EmptyPasswords,
+    USERS_10004_DuplicateUIDs,
+)
+from pylock.engine.context import Context
+from pylock.facts import accounts as acc_mod
+
+
+def _db(tmp_path, monkeypatch, shadow=True):
+    files = {
+        "PASSWD": "root:x:0:0:root:/root:/bin/bash\n"
+                  "toor:x:0:0::/root:/bin/sh\n"
+                  "+nisuser::::::\n"
+                  "alice:x:1000:1000::/home/alice:/bin/bash\n"
+                  "bob:x:1000:1001::/home/bob:/bin/bash\n",
+        "SHADOW": "root:!:19000:0:99999:7:::\nalice::19000\n",
+        "GROUP": "root:x:0:\nalice:x:1000:\nwheel:x:10:alice,bob\n",
+        "GSHADOW": "wheel:!:alice:alice,bob\n",
+    }
+    for name, text in files.items():
+        path = tmp_path / name.lower()
+        if name != "SHADOW" or shadow:
+            path.write_text(text)
+        monkeypatch.setattr(acc_mod, name, str(path))
+    return Context(subject="s", profile_path=None, env={})
+
+
+def test_account_db_indexes_and_joins(tmp_path, monkeypatch):
+    ctx = _db(tmp_path, monkeypatch)
+    db = acc_mod.accounts(ctx)
+    assert [a.name for a in db.users] == ["root", "toor", "alice", "bob"]
+    assert [a.name for a in db.by_uid[0]] == ["root", "toor"]
+    assert db.by_name["alice"].shadow.password == ""
+    assert db.by_name["root"].shadow.max == "99999"
+    assert db.by_name["bob"].shadow is None
+    assert [g.name for g in db.groups_of("alice")] == ["alice", "wheel"]
+    assert db.groups_by_name["wheel"].admins == ["alice"]
+    assert set(db.duplicate_uids()) == {0, 1000}
+    assert acc_mod.accounts(ctx) is db  # один разбор на аудит
+
+
+def test_account_checks(tmp_path, monkeypatch):
+    ctx = _db(tmp_path, monkeypatch)
+    assert USERS_10000_RootUid().run(ctx).status == "fail"
+    empty = USERS_10001_EmptyPasswords().run(ctx)
+    assert [f.id for f in empty.findings] == ["USERS-10001:alice"]
+    dups = USERS_10004_DuplicateUIDs().run(ctx)
+    assert sorted(f.id for f in dups.findings) == ["USERS-10004:bob", "USERS-10004:toor"]
+
+
+def test_unreadable_shadow_skips(tmp_path, monkeypatch):
+    ctx = _db(tmp_path, monkeypatch, shadow=False)
+    assert not acc_mod.accounts(ctx).shadow_readable
+    assert USERS_10001_EmptyPasswords().run(ctx).status == "skipped"
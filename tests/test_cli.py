@@ -6,3 +6,35 @@ def test_cli_builds_and_has_commands():
     assert args.command == "audit"
     assert args.subject == "system"
     assert args.fmt == "json"
+
+
+def _run_python(code, *flags):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+
+
+def test_cli_import_skips_heavy_modules():
+    out = _run_python(
+        "import sys\n"
+        "from pylock.cli import build_parser\n"
+        "build_parser()\n"
+        "heavy = ('requests', 'urllib3', 'asyncio', 'multiprocessing', 'importlib.metadata',\n"
+        "         'pylock.engine', 'pylock.checks')\n"
+        "print(sorted(m for m in sys.modules if m.startswith(heavy)))\n"
+    ).stdout
+    assert out.strip() == "[]"
+
+
+def test_cli_import_time_budget():
+    # Бюджет с большим запасом: сейчас импорт занимает единицы миллисекунд
+    err = _run_python("import pylock.cli", "-X", "importtime").stderr
+    line = [ln for ln in err.splitlines() if ln.rstrip().endswith("| pylock.cli")][-1]
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < 50_000
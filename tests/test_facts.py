@@ -0,0 +1,70 @@
+from pylock.engine.auditor import Auditor
+from pylock.engine.context import Context
+from pylock.facts.base import FactStore, Transient, fact, path_stamp
+
+
+def test_stamped_fact_survives_renew_until_source_changes(tmp_path):
+    src = tmp_path / "db"
+    src.write_text("a")
+    calls = []
+
+    @fact("test-facts-stamped", stamp=lambda ctx: path_stamp(str(src)))
+    def stamped(ctx):
+        calls.append("stamped")
+        return src.read_text()
+
+    @fact("test-facts-plain")
+    def plain(ctx):
+        calls.append("plain")
+        return 1
+
+    store = FactStore()
+    ctx = Context(subject="s", profile_path=None, env={}, facts=store)
+    for _ in range(2):
+        store.renew()
+        assert stamped(ctx) == "a" and stamped(ctx) == "a"
+        plain(ctx)
+    assert calls == ["stamped", "plain", "plain"]
+
+    src.write_text("bb")
+    store.renew()
+    assert stamped(ctx) == "bb"
+    assert calls.count("stamped") == 2
+
+
+def test_transient_value_is_not_stamped(tmp_path):
+    src = tmp_path / "db"
+    src.write_text("a")
+    results = [Transient(None), "ok"]
+
+    @fact("test-facts-transient", stamp=lambda ctx: path_stamp(str(src)))
+    def flaky(ctx):
+        return results.pop(0)
+
+    store = FactStore()
+    ctx = Context(subject="s", profile_path=None, env={}, facts=store)
+    assert flaky(ctx) is None and flaky(ctx) is None
+    # Источник не изменился, но сбойное значение не переживает аудит
+    store.renew()
+    assert flaky(ctx) == "ok"
+
+
+def test_auditor_reuses_profile_until_file_changes(tmp_path, monkeypatch):
+    from pylock.engine import auditor as auditor_mod
+
+    prf = tmp_path / "p.ini"
+    prf.write_text("[pylock]\ntests = CUST-11001\n")
+    loads = []
+    real = auditor_mod.load_profile
+    monkeypatch.setattr(auditor_mod, "load_profile", lambda p: loads.append(p) or real(p))
+
+    aud = Auditor()
+    for _ in range(2):
+        rpt = aud.run(subject="s", profile_path=str(prf))
+        assert [c.id for c in rpt.checks] == ["CUST-11001"]
+    assert len(loads) == 1
+
+    prf.write_text("[pylock]\ntests = CUST-11000,CUST-11001\n")
+    rpt = aud.run(subject="s", profile_path=str(prf))
+    assert [c.id for c in rpt.checks] == ["CUST-11000", "CUST-11001"]
+    assert len(loads) == 2
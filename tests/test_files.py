@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from pylock.engine.files import FileCache
+
+
+def test_file_cache_pins_content_within_audit(tmp_path, monkeypatch):
+    f = tmp_path / "passwd"
+    f.write_text("root:x:0:0\n")
+    cache = FileCache()
+    assert cache.lines(f) == ["root:x:0:0"]
+
+    # Изменение файла посреди аудита не видно: все проверки читают одну версию
+    f.write_text("root:x:0:0\nevil:x:0:0\n")
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: opened.append(a) or real_open(*a, **k))
+    assert cache.read_text(str(f)) == "root:x:0:0\n"
+    assert opened == []
+
+    monkeypatch.undo()
+    cache.renew()
+    assert cache.read_bytes(f) == b"root:x:0:0\nevil:x:0:0\n"
+
+
+def test_file_cache_reuses_unchanged_file_across_audits(tmp_path, monkeypatch):
+    f = tmp_path / "sshd_config"
+    f.write_text("PermitRootLogin no\n")
+    cache = FileCache()
+    cache.read_bytes(f)
+    cache.renew()
+    loads = []
+    real_load = FileCache._load
+    monkeypatch.setattr(FileCache, "_load", staticmethod(lambda p: loads.append(p) or real_load(p)))
+    assert cache.read_text(f) == "PermitRootLogin no\n"
+    assert loads == []
+
+    # Новый inode (атомарная замена) — перечитываем
+    tmp = tmp_path / "new"
+    tmp.write_text("PermitRootLogin yes\n")
+    os.replace(tmp, f)
+    cache.renew()
+    assert cache.read_text(f) == "PermitRootLogin yes\n"
+    assert loads == [str(f)]
+
+
+def test_file_cache_remembers_errors(tmp_path):
+    cache = FileCache()
+    missing = tmp_path / "nope"
+    with pytest.raises(FileNotFoundError):
+        cache.read_bytes(missing)
+    missing.write_text("x")
+    with pytest.raises(FileNotFoundError):
+        cache.read_bytes(missing)
+    cache.renew()
+    assert cache.read_text(missing) == "x"
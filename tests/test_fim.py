@@ -0,0 +1,158 @@
+import os
+
+from pylock.checks.filesystem import FILE_3003_SuidBinaries
+from pylock.checks.fim import FimChanges
+from pylock.config.loader import Profile
+from pylock.engine.context import Context
+from pylock.facts import accounts as accounts_mod
+from pylock.facts import filesystem as fs_mod
+from pylock.facts import integrity
+from pylock.facts import mounts as mounts_mod
+
+
+def _ctx(tmp_path, workers=1):
+    fim_paths = [str(tmp_path / "bin"), str(tmp_path / "missing")]
+    profile = Profile(name="t", path=None, include_tests=[], skip_tests=[],
+                      fim_paths=fim_paths, fs_workers=workers)
+    return Context(subject="s", profile_path=None, env={}, profile=profile)
+
+
+def test_fim_reports_changes_against_baseline(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_STATE_DIR", str(tmp_path / "state"))
+    bin_dir = tmp_path / "bin"
+    (bin_dir / "sub").mkdir(parents=True)
+    for name in ("ls", "cat", "rm", "sub/sh"):
+        (bin_dir / name).write_text(name)
+    os.symlink("ls", bin_dir / "dir")
+
+    res = FimChanges().run(_ctx(tmp_path))
+    assert res.status == "ok" and res.notes == "Создан эталон: 5 файлов"
+
+    (bin_dir / "ls").write_text("trojan")
+    (bin_dir / "cat").chmod(0o4755)
+    (bin_dir / "rm").unlink()
+    (bin_dir / "sub" / "new").write_text("x")
+    os.remove(bin_dir / "dir")
+    os.symlink("cat", bin_dir / "dir")
+    rep = integrity.fim(_ctx(tmp_path, workers=4))
+    assert rep.added == [f"{bin_dir}/sub/new"]
+    assert rep.removed == [f"{bin_dir}/rm"]
+    assert rep.modified == [(f"{bin_dir}/cat", ["mode"]), (f"{bin_dir}/dir", ["link"]),
+                            (f"{bin_dir}/ls", ["content"])]
+    # Хеш пересчитан только у файлов с новым (размер, mtime, ctime, inode)
+    assert rep.hashed == 3
+
+    res = FimChanges().run(_ctx(tmp_path))
+    assert res.status == "fail" and len(res.findings) == 5
+    assert res.findings[0].id == f"FIM:changes:added:{bin_dir}/sub/new"
+
+    assert integrity.fim_store().accept() == 5
+    res = FimChanges().run(_ctx(tmp_path))
+    assert res.status == "ok" and res.notes == "Изменений нет: 5 файлов, перехешировано 0"
+
+
+def test_suid_inventory_diff(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    root = tmp_path / "root"
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(root),))
+    root.mkdir()
+    for name in ("su", "passwd"):
+        (root / name).write_text(name)
+        (root / name).chmod(0o4755)
+    (root / "wall").write_text("wall")
+    (root / "wall").chmod(0o2755)
+
+    res = FILE_3003_SuidBinaries().run(_ctx(tmp_path))
+    assert res.status == "ok"
+    assert res.notes == "Найдено 2 SUID- и 1 SGID-файлов; создан эталон SUID/SGID"
+
+    (root / "passwd").write_text("backdoor")
+    (root / "wall").unlink()
+    (root / "sh").write_text("sh")
+    (root / "sh").chmod(0o4777)
+    res = FILE_3003_SuidBinaries().run(_ctx(tmp_path))
+    assert res.status == "fail"
+    assert [f.description for f in res.findings] == [
+        f"Новый SUID/SGID-файл: {root}/sh (режим 4777, UID {os.getuid()})",
+        f"Изменён SUID/SGID-файл (содержимое): {root}/passwd",
+    ]
+    assert "исчезли с момента эталона: 1" in res.notes
+
+    assert integrity.suid_store().accept() == 3
+    assert FILE_3003_SuidBinaries().run(_ctx(tmp_path)).status == "ok"
+
+
+def test_suid_findings_capped_with_note(tmp_path, monkeypatch):
+    from pylock.checks import filesystem as checks_fs
+
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    root = tmp_path / "root"
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(root),))
+    root.mkdir()
+    assert FILE_3003_SuidBinaries().run(_ctx(tmp_path)).status == "ok"
+
+    for name in ("a", "b", "c"):
+        (root / name).write_text(name)
+        (root / name).chmod(0o4755)
+    monkeypatch.setattr(checks_fs, "MAX_PATH_FINDINGS", 2)
+    res = FILE_3003_SuidBinaries().run(_ctx(tmp_path))
+    assert len(res.findings) == 2
+    assert res.notes.endswith("; показаны первые 2 из 3")
+
+
+def test_suid_changes_reported_when_state_not_saved(tmp_path, monkeypatch):
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    root = tmp_path / "root"
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(root),))
+    root.mkdir()
+    assert FILE_3003_SuidBinaries().run(_ctx(tmp_path)).status == "ok"
+
+    (root / "sh").write_text("sh")
+    (root / "sh").chmod(0o4755)
+    # Запись состояния не удалась (каталог только для чтения, блокировка sqlite)
+    monkeypatch.setattr(integrity.FimStore, "_write", lambda self, *args, **kwargs: False)
+    res = FILE_3003_SuidBinaries().run(_ctx(tmp_path))
+    assert res.status == "fail" and len(res.findings) == 1
+    assert "состояние SUID/SGID не записано" in res.notes
+
+
+def test_fim_changes_reported_when_state_not_saved(tmp_path, monkeypatch):
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "ls").write_text("ls")
+    assert FimChanges().run(_ctx(tmp_path)).notes == "Создан эталон: 1 файлов"
+
+    (tmp_path / "bin" / "ls").write_text("trojan")
+    monkeypatch.setattr(integrity.FimStore, "_write", lambda self, *args, **kwargs: False)
+    res = FimChanges().run(_ctx(tmp_path))
+    assert res.status == "fail"
+    assert [f.id for f in res.findings] == [f"FIM:changes:modified:{tmp_path}/bin/ls"]
+    assert res.notes.endswith("состояние FIM не записано в каталог состояния pylock")
+
+
+def test_store_update_writes_only_changed_rows(tmp_path):
+    import sqlite3
+
+    store = integrity.FimStore(tmp_path / "fim.sqlite")
+    states = {p: integrity.FileState(p, None, 0o100644, 0, 0, 1, 1, 1, 1, "d")
+              for p in ("/a", "/b", "/c")}
+    assert store.save("seen", states.values())
+    db = sqlite3.connect(tmp_path / "fim.sqlite")
+    db.execute("CREATE TABLE writes (n INTEGER)")
+    db.execute("CREATE TRIGGER t AFTER INSERT ON seen BEGIN INSERT INTO writes VALUES (1); END")
+    db.commit()
+
+    current = dict(states)
+    del current["/c"]
+    current["/b"] = integrity.FileState("/b", None, 0o104755, 0, 0, 1, 1, 2, 1, "d")
+    assert store.update("seen", current, states)
+    assert store.load("seen") == current
+    assert db.execute("SELECT count(*) FROM writes").fetchone() == (1,)
+    db.close()
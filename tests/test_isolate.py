@@ -0,0 +1,60 @@
+import os
+
+from pylock.core import runner
+from pylock.core.types import CheckResult
+from pylock.engine.context import Context
+from pylock.engine.isolate import Isolation, run_isolated
+
+
+class Pid:
+    id = "ISO-1"
+    title = "t"
+    category = "ISO"
+
+    def run(self, ctx):
+        return CheckResult(id=self.id, title=self.title, category=self.category,
+                           status="ok", notes=str(os.getpid()))
+
+
+class Crash:
+    id = "ISO-2"
+    title = "t"
+    category = "ISO"
+
+    def run(self, ctx):
+        os._exit(3)
+
+
+class Hog:
+    id = "ISO-3"
+    title = "t"
+    category = "ISO"
+
+    def run(self, ctx):
+        blob = bytearray(512 * 1024 * 1024)
+        return CheckResult(id=self.id, title=self.title, category=self.category,
+                           status="ok", notes=str(len(blob)))
+
+
+def _ctx():
+    return Context(subject="s", profile_path=None, env={})
+
+
+def test_isolated_check_runs_in_child_process():
+    res = run_isolated(Pid, _ctx())
+    assert res.status == "ok"
+    assert res.notes != str(os.getpid())
+
+
+def test_isolated_crash_and_memory_limit_are_contained():
+    assert run_isolated(Crash, _ctx()).status == "error"
+    res = run_isolated(Hog, _ctx(), mem_limit_mb=256)
+    assert res.status == "error"
+
+
+def test_run_checks_isolates_selected_category(monkeypatch):
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: [Pid, Crash])
+    res = runner.run_checks(_ctx(), None, None, workers=2, timeout=30,
+                            isolation=Isolation.of(["ISO"]))
+    assert [r.status for r in res] == ["ok", "error"]
+    assert Isolation.of(["FILE-3002"]).matches(Pid) is False
@@ -0,0 +1,79 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pylock.core import manifest
+from pylock.core.selectors import compile_selectors
+
+
+def test_manifest_maps_checks_to_modules(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(manifest, "_MANIFEST", None)
+    data = manifest.load_manifest()
+    assert data["checks"]["SSH-8001"]["module"] == "pylock.checks.ssh"
+    assert data["checks"]["SSH-8001"]["category"] == "SSH"
+    assert (tmp_path / manifest.MANIFEST_NAME).exists()
+
+    # Актуальный манифест с диска не перестраивается
+    monkeypatch.setattr(manifest, "_MANIFEST", None)
+    monkeypatch.setattr(manifest, "build_manifest", lambda sources=None: 1 / 0)
+    include = compile_selectors(["SSH-8001", "KRNL-4000"])
+    assert manifest.modules_for(include, compile_selectors(["KRNL-*"])) == {"pylock.checks.ssh"}
+
+
+def test_manifest_rebuilt_when_stale(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(manifest, "_MANIFEST", None)
+    manifest.load_manifest()
+    path = tmp_path / manifest.MANIFEST_NAME
+    data = json.loads(path.read_text())
+    data["sources"]["pylock.checks.ssh"] = [0, 0]
+    data["checks"] = {}
+    path.write_text(json.dumps(data))
+
+    monkeypatch.setattr(manifest, "_MANIFEST", None)
+    assert "SSH-8001" in manifest.load_manifest()["checks"]
+    assert json.loads(path.read_text())["sources"]["pylock.checks.ssh"] != [0, 0]
+
+
+def test_manifest_rejects_modules_outside_checks_package(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(manifest, "_MANIFEST", None)
+    manifest.load_manifest()
+    path = tmp_path / manifest.MANIFEST_NAME
+    data = json.loads(path.read_text())
+    data["checks"]["SSH-8001"]["module"] = "os"
+    path.write_text(json.dumps(data))
+
+    monkeypatch.setattr(manifest, "_MANIFEST", None)
+    assert manifest.modules_for(compile_selectors(["SSH-8001"])) == {"pylock.checks.ssh"}
+    assert json.loads(path.read_text())["checks"]["SSH-8001"]["module"] == "pylock.checks.ssh"
+
+
+@pytest.mark.parametrize("cid, module", [
+    ("SSH-8001", "pylock.checks.ssh"),
+    # Правила sysctl ядра не тянут модуль проверок SYSCTL
+    ("KRNL-4003", "pylock.checks.kernel"),
+])
+def test_get_checks_imports_only_needed_modules(tmp_path, cid, module):
+    code = (
+        "import sys\n"
+        "from pylock.core.registry import get_checks\n"
+        "get_checks()\n"  # прогрев манифеста
+        "for m in [m for m in sys.modules if m.startswith('pylock.checks.')]:\n"
+        "    del sys.modules[m]\n"
+        "from pylock.core import registry\n"
+        "registry._REGISTRY.clear()\n"
+        f"print([c.id for c in get_checks([{cid!r}])])\n"
+        "print(sorted(m for m in sys.modules if m.startswith('pylock.checks.')))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={"PYLOCK_CACHE_DIR": str(tmp_path), "PATH": "/usr/bin:/bin"},
+        cwd=Path(__file__).resolve().parents[1],
+    ).stdout.splitlines()
+    assert out[-2] == f"[{cid!r}]"
+    assert out[-1] == f"['pylock.checks.base', {module!r}]"
@@ -0,0 +1,36 @@
+import pytest
+
+from pylock.checks.filesystem import FILE_3005_FstabOptions, FILE_3013_DevShmOptions
+from pylock.facts import mounts as mounts_mod
+
+MOUNTINFO = (
+    "22 1 254:0 / / rw,relatime - ext4 /dev/vda rw\n"
+    "23 22 0:22 / /proc rw,nosuid,nodev,noexec - proc proc rw\n"
+    "26 22 0:24 / /dev/shm rw - tmpfs tmpfs rw\n"
+    "31 26 0:27 / /dev/shm rw,nosuid,nodev,noexec shared:5 - tmpfs tmpfs rw,size=64k\n"
+    "40 22 0:50 / /mnt/my\\040share rw - nfs4 srv:/export rw,vers=4.2\n"
+)
+FSTAB = "# comment\nUUID=1 / ext4 defaults 0 1\n/dev/vdb /home ext4 nodev,nosuid 0 2\n"
+
+
+@pytest.fixture(autouse=True)
+def mount_files(redirect):
+    redirect(mounts_mod, "MOUNTINFO", "mountinfo", MOUNTINFO)
+    redirect(mounts_mod, "FSTAB", "fstab", FSTAB)
+
+
+def test_mount_table_indexes(ctx):
+    table = mounts_mod.mounts(ctx)
+    # Видимо последнее монтирование в точку
+    assert table.get("/dev/shm").options >= {"nosuid", "nodev", "noexec", "size=64k"}
+    assert [m.mountpoint for m in table.by_fstype["tmpfs"]] == ["/dev/shm", "/dev/shm"]
+    assert table.mount_of("/proc/1/status").fstype == "proc"
+    assert table.mount_of("/etc/passwd").mountpoint == "/"
+    assert table.prune("/proc") and table.prune("/mnt/my share") and not table.prune("/dev/shm")
+    assert table.fstab_by_mountpoint["/home"].options == {"nodev", "nosuid"}
+
+
+def test_mount_checks(ctx):
+    assert FILE_3013_DevShmOptions().run(ctx).status == "ok"
+    res = FILE_3005_FstabOptions().run(ctx)
+    assert [f.id for f in res.findings] == ["FILE-3005:/home:noexec"]
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from pylock.checks.network import NETW_5002_RoutingTable, NETW_5006_PromiscuousMode
+from pylock.facts import network as net_mod
+
+ROUTE = (
+    "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+    "eth0\t00000000\t010200C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+    "eth0\t000200C0\t00000000\t0001\t0\t0\t0\t00FFFFFF\t0\t0\t0\n"
+)
+
+
+def _iface(root, name, flags, type_=1, bridge=False, master=None):
+    d = root / name
+    d.mkdir()
+    (d / "flags").write_text(f"{flags:#x}\n")
+    (d / "type").write_text(f"{type_}\n")
+    (d / "operstate").write_text("up\n")
+    if bridge:
+        (d / "bridge").mkdir()
+    if master:
+        os.symlink(f"../{master}", d / "master")
+
+
+@pytest.fixture(autouse=True)
+def sysfs(redirect):
+    root = redirect(net_mod, "SYS_CLASS_NET", "net")
+    root.mkdir()
+    _iface(root, "lo", 0x9, 772)
+    _iface(root, "br0", 0x1003, bridge=True)
+    _iface(root, "veth1", 0x1103, master="br0")
+    _iface(root, "eth1", 0x1103)
+    redirect(net_mod, "PROC_NET_ROUTE", "route", ROUTE)
+
+
+def test_network_inventory(ctx):
+    inv = net_mod.network(ctx)
+    assert inv.interfaces["lo"].loopback and inv.interfaces["br0"].up
+    assert [i.name for i in inv.bridges()] == ["br0"]
+    assert inv.members == {"br0": ["veth1"]}
+    default = [r for r in inv.routes if r.default]
+    assert [(r.gateway, r.metric) for r in default] == [("192.0.2.1", 100)]
+    assert inv.routes[1].destination == "192.0.2.0" and inv.routes[1].mask == "255.255.255.0"
+
+
+def test_network_checks(ctx):
+    res = NETW_5006_PromiscuousMode().run(ctx)
+    # veth1 — порт моста: IFF_PROMISC на нём выставляет ядро
+    assert [f.description for f in res.findings] == ["Интерфейс в режиме promiscuous: eth1"]
+    assert NETW_5002_RoutingTable().run(ctx).notes == "Количество маршрутов: 2 (по умолчанию: 1)"
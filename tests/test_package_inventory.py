@@ -0,0 +1,54 @@
+from pylock.checks.packages import PKGS_6006_DangerousPackages
+from pylock.config.loader import load_profile
+from pylock.engine.context import Context
+from pylock.facts import packages as pkg_mod
+
+STATUS = """Package: telnet
+Status: install ok installed
+Architecture: amd64
+Version: 0.17+2.4-2
+Description: basic telnet client
+ continuation line
+
+Package: ftp
+Status: deinstall ok config-files
+Architecture: amd64
+Version: 20230507-2
+
+Package: libc6
+Status: install ok installed
+Architecture: amd64
+Version: 2.36-9
+
+Package: libc6
+Status: install ok installed
+Architecture: i386
+Version: 2.36-9
+"""
+
+
+def test_dpkg_inventory(tmp_path, monkeypatch):
+    (tmp_path / "status").write_text(STATUS)
+    monkeypatch.setattr(pkg_mod, "DPKG_STATUS", str(tmp_path / "status"))
+    inv = pkg_mod.installed_packages(Context(subject="s", profile_path=None, env={}))
+    assert inv.manager == "dpkg" and len(inv) == 2
+    assert "ftp" not in inv and inv.versions("telnet") == ["0.17+2.4-2"]
+    assert [p.arch for p in inv.by_name["libc6"]] == ["amd64", "i386"]
+
+
+def test_rpm_list():
+    inv = pkg_mod.PackageInventory(manager="rpm")
+    pkg_mod.parse_rpm_list("bash\t5.2.15-3.fc38\tx86_64\ngpg-pubkey\t1:abc-1\t(none)\n", inv)
+    assert inv.versions("gpg-pubkey") == ["1:abc-1"] and inv.by_name["gpg-pubkey"][0].arch == ""
+
+
+def test_profile_banned_packages(tmp_path, monkeypatch):
+    (tmp_path / "status").write_text(STATUS)
+    monkeypatch.setattr(pkg_mod, "DPKG_STATUS", str(tmp_path / "status"))
+    prf = tmp_path / "p.ini"
+    prf.write_text("[pylock]\nbanned_packages = libc6, nis\n")
+    ctx = Context(subject="s", profile_path=str(prf), env={}, profile=load_profile(str(prf)))
+    res = PKGS_6006_DangerousPackages().run(ctx)
+    assert res.findings[0].description == (
+        "Найдено небезопасных пакетов: telnet 0.17+2.4-2, libc6 2.36-9"
+    )
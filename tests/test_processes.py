@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from pylock.checks.processes import PROC_7001_ZombieProcesses, PROC_7002_SuspiciousTmpExec
+from pylock.checks.sysctl import NETW_5007_NtpActive
+from pylock.facts import processes as proc_mod
+
+
+def _stat(pid, comm, state, ppid, utime=0, stime=0, start=0):
+    # pid (comm) state ppid pgrp session tty tpgid flags minflt cminflt majflt cmajflt
+    # utime stime cutime cstime priority nice threads itrealvalue starttime ...
+    return (f"{pid} ({comm}) {state} {ppid} 1 1 0 -1 0 0 0 0 0 "
+            f"{utime} {stime} 0 0 20 0 1 0 {start} 0 0\n")
+
+
+def _proc(root, pid, comm, state="S", ppid=1, uid=0, cmdline=b"", exe=None, **kw):
+    d = root / str(pid)
+    d.mkdir()
+    (d / "stat").write_text(_stat(pid, comm, state, ppid, **kw))
+    (d / "status").write_text(f"Name:\t{comm}\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n")
+    (d / "cmdline").write_bytes(cmdline)
+    if exe:
+        os.symlink(exe, d / "exe")
+
+
+@pytest.fixture(autouse=True)
+def procfs(redirect, monkeypatch):
+    root = redirect(proc_mod, "PROC", "proc")
+    root.mkdir()
+    (root / "uptime").write_text("1000.00 500.00\n")
+    _proc(root, 1, "systemd", cmdline=b"/sbin/init\0", exe="/usr/lib/systemd/systemd")
+    _proc(root, 42, "systemd-timesyn", uid=998,
+          cmdline=b"/lib/systemd/systemd-timesyncd\0", exe="/lib/systemd/systemd-timesyncd")
+    _proc(root, 77, "x (evil) y", uid=1000, cmdline=b"/tmp/x\0-q\0",
+          utime=90000, stime=5000, start=5000)
+    _proc(root, 78, "defunct", state="Z", ppid=77, uid=1000)
+    (root / "self").mkdir()
+    monkeypatch.setattr(proc_mod, "CLK_TCK", 100)
+
+
+def test_process_table(ctx):
+    table = proc_mod.processes(ctx)
+    assert table.pid == [1, 42, 77, 78]
+    assert table.comm[2] == "x (evil) y" and table.cmdline[2] == "/tmp/x -q"
+    assert table.by_uid[1000] == [2, 3] and table.state[3] == "Z"
+    assert table.exe[3] is None
+    # Усечённый comm распознаётся по exe, как у pidof
+    assert table.find("systemd-timesyncd") == [42]
+    assert not table.running("systemd-timesyncd-other")
+    # Без exe имя программы берётся из argv[0]
+    assert table.by_name["x"] == [2] and table.find("x") == [77]
+    assert round(table.cpu_percent(2)) == 100
+
+
+def test_process_checks(ctx):
+    assert [f.id for f in PROC_7001_ZombieProcesses().run(ctx).findings] == ["PROC-7001:zombies"]
+    res = PROC_7002_SuspiciousTmpExec().run(ctx)
+    assert [f.description for f in res.findings] == [
+        "Процесс запущен из /tmp: 77 x (evil) y /tmp/x -q"
+    ]
+    assert NETW_5007_NtpActive().run(ctx).status == "ok"
@@ -0,0 +1,45 @@
+import pytest
+
+from pylock.core import registry
+from pylock.core.selectors import compile_selector, compile_selectors
+from pylock.engine.isolate import Isolation
+
+
+def test_compile_selector_kinds():
+    assert compile_selector("SSH-8001").kind == "id"
+    assert compile_selector("SSH-*").kind == "glob"
+    assert compile_selector("category:FILE").value == "FILE"
+    assert compile_selector(" tag:ufw ").kind == "tag"
+    assert compile_selectors(["SSH-*", "SSH-*", ""]) == (compile_selector("SSH-*"),)
+    assert compile_selector("FW:running") == compile_selector("id:FW:running")
+    with pytest.raises(ValueError):
+        compile_selector("category:")
+
+
+def test_get_checks_by_selectors():
+    ssh = [c.id for c in registry.get_checks(["SSH-*"])]
+    assert ssh and all(i.startswith("SSH-") for i in ssh) and ssh == sorted(ssh)
+    assert [c.id for c in registry.get_checks(["FW:running"])] == ["FW:running"]
+
+    by_cat = registry.get_checks(["category:SSH"], skip=["SSH-8000", "SSH-800[01]"])
+    assert {c.category for c in by_cat} == {"SSH"}
+    assert not any(c.id in ("SSH-8000", "SSH-8001") for c in by_cat)
+
+    tagged = registry.get_checks(["tag:ufw"])
+    assert tagged and all("ufw" in c.tags for c in tagged)
+
+
+def test_get_checks_plan_is_cached():
+    first = registry.get_checks(["category:SSH"])
+    key = (compile_selectors(["category:SSH"]), ())
+    assert registry._PLANS[key] == tuple(first)
+    first.clear()  # изменение результата не портит кэш
+    assert registry.get_checks(["category:SSH"]) == list(registry._PLANS[key])
+
+
+def test_isolation_accepts_selectors():
+    iso = Isolation.of(["FILE", "tag:ufw"])
+    fw = [c for c in registry.get_checks(["tag:ufw"])][0]
+    assert iso.matches(fw)
+    assert iso.matches(type("X", (), {"id": "FILE-1", "category": "FILE"}))
+    assert not iso.matches(type("Y", (), {"id": "SSH-1", "category": "SSH"}))
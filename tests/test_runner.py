@@ -0,0 +1,158 @@
+import threading
+import time
+
+from pylock.core import runner
+from pylock.core.types import CheckResult
+from pylock.engine.context import Context
+
+
+def _make(cid, delay=0.0, boom=False):
+    class Fake:
+        id = cid
+        title = "t"
+        category = "C"
+
+        def run(self, ctx):
+            time.sleep(delay)
+            if boom:
+                raise RuntimeError("boom")
+            return CheckResult(id=cid, title="t", category="C", status="ok",
+                               notes=threading.current_thread().name)
+    return Fake
+
+
+def test_run_checks_parallel_keeps_order_and_errors(monkeypatch):
+    checks = [_make("A-1", 0.2), _make("A-2", 0.2), _make("A-3", boom=True), _make("A-4", 0.2)]
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: checks)
+    ctx = Context(subject="s", profile_path=None, env={})
+
+    t0 = time.monotonic()
+    res = runner.run_checks(ctx, None, None, workers=4)
+    elapsed = time.monotonic() - t0
+
+    assert [r.id for r in res] == ["A-1", "A-2", "A-3", "A-4"]
+    assert res[2].status == "error" and "boom" in res[2].notes
+    assert elapsed < 0.5
+
+
+def test_run_checks_sequential_by_default(monkeypatch):
+    checks = [_make("B-1"), _make("B-2")]
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: checks)
+    ctx = Context(subject="s", profile_path=None, env={})
+    res = runner.run_checks(ctx, None, None)
+    main = threading.current_thread().name
+    assert all(r.notes == main for r in res)
+
+
+def test_run_checks_timeout_kills_command_and_frees_slot(monkeypatch):
+    from pylock.utils.cmd import run_cmd
+
+    class Hung:
+        id = "T-1"
+        title = "t"
+        category = "C"
+
+        def run(self, ctx):
+            proc = run_cmd(["sleep", "30"], check=False, timeout=None)
+            return CheckResult(id="T-1", title="t", category="C", status="ok",
+                               notes=str(proc.returncode))
+
+    class Stubborn:
+        id = "T-2"
+        title = "t"
+        category = "C"
+
+        def run(self, ctx):
+            # не проверяет ctx.cancelled() — поток просто бросается
+            time.sleep(5)
+            return CheckResult(id="T-2", title="t", category="C", status="ok")
+
+    checks = [Hung, Stubborn, _make("T-3"), _make("T-4")]
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: checks)
+    ctx = Context(subject="s", profile_path=None, env={})
+
+    t0 = time.monotonic()
+    res = runner.run_checks(ctx, None, None, workers=2, timeout=0.5, deadline=3)
+    elapsed = time.monotonic() - t0
+
+    assert [r.status for r in res] == ["timeout", "timeout", "ok", "ok"]
+    assert elapsed < 2
+
+
+def test_run_checks_audit_deadline_marks_pending(monkeypatch):
+    checks = [_make("D-1", 1.0), _make("D-2"), _make("D-3")]
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: checks)
+    ctx = Context(subject="s", profile_path=None, env={})
+    res = runner.run_checks(ctx, None, None, workers=1, deadline=0.3)
+    assert [r.status for r in res] == ["timeout", "timeout", "timeout"]
+    assert "общий лимит" in res[1].notes
+
+
+def test_run_checks_follows_prerequisites(monkeypatch):
+    from pylock.facts.base import fact
+
+    calls = []
+
+    @fact("test-runner-absent", missing="нет файла")
+    def absent(ctx):
+        calls.append("fact")
+        return False
+
+    def dep(cid, status="ok", requires=()):
+        class Fake:
+            id = cid
+            title = "t"
+            category = "C"
+
+            def run(self, ctx):
+                calls.append(cid)
+                return CheckResult(id=cid, title="t", category="C", status=status)
+        Fake.requires = list(requires)
+        return Fake
+
+    checks = [
+        dep("G-1", status="fail"),
+        dep("G-2", requires=["G-1"]),
+        dep("G-3", requires=["G-2"]),
+        dep("G-4", requires=["fact:test-runner-absent"]),
+        dep("G-5", requires=["fact:test-runner-absent"]),
+        dep("G-6", requires=["G-7"]),
+        dep("G-7", requires=["G-6"]),
+        dep("G-8", requires=["G-9"]),
+        dep("G-9"),
+    ]
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: checks)
+    ctx = Context(subject="s", profile_path=None, env={})
+    res = runner.run_checks(ctx, None, None, workers=3, timeout=5)
+
+    assert [r.status for r in res] == [
+        "fail", "skipped", "skipped", "skipped", "skipped", "error", "error", "ok", "ok"
+    ]
+    assert res[3].notes == "нет файла"
+    assert sorted(calls) == ["G-1", "G-8", "G-9", "fact"]
+    assert calls.index("G-9") < calls.index("G-8")
+
+
+def test_run_checks_records_metrics_in_report(monkeypatch):
+    from pylock.utils.cmd import run_cmd
+
+    class Cmds:
+        id = "M-1"
+        title = "t"
+        category = "C"
+
+        def run(self, ctx):
+            run_cmd(["true"], check=False)
+            run_cmd(["true"], check=False)
+            return CheckResult(id="M-1", title="t", category="C", status="ok")
+
+    checks = [Cmds, _make("M-2", 0.05)]
+    monkeypatch.setattr(runner, "get_checks", lambda ids=None, skip=None: checks)
+    ctx = Context(subject="s", profile_path=None, env={})
+    for workers in (1, 2):
+        res = runner.run_checks(ctx, None, None, workers=workers)
+        assert res[0].metrics.subprocesses == 2
+        assert res[1].metrics.wall_s >= 0.05
+        rpt = runner.build_report("s", res, wall_s=1.0)
+        assert rpt.meta["metrics"]["subprocesses"] == 2
+        assert rpt.meta["metrics"]["wall_s"] == 1.0
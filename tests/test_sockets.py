@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from pylock.checks.network import NETW_5004_ListenAllInterfaces
+from pylock.checks.services_hardening import NoLegacyServices
+from pylock.facts import processes as proc_mod
+from pylock.facts import sockets as sock_mod
+
+HEADER = (
+    "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt"
+    "   uid  timeout inode\n"
+)
+TCP = HEADER + (
+    "   0: 00000000:0016 00000000:0000 0A "
+    "00000000:00000000 00:00000000 00000000     0        0 100 1\n"
+    "   1: 0100007F:0277 00000000:0000 0A "
+    "00000000:00000000 00:00000000 00000000     0        0 101 1\n"
+    "   2: 0100007F:BC8F 0100007F:E7EC 01 "
+    "00000000:00000000 00:00000000 00000000  1000        0 102 1\n"
+)
+TCP6 = HEADER + (
+    "   0: 00000000000000000000000000000000:0017 00000000000000000000000000000000:0000 0A "
+    "00000000:00000000 00:00000000 00000000     0        0 200 1\n"
+)
+UDP = HEADER + (
+    "  10: 00000000:0045 00000000:0000 07 "
+    "00000000:00000000 00:00000000 00000000     0        0 300 2\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def procfs(redirect):
+    net = redirect(sock_mod, "PROC_NET", "net")
+    net.mkdir()
+    for name, text in (("tcp", TCP), ("tcp6", TCP6), ("udp", UDP)):
+        (net / name).write_text(text)
+    proc = redirect(sock_mod, "PROC", "proc")
+    redirect(proc_mod, "PROC", "proc")
+    for pid, comm, inode in ((10, "sshd", 100), (20, "in.telnetd", 200)):
+        d = proc / str(pid)
+        (d / "fd").mkdir(parents=True)
+        (d / "stat").write_text(f"{pid} ({comm}) S 1 " + "0 " * 18 + "0\n")
+        (d / "status").write_text("Uid:\t0\t0\t0\t0\n")
+        (d / "cmdline").write_bytes(b"")
+        os.symlink(f"socket:[{inode}]", d / "fd" / "3")
+        os.symlink("/dev/null", d / "fd" / "0")
+
+
+def test_socket_table(ctx):
+    table = sock_mod.sockets(ctx)
+    assert [s.endpoint() for s in table.sockets] == [
+        "0.0.0.0:22/tcp", "127.0.0.1:631/tcp", "[::]:23/tcp", "0.0.0.0:69/udp",
+    ]
+    assert table.by_port[("tcp", 631)][0].loopback
+    assert sock_mod.socket_owners(ctx) == {100: [10], 200: [20]}
+
+
+def test_socket_checks(ctx):
+    res = NETW_5004_ListenAllInterfaces().run(ctx)
+    endpoints = [f.description.rsplit(" ", 1)[1] for f in res.findings]
+    assert endpoints == ["0.0.0.0:22/tcp", "[::]:23/tcp"]
+    assert NoLegacyServices().run(ctx).findings[0].description == "Обнаружен telnet"
@@ -0,0 +1,72 @@
+from pylock.checks.crypto import SSHStrongCiphers
+from pylock.checks.ssh import (
+    SSH_8001_PermitRootLogin,
+    SSH_8003_ProtocolVersion,
+    SSH_8009_SshCiphers,
+)
+from pylock.engine.context import Context
+from pylock.facts import sshd
+
+
+def _config(tmp_path):
+    drop = tmp_path / "sshd_config.d"
+    drop.mkdir()
+    (drop / "10-first.conf").write_text(
+        "PasswordAuthentication no\nCiphers aes256-gcm@openssh.com,3des-cbc\n"
+    )
+    (drop / "20-second.conf").write_text("PasswordAuthentication yes\n")
+    main = tmp_path / "sshd_config"
+    main.write_text(
+        "# PermitRootLogin yes\n"
+        f"Include {drop}/*.conf\n"
+        "PermitRootLogin no\n"
+        "permitrootlogin yes\n"
+        "Port 22\n"
+        "Port 2222\n"
+        "Match User backup\n"
+        "    PermitRootLogin yes\n"
+        "    X11Forwarding=yes\n"
+    )
+    return main
+
+
+def test_parse_follows_include_and_first_match_wins(tmp_path):
+    ctx = Context(subject="s", profile_path=None, env={})
+    cfg = sshd.parse_sshd_config(ctx, str(_config(tmp_path)))
+    assert cfg.get("PasswordAuthentication") == "no"
+    assert cfg.get("PermitRootLogin") == "no"
+    assert cfg.get_all("Port") == ["22", "2222"]
+    assert cfg.get("X11Forwarding") == "no"  # значение по умолчанию
+    assert cfg.overrides("PermitRootLogin") == [("User backup", "yes")]
+    assert cfg.overrides("x11forwarding") == [("User backup", "yes")]
+    assert "3des-cbc" in cfg.algorithms("Ciphers")
+    assert len(cfg.files) == 3
+
+
+def test_algorithm_list_modifiers(tmp_path, monkeypatch):
+    main = tmp_path / "sshd_config"
+    main.write_text("Ciphers -3des-cbc,aes128-cbc\nMACs +hmac-md5\n")
+    monkeypatch.setattr(sshd, "SSHD_CONFIG", str(main))
+    monkeypatch.setattr(sshd, "_sshd_effective", lambda path: None)
+    ctx = Context(subject="s", profile_path=None, env={})
+    cfg = sshd.sshd_model(ctx)
+    # "-" исключает алгоритмы из встроенного набора, а не включает их
+    assert cfg.algorithms("Ciphers") == []
+    assert cfg.algorithms("MACs") == ["hmac-md5"] and cfg.extends_defaults("MACs")
+    res = SSH_8009_SshCiphers().run(ctx)
+    assert res.status == "ok" and "встроенный список" in res.notes
+    assert SSHStrongCiphers().run(ctx).findings[0].description == "слабые MACs"
+
+
+def test_checks_use_shared_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(sshd, "SSHD_CONFIG", str(_config(tmp_path)))
+    monkeypatch.setattr(sshd, "_sshd_effective", lambda path: None)
+    ctx = Context(subject="s", profile_path=None, env={})
+
+    res = SSH_8001_PermitRootLogin().run(ctx)
+    assert res.status == "fail"
+    assert [f.id for f in res.findings] == ["SSH-8001:rootlogin:match"]
+    assert SSH_8003_ProtocolVersion().run(ctx).status == "ok"
+    assert SSH_8009_SshCiphers().run(ctx).status == "fail"
+    assert SSHStrongCiphers().run(ctx).status == "fail"
+    assert len(ctx.facts._values) == 1  # модель построена один раз
@@ -0,0 +1,54 @@
+import pytest
+
+from pylock.checks.kernel import KRNL_4003_SysRq, KRNL_4006_ModuleLoading
+from pylock.checks.sysctl import SYSCTL_9000_IpForward, SYSCTL_9006_RpFilter
+from pylock.facts import sysctl as sysctl_mod
+
+
+@pytest.fixture
+def sysctl_tree(redirect, tmp_path, monkeypatch):
+    """sysctl_tree(values) — рабочие значения ключей; файлы конфигурации общие."""
+    etc, lib = tmp_path / "etc.d", tmp_path / "lib.d"
+    etc.mkdir()
+    lib.mkdir()
+    # Одноимённый файл из /etc перекрывает файл из /usr/lib
+    (lib / "10-net.conf").write_text("net.ipv4.ip_forward = 0\nkernel.sysrq = 1\n")
+    (etc / "10-net.conf").write_text("# local\nnet/ipv4/ip_forward=1\n")
+    (lib / "50-default.conf").write_text("-net.ipv4.conf.all.rp_filter = 2\n")
+    redirect(sysctl_mod, "SYSCTL_CONF", "sysctl.conf", "; last\nnet.ipv4.conf.all.rp_filter = 0\n")
+    monkeypatch.setattr(sysctl_mod, "SYSCTL_DIRS", (str(etc), str(lib)))
+    root = redirect(sysctl_mod, "SYSCTL_ROOT", "proc")
+
+    def _values(values):
+        for key, value in values.items():
+            path = root.joinpath(*key.split("."))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(value + "\n")
+
+    return _values
+
+
+def test_sysctl_state(sysctl_tree, ctx):
+    sysctl_tree({"net.ipv4.ip_forward": "0", "kernel.sysrq": "176"})
+    state = sysctl_mod.sysctl(ctx)
+    assert state.runtime["net.ipv4.ip_forward"] == "0"
+    assert state.get("net/ipv4/ip_forward") == "0"
+    assert state.persistent == {"net.ipv4.ip_forward": "1", "net.ipv4.conf.all.rp_filter": "0"}
+    assert state.origin["net.ipv4.conf.all.rp_filter"].endswith("sysctl.conf")
+    key = sysctl_mod.normalize_key("net/ipv4/conf/eth0.1/rp_filter")
+    assert key == "net.ipv4.conf.eth0/1.rp_filter"
+
+
+def test_sysctl_rules(sysctl_tree, ctx):
+    sysctl_tree({
+        "net.ipv4.ip_forward": "0",
+        "net.ipv4.conf.all.rp_filter": "1",
+        "kernel.sysrq": "176",
+        "kernel.modules_disabled": "0",
+    })
+    res = SYSCTL_9000_IpForward().run(ctx)
+    assert [f.id for f in res.findings] == ["SYSCTL-9000:persistent"]
+    assert [f.id for f in SYSCTL_9006_RpFilter().run(ctx).findings] == ["SYSCTL-9006:persistent"]
+    res = KRNL_4003_SysRq().run(ctx)
+    assert [f.description for f in res.findings] == ["sysrq включён (значение: 176)"]
+    assert KRNL_4006_ModuleLoading().run(ctx).notes == "Загрузка модулей разрешена"
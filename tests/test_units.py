@@ -0,0 +1,57 @@
+import subprocess
+
+import pytest
+
+from pylock.checks.logging import TimeSyncRunning
+from pylock.facts import system as system_mod
+
+SHOW = (
+    "Id=auditd.service\nLoadState=loaded\nActiveState=active\nSubState=running\nUnitFileState=enabled\n\n"
+    "Id=chronyd.service\nLoadState=not-found\nActiveState=inactive\nSubState=dead\nUnitFileState=\n\n"
+    "Id=ntpd.service\nLoadState=loaded\nActiveState=failed\nSubState=failed\nUnitFileState=enabled\n\n"
+    "Id=systemd-timesyncd.service\nLoadState=loaded\nActiveState=active\nSubState=running\n"
+    "UnitFileState=enabled\n"
+)
+
+
+@pytest.fixture
+def systemd(redirect, monkeypatch):
+    """systemd(stdout, returncode) — подменить systemctl show; возвращает список вызовов."""
+    redirect(system_mod, "SYSTEMD_RUNTIME", "system").mkdir()
+    redirect(system_mod, "SYSTEMD_UNITS_DIR", "units")
+    monkeypatch.setattr(system_mod, "_TRACKED", {"auditd.service"})
+    monkeypatch.setattr(system_mod.shutil, "which", lambda name: "/bin/systemctl")
+
+    def _systemd(stdout=SHOW, returncode=0):
+        calls = []
+
+        def fake_run(cmd, check=True, timeout=10):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, returncode, stdout, "")
+
+        monkeypatch.setattr(system_mod, "run_cmd", fake_run)
+        return calls
+
+    return _systemd
+
+
+def test_units_batched(systemd, ctx):
+    calls = systemd()
+    system_mod.track_units("chronyd", "ntpd", "systemd-timesyncd")
+    states = system_mod.units(ctx)
+    assert len(calls) == 1 and calls[0][-4:] == [
+        "auditd.service", "chronyd.service", "ntpd.service", "systemd-timesyncd.service",
+    ]
+    assert states.active("auditd") and not states.get("chronyd").loaded
+    assert states.get("ntpd.service").active_state == "failed"
+    assert TimeSyncRunning().run(ctx).notes == "systemd-timesyncd"
+    assert len(calls) == 1
+
+
+def test_units_fall_back_to_run_dir(systemd, ctx, tmp_path):
+    calls = systemd(stdout="", returncode=1)
+    (tmp_path / "units").mkdir()
+    (tmp_path / "units" / "invocation:auditd.service").symlink_to("0123abcd")
+    states = system_mod.units(ctx)
+    assert states.source == "run" and states.active("auditd") and not states.active("ufw")
+    assert len(calls) == 1
@@ -15,6 +15,22 @@ def test_run_cmd_not_found(monkeypatch):
     cp = run_cmd(["cmd"], check=False)
     assert cp.returncode == 127
 
+def test_sync_and_async_agree_on_non_executable(tmp_path):
+    from pylock.utils import cmd as cmdmod
+
+    script = tmp_path / "script"
+    script.write_text("#!/bin/sh\n")
+    script.chmod(0o644)
+    cmd = [str(script)]
+    assert run_cmd(cmd, check=False).returncode == 126
+    assert cmdmod.run_cmds([cmd])[0].returncode == 126
+    try:
+        run_cmd(cmd)
+    except CommandError as e:
+        assert "not executable" in str(e)
+    else:
+        raise AssertionError("CommandError not raised")
+
 def test_run_cmd_check_raises(monkeypatch):
     def fake_run(*a, **kw):
         return subprocess.CompletedProcess(["false"], 1, stdout="", stderr="boom")
@@ -25,3 +41,41 @@ def test_run_cmd_check_raises(monkeypatch):
         assert "Command failed" in str(e)
     else:
         raise AssertionError("CommandError not raised")
+
+def test_run_cmd_capped_by_check_scope(monkeypatch):
+    import time
+
+    from pylock.engine.scope import CheckScope, activate, deactivate
+    seen = {}
+    def fake_run(*a, **kw):
+        seen["timeout"] = kw["timeout"]
+        return subprocess.CompletedProcess(["x"], 0, stdout="", stderr="")
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    token = activate(CheckScope("X", deadline=time.monotonic() + 2))
+    try:
+        run_cmd(["x"], timeout=10)
+    finally:
+        deactivate(token)
+    assert 0 < seen["timeout"] <= 2
+
+def test_run_cmds_concurrent_limited_and_timed():
+    import time
+
+    from pylock.engine.scope import CheckScope, activate, deactivate
+    from pylock.utils import cmd as cmdmod
+    old = cmdmod._MAX_PROCS
+    cmdmod.set_max_procs(2)
+    scope = CheckScope("X")
+    token = activate(scope)
+    try:
+        t0 = time.monotonic()
+        cmds = [["sleep", "0.3"]] * 4 + [["sleep", "5"], ["no-such-cmd-xyz"]]
+        res = cmdmod.run_cmds(cmds, timeout=1)
+        elapsed = time.monotonic() - t0
+    finally:
+        deactivate(token)
+        cmdmod.set_max_procs(old)
+    assert [r.returncode for r in res] == [0, 0, 0, 0, 124, 127]
+    assert 0.6 <= elapsed < 3
+    assert len(scope.commands) == 6
+    assert all(t.duration >= 0 for t in scope.commands)
@@ -0,0 +1,208 @@
+import os
+
+import pytest
+
+from pylock.checks.filesystem import FILE_3002_WorldWritableDirs, FILE_3014_UnownedFiles
+from pylock.config.loader import Profile
+from pylock.engine import walk as walk_mod
+from pylock.engine.context import Context
+from pylock.engine.scope import CheckScope, activate, deactivate
+from pylock.engine.walk import Visitor, walk
+from pylock.facts import accounts as accounts_mod
+from pylock.facts import filesystem as fs_mod
+from pylock.facts import mounts as mounts_mod
+
+
+class Recorder(Visitor):
+    def __init__(self):
+        self.paths = []
+
+    def visit(self, entry):
+        self.paths.append(entry.path)
+
+
+def _tree(tmp_path):
+    (tmp_path / "a" / "open").mkdir(parents=True)
+    (tmp_path / "a" / "open").chmod(0o777)
+    (tmp_path / "a" / "sticky").mkdir()
+    (tmp_path / "a" / "sticky").chmod(0o1777)
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "suid").write_text("x")
+    (tmp_path / "b" / "suid").chmod(0o4755)
+    (tmp_path / "proc").mkdir()
+    (tmp_path / "proc" / "1").write_text("x")
+    os.symlink("/etc", tmp_path / "b" / "link")
+
+
+def test_walk_visits_each_entry_once_and_prunes(tmp_path):
+    _tree(tmp_path)
+    first, second = Recorder(), Recorder()
+    stats = walk([str(tmp_path)], [first, second], prune=lambda p: p.endswith("/proc"))
+    assert first.paths == second.paths
+    rel = [os.path.relpath(p, tmp_path) for p in first.paths]
+    assert sorted(rel) == [".", "a", "a/open", "a/sticky", "b", "b/link", "b/suid", "proc"]
+    assert stats.pruned == 1 and stats.complete
+    assert not walk([str(tmp_path)], [Recorder()], cancelled=lambda: True).complete
+
+
+def test_walk_visitors_feed_checks(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    st = os.lstat(tmp_path)
+    (tmp_path / "passwd").write_text(f"me:x:{st.st_uid}:{st.st_gid}::/:/bin/sh\n")
+    (tmp_path / "group").write_text(f"me:x:{st.st_gid}:\n")
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "passwd"))
+    monkeypatch.setattr(accounts_mod, "GROUP", str(tmp_path / "group"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(tmp_path / "a"), str(tmp_path / "b")))
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    ctx = Context(subject="s", profile_path=None, env={})
+    res = FILE_3002_WorldWritableDirs().run(ctx)
+    assert [f.id for f in res.findings] == [f"FILE-3002:{tmp_path}/a/open"]
+    scan = fs_mod.fs_scan(ctx)
+    assert [p for p, _, _ in scan.results["setid_files"]] == [f"{tmp_path}/b/suid"]
+    assert FILE_3014_UnownedFiles().run(ctx).status == "ok"
+
+
+def test_world_writable_dirs_capped(tmp_path, monkeypatch):
+    from pylock.checks import filesystem as checks_fs
+
+    for name in ("x", "y", "z"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name).chmod(0o777)
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(tmp_path),))
+    monkeypatch.setattr(checks_fs, "MAX_PATH_FINDINGS", 2)
+    res = FILE_3002_WorldWritableDirs().run(Context(subject="s", profile_path=None, env={}))
+    assert [f.id for f in res.findings] == [f"FILE-3002:{tmp_path}/x", f"FILE-3002:{tmp_path}/y"]
+    assert res.notes == "Показаны первые 2 из 3"
+
+
+def test_parallel_walk_matches_sequential(tmp_path):
+    for i in range(20):
+        d = tmp_path / f"d{i:02}" / "sub"
+        d.mkdir(parents=True)
+        for j in range(5):
+            (d / f"f{j}").write_text("x")
+            (d / f"f{j}").chmod(0o666 if j == 2 else 0o644)
+    results = []
+    for workers in (1, 4):
+        visitor = fs_mod.WorldWritableFiles()
+        stats = walk([str(tmp_path)], [visitor], workers=workers)
+        results.append((visitor.result(), stats.entries, stats.dirs))
+    assert results[0] == results[1]
+    assert len(results[0][0]) == 20 and results[0][1] == 1 + 20 * 7
+
+
+def test_parallel_walk_propagates_visitor_errors(tmp_path):
+    (tmp_path / "a").mkdir()
+
+    class Broken(Recorder):
+        def fork(self):
+            return Broken()
+
+        def visit(self, entry):
+            if entry.path.endswith("/a"):
+                raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        walk([str(tmp_path)], [Broken()], workers=3)
+
+
+def test_indexed_walk_rereads_only_changed_dirs(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / "a" / "plain").write_text("x")
+    index = {}
+    walk([str(tmp_path)], [fs_mod.SetIdFiles()], out=index)
+    assert index[str(tmp_path / "b")].files == ("link", "suid")
+    assert index[str(tmp_path / "a")].files == ("plain",)
+
+    (tmp_path / "c").mkdir()
+    (tmp_path / "c" / "new").write_text("x")
+    (tmp_path / "c" / "new").chmod(0o2755)
+    (tmp_path / "b" / "suid").chmod(0o755)
+    visitor, out = fs_mod.SetIdFiles(), {}
+    stats = walk([str(tmp_path)], [visitor], index=index, out=out)
+    # Перечитаны корень (новый c) и c; права файла не меняют каталог b
+    assert stats.reused == 5 and stats.dirs == 2
+    assert [p for p, _, _ in visitor.result()] == [f"{tmp_path}/c/new"]
+    assert out[str(tmp_path / "b")].files == ("link", "suid")
+
+    # chmod u+s не меняет каталог, но файл всё равно перепроверяется lstat
+    (tmp_path / "a" / "plain").chmod(0o4755)
+    visitor = fs_mod.SetIdFiles()
+    stats = walk([str(tmp_path)], [visitor], index=out, workers=3)
+    assert stats.dirs == 0
+    assert [p for p, _, _ in visitor.result()] == [f"{tmp_path}/a/plain", f"{tmp_path}/c/new"]
+
+
+def test_fs_scan_persists_index(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(tmp_path / "a"), str(tmp_path / "b")))
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    scans = [fs_mod.fs_scan(Context(subject="s", profile_path=None, env={})) for _ in range(2)]
+    assert [s.full for s in scans] == [True, False]
+    assert scans[0].results == scans[1].results
+    assert scans[1].stats.reused == 4 and scans[1].stats.dirs == 0
+
+    monkeypatch.setattr(fs_mod, "FULL_SCAN_INTERVAL", 0)
+    assert fs_mod.fs_scan(Context(subject="s", profile_path=None, env={})).full
+
+
+def test_fs_scan_has_own_time_limit(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    monkeypatch.setattr(accounts_mod, "PASSWD", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "MOUNTINFO", str(tmp_path / "none"))
+    monkeypatch.setattr(mounts_mod, "PROC_MOUNTS", str(tmp_path / "none"))
+    monkeypatch.setattr(fs_mod, "WALK_ROOTS", (str(tmp_path / "a"), str(tmp_path / "b")))
+    # Лимит запросившей проверки истёк, а обход ещё не начат: он всё равно полный
+    scope = CheckScope("FILE-3002", deadline=0.0)
+    scope.cancel()
+    token = activate(scope)
+    try:
+        scan = fs_mod.fs_scan(Context(subject="s", profile_path=None, env={}))
+    finally:
+        deactivate(token)
+    assert scan.stats.complete and scan.results["setid_files"]
+
+    monkeypatch.setattr(fs_mod, "WALK_TIMEOUT", 1e-9)
+    scan = fs_mod.fs_scan(Context(subject="s", profile_path=None, env={}))
+    assert not scan.stats.complete
+    profile = Profile(name="t", path=None, include_tests=[], skip_tests=[], fs_walk_timeout=0)
+    scan = fs_mod.fs_scan(Context(subject="s", profile_path=None, env={}, profile=profile))
+    assert scan.stats.complete
+
+
+@pytest.mark.parametrize("startable", [0, 2])
+def test_parallel_walk_survives_thread_start_failure(tmp_path, monkeypatch, startable):
+    for i in range(10):
+        (tmp_path / f"d{i}" / "sub").mkdir(parents=True)
+    expected = Recorder()
+    walk([str(tmp_path)], [expected])
+
+    real_start = walk_mod.threading.Thread.start
+    started = []
+
+    def start(self):
+        if len(started) >= startable:
+            raise RuntimeError("can't start new thread")
+        started.append(self)
+        real_start(self)
+
+    monkeypatch.setattr(walk_mod.threading.Thread, "start", start)
+
+    class Forking(Recorder):
+        def fork(self):
+            return Forking()
+
+        def merge(self, other):
+            self.paths.extend(other.paths)
+
+    visitor = Forking()
+    stats = walk([str(tmp_path)], [visitor], workers=8)
+    assert sorted(visitor.paths) == sorted(expected.paths) and stats.dirs == 21